@@ -0,0 +1,147 @@
+import json
+import platform
+import socket
+import time
+from datetime import datetime
+from pathlib import Path
+import cairo
+from config.settings import ARTWORK_SIZE, COST_TABLE_PATH
+from sketchlib import reaction
+
+PATH_VERTICES = 200  # vertices per polyline in the stroke/fill benchmarks
+
+
+def _device_model() -> str:
+    try:
+        return Path('/proc/device-tree/model').read_text().strip('\x00\n')
+    except OSError:
+        return platform.machine()
+
+
+def _time_per_iter(fn, n: int, repeats: int = 3) -> float:
+    """Best-of-repeats seconds per call of fn(i), minus bare loop overhead"""
+    def loop(body):
+        start = time.perf_counter()
+        for i in range(n):
+            body(i)
+        return time.perf_counter() - start
+
+    baseline = min(loop(lambda i: None) for _ in range(repeats))
+    best = min(loop(fn) for _ in range(repeats))
+    return max(0.0, best - baseline) / n
+
+
+class CostCalibrator:
+    """Micro-benchmarks of pycairo primitives as called from sketch code.
+
+    Costs are seconds per call, measured at ARTWORK_SIZE, and include the
+    Python->cairo call overhead that generated code pays.
+    """
+
+    def __init__(self, size: tuple[int, int] = ARTWORK_SIZE, scale: float = 1.0):
+        self.width, self.height = size
+        self.scale = scale  # iteration multiplier; lower for quick runs
+
+    def _fresh(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, self.width, self.height)
+        ctx = cairo.Context(surface)
+        ctx.set_source_rgb(0, 0, 0)
+        ctx.paint()
+        ctx.set_source_rgb(1, 1, 1)
+        ctx.set_line_width(1.0)
+        return ctx
+
+    def _n(self, n: int) -> int:
+        return max(10, int(n * self.scale))
+
+    def measure(self) -> dict:
+        w, h = self.width, self.height
+        costs = {}
+        ctx = self._fresh()
+
+        def noop(*args):
+            pass
+
+        costs['python_call'] = _time_per_iter(lambda i: noop(i, i), self._n(200000))
+
+        # State changes
+        costs['set_source_rgb'] = _time_per_iter(lambda i: ctx.set_source_rgb(0.5, 0.5, 0.5), self._n(100000))
+        costs['set_source_rgba'] = _time_per_iter(lambda i: ctx.set_source_rgba(0.5, 0.5, 0.5, 0.5), self._n(100000))
+        costs['set_line_width'] = _time_per_iter(lambda i: ctx.set_line_width(1.5), self._n(100000))
+        costs['save'] = costs['restore'] = _time_per_iter(lambda i: (ctx.save(), ctx.restore()), self._n(50000)) / 2
+        costs['translate'] = _time_per_iter(lambda i: ctx.translate(0.0, 0.0), self._n(100000))
+        costs['rotate'] = _time_per_iter(lambda i: ctx.rotate(0.0), self._n(100000))
+        costs['scale'] = _time_per_iter(lambda i: ctx.scale(1.0, 1.0), self._n(100000))
+
+        # Path construction (path is discarded periodically so it doesn't grow unbounded)
+        def path_op(op):
+            def body(i):
+                op(i)
+                if i % 1000 == 999:
+                    ctx.new_path()
+            return body
+
+        ctx.new_path()
+        costs['move_to'] = _time_per_iter(path_op(lambda i: ctx.move_to(i % w, i % h)), self._n(100000))
+        ctx.move_to(0, 0)
+        costs['line_to'] = _time_per_iter(path_op(lambda i: ctx.line_to(i % w, (i * 7) % h)), self._n(100000))
+        costs['curve_to'] = _time_per_iter(path_op(lambda i: ctx.curve_to(1, 2, 3, 4, i % w, i % h)), self._n(50000))
+        costs['rectangle'] = _time_per_iter(path_op(lambda i: ctx.rectangle(i % w, i % h, 10, 10)), self._n(50000))
+        costs['arc'] = _time_per_iter(path_op(lambda i: ctx.arc(i % w, i % h, 20, 0, 6.283)), self._n(20000))
+        costs['close_path'] = _time_per_iter(path_op(lambda i: ctx.close_path()), self._n(50000))
+        ctx.new_path()
+
+        # Rasterization
+        def stroke_polyline(i):
+            ctx.move_to(0, i % h)
+            for k in range(PATH_VERTICES):
+                ctx.line_to(k * w / PATH_VERTICES, (i * 13 + k * 17) % h)
+            ctx.stroke()
+
+        polyline = _time_per_iter(stroke_polyline, self._n(300))
+        costs['stroke_per_vertex'] = max(0.0, polyline / PATH_VERTICES - costs['line_to'])
+        costs['stroke'] = _time_per_iter(lambda i: (ctx.move_to(0, 0), ctx.line_to(50, 50), ctx.stroke()), self._n(20000)) \
+            - costs['move_to'] - costs['line_to']
+        costs['fill'] = _time_per_iter(lambda i: (ctx.rectangle(i % w, i % h, 20, 20), ctx.fill()), self._n(20000)) \
+            - costs['rectangle']
+        ctx.set_source_rgba(1, 1, 1, 0.3)
+        fill_alpha = _time_per_iter(lambda i: (ctx.rectangle(i % w, i % h, 20, 20), ctx.fill()), self._n(20000)) \
+            - costs['rectangle']
+        costs['fill_alpha_extra'] = max(0.0, fill_alpha - costs['fill'])
+        costs['arc_fill'] = _time_per_iter(lambda i: (ctx.arc(i % w, i % h, 20, 0, 6.283), ctx.fill()), self._n(10000)) \
+            - costs['arc']
+        costs['fill_preserve'] = costs['fill']
+        costs['stroke_preserve'] = costs['stroke']
+        costs['paint'] = _time_per_iter(lambda i: ctx.paint(), self._n(300))
+        costs['paint_with_alpha'] = _time_per_iter(lambda i: ctx.paint_with_alpha(0.5), self._n(300))
+
+        ctx.select_font_face('Sans', cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
+        ctx.set_font_size(14)
+        costs['show_text'] = _time_per_iter(lambda i: (ctx.move_to(10, 20), ctx.show_text('SWISS 1957')), self._n(5000)) \
+            - costs['move_to']
+
+        # sketchlib.reaction at its default resolution; the difference of two runs drops the setup cost
+        def gray_scott(iterations):
+            start = time.perf_counter()
+            reaction.gray_scott(w, h, iterations=iterations)
+            return time.perf_counter() - start
+
+        n = self._n(400)
+        costs['gray_scott_iteration'] = (min(gray_scott(2 * n) for _ in range(2)) - min(gray_scott(n) for _ in range(2))) / n
+
+        return {name: max(0.0, round(value, 10)) for name, value in costs.items()}
+
+    def run(self, output_path: Path = COST_TABLE_PATH) -> dict:
+        """Measure and write the cost table for this device"""
+        table = {
+            'device': _device_model(),
+            'host': socket.gethostname(),
+            'cairo': cairo.cairo_version_string(),
+            'size': [self.width, self.height],
+            'measured': datetime.now().isoformat(timespec='seconds'),
+            'costs': self.measure(),
+        }
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(table, indent=2))
+        return table
@@ -0,0 +1,181 @@
+import ast
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from config.settings import COST_TABLE_PATH
+
+DEFAULT_LOOP_ITERS = 20  # assumed trip count when a loop bound can't be resolved
+DEFAULT_WHILE_ITERS = 50
+MAX_INLINE_DEPTH = 4  # how deep calls to sketch-defined functions are expanded
+
+
+def resolve_number(node, constants: dict):
+    """Evaluate a numeric expression built from literals and known constants"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.Name):
+        return constants.get(node.id)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = resolve_number(node.operand, constants)
+        return -value if value is not None else None
+    if isinstance(node, ast.BinOp):
+        left, right = resolve_number(node.left, constants), resolve_number(node.right, constants)
+        if left is None or right is None:
+            return None
+        try:
+            if isinstance(node.op, ast.Add):
+                return left + right
+            if isinstance(node.op, ast.Sub):
+                return left - right
+            if isinstance(node.op, ast.Mult):
+                return left * right
+            if isinstance(node.op, ast.Div):
+                return left / right
+            if isinstance(node.op, ast.FloorDiv):
+                return left // right
+            if isinstance(node.op, ast.Pow) and abs(right) < 8:
+                return left ** right
+        except (ZeroDivisionError, OverflowError):
+            return None
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ('int', 'float', 'min', 'max') and node.args:
+        values = [resolve_number(a, constants) for a in node.args]
+        if None in values:
+            return None
+        if node.func.id in ('int', 'float'):
+            return values[0]
+        return min(values) if node.func.id == 'min' else max(values)
+    return None
+
+
+def module_constants(tree: ast.Module) -> dict:
+    """Collect top-level numeric assignments (e.g. `NUM_RINGS = 12`, `width, height = 600, 480`)"""
+    constants = {}
+    for stmt in tree.body:
+        if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+            continue
+        target = stmt.targets[0]
+        if isinstance(target, ast.Name):
+            value = resolve_number(stmt.value, constants)
+            if value is not None:
+                constants[target.id] = value
+        elif isinstance(target, ast.Tuple) and isinstance(stmt.value, ast.Tuple) and len(target.elts) == len(stmt.value.elts):
+            for name, expr in zip(target.elts, stmt.value.elts):
+                value = resolve_number(expr, constants) if isinstance(name, ast.Name) else None
+                if value is not None:
+                    constants[name.id] = value
+    return constants
+
+
+def _trip_count(loop, constants: dict) -> float:
+    """Estimate how many times a loop body runs"""
+    if isinstance(loop, ast.While):
+        return DEFAULT_WHILE_ITERS
+    it = loop.iter
+    if isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == 'range' and it.args:
+        args = [resolve_number(a, constants) for a in it.args]
+        if None not in args:
+            start, stop, step = (0, args[0], 1) if len(args) == 1 else (args[0], args[1], args[2] if len(args) > 2 else 1)
+            if step:
+                return max(0, math.ceil((stop - start) / step))
+    if isinstance(it, (ast.List, ast.Tuple)):
+        return len(it.elts)
+    return DEFAULT_LOOP_ITERS
+
+
+class _CostVisitor:
+    """Walks a sketch AST accumulating estimated executed calls"""
+
+    def __init__(self, tree: ast.Module):
+        self.constants = module_constants(tree)
+        self.functions = {n.name: n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)}
+        self.features = {'loops': 0, 'max_depth': 0, 'calls': 0.0, 'draw_calls': 0.0, 'ops': {}}
+
+    def visit_block(self, stmts, weight: float, depth: int, stack: tuple):
+        for stmt in stmts:
+            self.visit(stmt, weight, depth, stack)
+
+    def visit(self, node, weight: float, depth: int, stack: tuple):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            return  # bodies are costed at their call sites
+        if isinstance(node, (ast.For, ast.While)):
+            self.features['loops'] += 1
+            self.features['max_depth'] = max(self.features['max_depth'], depth + 1)
+            inner = weight * _trip_count(node, self.constants)
+            self.visit(node.iter if isinstance(node, ast.For) else node.test, weight, depth, stack)
+            self.visit_block(node.body, inner, depth + 1, stack)
+            self.visit_block(node.orelse, weight, depth, stack)
+            return
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            inner = weight
+            for gen in node.generators:
+                inner *= _trip_count(gen, self.constants)
+            self.features['max_depth'] = max(self.features['max_depth'], depth + len(node.generators))
+            parts = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            for part in parts:
+                self.visit(part, inner, depth + len(node.generators), stack)
+            return
+        if isinstance(node, ast.Call):
+            self.features['calls'] += weight
+            func = node.func
+            if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == 'ctx':
+                self.features['draw_calls'] += weight
+                self.features['ops'][func.attr] = self.features['ops'].get(func.attr, 0) + weight
+            elif isinstance(func, ast.Name) and func.id in self.functions and func.id not in stack and len(stack) < MAX_INLINE_DEPTH:
+                fn = self.functions[func.id]
+                self.visit_block(fn.body, weight, depth, stack + (func.id,))
+        for child in ast.iter_child_nodes(node):
+            self.visit(child, weight, depth, stack)
+
+
+@lru_cache(maxsize=4)
+def load_cost_table(path: Path = COST_TABLE_PATH) -> dict:
+    """Per-op costs (seconds per call) measured on this device, or {} if not calibrated"""
+    try:
+        return json.loads(Path(path).read_text())['costs']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def estimate_seconds(features: dict, costs: dict) -> float:
+    """Predicted render time from per-op call counts and a cost table"""
+    ops = features.get('ops', {})
+    call = costs.get('python_call', 0.0)
+    seconds = (features.get('calls', 0) - features.get('draw_calls', 0)) * call
+    for op, count in ops.items():
+        seconds += count * costs.get(op, call)
+    # Rasterizing a stroked polyline scales with its vertex count
+    seconds += ops.get('line_to', 0) * costs.get('stroke_per_vertex', 0.0)
+    if ops.get('set_source_rgba'):
+        seconds += ops.get('fill', 0) * costs.get('fill_alpha_extra', 0.0)
+    return seconds
+
+
+def extract_features(code: str) -> dict:
+    """Static features of a sketch used to predict its render time.
+
+    `work` approximates the number of Python calls executed, weighting each
+    call site by the trip counts of its enclosing loops. When the device has
+    a cost table, `cost` is the corresponding estimate in seconds.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return {'lines': code.count('\n') + 1, 'work': 0.0}
+
+    visitor = _CostVisitor(tree)
+    visitor.visit_block(tree.body, 1.0, 0, ())
+    features = visitor.features
+    result = {
+        'lines': code.count('\n') + 1,
+        'loops': features['loops'],
+        'max_depth': features['max_depth'],
+        'calls': features['calls'],
+        'draw_calls': features['draw_calls'],
+        'ops': features['ops'],
+        'work': features['calls'],
+    }
+    costs = load_cost_table()
+    if costs:
+        result['cost'] = estimate_seconds(result, costs)
+    return result
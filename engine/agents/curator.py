@@ -1,13 +1,20 @@
 from anthropic import AsyncAnthropic
-from config.settings import ANTHROPIC_API_KEY
+from agents.image_payload import build_image_blocks
+from config.settings import ANTHROPIC_API_KEY, CURATOR_MAX_EDGE, CURATOR_IMAGE_FORMAT, CURATOR_IMAGE_QUALITY
 from pathlib import Path
-import base64
+import asyncio
 import json
+import time
 
 class CuratorAgent:
     def __init__(self):
         self.client = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
         self.taste_profile = self._load_taste_profile()
+        # Images are downscaled and re-encoded before upload (see agents.image_payload)
+        self.max_edge = CURATOR_MAX_EDGE
+        self.image_format = CURATOR_IMAGE_FORMAT
+        self.image_quality = CURATOR_IMAGE_QUALITY
+        self.last_stats = None  # payload size and timings of the latest select_best
     
     def _load_taste_profile(self) -> str:
         """Load learned preferences"""
@@ -34,20 +41,15 @@ For each image:
 Then select the BEST ONE and explain your reasoning in detail."""
         }]
         
-        # Add all images
-        for sketch in rendered_sketches:
-            with open(sketch['image'], 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode()
-            
+        # Add all images (resized and encoded off the event loop)
+        start = time.perf_counter()
+        blocks, stats = await asyncio.to_thread(
+            build_image_blocks, [sketch['image'] for sketch in rendered_sketches],
+            self.max_edge, self.image_format, self.image_quality
+        )
+        for sketch, block in zip(rendered_sketches, blocks):
             content.extend([
-                {
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": "image/png",
-                        "data": image_data
-                    }
-                },
+                block,
                 {
                     "type": "text",
                     "text": f"SKETCH {sketch['id']}: {sketch['theme']}"
@@ -55,17 +57,21 @@ Then select the BEST ONE and explain your reasoning in detail."""
             ])
         
         # Get evaluation
+        request_start = time.perf_counter()
         response = await self.client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=4096,
             messages=[{"role": "user", "content": content}]
         )
+        stats['request_seconds'] = round(time.perf_counter() - request_start, 3)
+        stats['total_seconds'] = round(time.perf_counter() - start, 3)
+        self.last_stats = stats
         
         evaluation_text = response.content[0].text
         
         # Parse best selection
         best_id = self._extract_best_id(evaluation_text, rendered_sketches)
-        best_sketch = next(s for s in rendered_sketches if s['id'] == best_id)
+        best_sketch = next((s for s in rendered_sketches if s['id'] == best_id), rendered_sketches[0])
         
         # Add evaluation metadata
         best_sketch['evaluation'] = evaluation_text
@@ -77,10 +83,15 @@ Then select the BEST ONE and explain your reasoning in detail."""
     def _extract_best_id(self, evaluation: str, sketches: list) -> str:
         """Parse which sketch was selected"""
         import re
-        # Look for patterns like "SKETCH sketch_003" or "best is sketch_012"
-        matches = re.findall(r'sketch_\d{3}', evaluation.lower())
-        if matches:
-            return matches[-1]  # Last mentioned is usually the selection
+        # Exact candidate IDs only: "sketch_003" must not match inside "sketch_003_s1"
+        last_mention = {}
+        for sketch in sketches:
+            pattern = rf"(?<![\w-]){re.escape(sketch['id'])}(?![\w-])"
+            positions = [m.start() for m in re.finditer(pattern, evaluation, re.IGNORECASE)]
+            if positions:
+                last_mention[sketch['id']] = positions[-1]
+        if last_mention:
+            return max(last_mention, key=last_mention.get)  # Last mentioned is usually the selection
         return sketches[0]['id']  # Fallback
     
     def _extract_score(self, evaluation: str) -> str:
@@ -15,20 +15,27 @@ class DisplayManager:
         # Load artwork
         artwork = Image.open(image)
 
+        display = self.compose(artwork, title, period, metadata)
+
+        # Save
+        display.save(self.display_image)
+
+        # Update physical display using feh
+        self._update_display()
+
+    def compose(self, artwork: Image, title: str, period: str, metadata: dict = None) -> Image:
+        """Build the full display buffer; artwork may be None to leave its area blank"""
+
         # Create display buffer
         display = Image.new('RGB', (self.width, self.height), (20, 20, 20))
 
         # Paste artwork to left side (it is now 600x480 natively)
-        display.paste(artwork, (0, 0))
+        if artwork is not None:
+            display.paste(artwork, (0, 0))
 
         # Draw info panel on right side (200px wide)
         self._draw_info_panel(display, title, period, metadata)
-
-        # Save
-        display.save(self.display_image)
-
-        # Update physical display using feh
-        self._update_display()
+        return display
 
     def _draw_info_panel(self, display: Image, title: str, period: str, metadata: dict):
         """Draw metadata on right panel"""
@@ -1,51 +1,135 @@
 import cairo
 import math
 import random
+import re
+from functools import lru_cache
 from pathlib import Path
+from types import CodeType
 import traceback
 import signal
+import numpy as np
+from agents.recording import OpRecorder, Recording, RECORDING_SUFFIX
+from agents.sketch_ast import reseed_sketch, rewrite_surface
+from agents.sketch_optimizer import optimize_sketch
+from agents.pixel_raster import PixelRaster, reroute_pixel_loops
+from config.settings import OPTIMIZE_SKETCHES
+from sketchlib import contour, flow, geometry, noise, palette, pixels, reaction, shapes, spatial, stamps, tiling
+
+# Direct pixel edits bypass the context, so a recording couldn't replay them
+PIXEL_ACCESS = re.compile(r'\bpixels\s*\.')
+
+@lru_cache(maxsize=32)
+def compile_sketch(code: str, record: bool = False, optimize: bool = OPTIMIZE_SKETCHES,
+                   reseed: bool = False) -> CodeType:
+    """Rewrite and compile sketch source for SafeExecutor.execute.
+
+    Cached per process, so rerunning a sketch (e.g. under other seeds)
+    compiles it once. With reseed, the sketch's own random.seed() calls mix
+    in the run seed (see sketch_ast.reseed_sketch).
+    """
+    if reseed:
+        code = reseed_sketch(code)
+    if record and not PIXEL_ACCESS.search(code):
+        try:
+            code = rewrite_surface(
+                code,
+                "cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, cairo.Rectangle(0, 0, {width}, {height}))",
+                "{ctx} = __recorder__.wrap({ctx})"
+            )
+        except (ValueError, SyntaxError):
+            pass  # non-standard setup: render without recording
+    if optimize:
+        code = optimize_sketch(reroute_pixel_loops(code))
+    return compile(code, '<sketch>', 'exec')
+
 
 class SafeExecutor:
     """Safely execute generated cairo code"""
-    
-    def __init__(self, timeout=10):
+
+    def __init__(self, timeout=10, record=False, optimize=OPTIMIZE_SKETCHES):
         self.timeout = timeout
+        self.record = record  # capture drawing for replay (see agents.recording)
+        self.optimize = optimize  # source-level speedups (see agents.sketch_optimizer)
         self.allowed_imports = {
             'cairo': cairo,
             'math': math,
             'random': random,
+            'noise': noise,  # NumPy noise fields (see sketchlib.noise)
+            'geometry': geometry,  # Delaunay/Voronoi (see sketchlib.geometry)
+            'pixels': pixels,  # NumPy view of the surface (see sketchlib.pixels)
+            'reaction': reaction,  # Gray–Scott solver (see sketchlib.reaction)
+            'flow': flow,  # batched flow-field particles (see sketchlib.flow)
+            'spatial': spatial,  # neighbour queries, Poisson disk, packing (see sketchlib.spatial)
+            'contour': contour,  # marching-squares iso-lines (see sketchlib.contour)
+            'tiling': tiling,  # Penrose and Truchet tilings (see sketchlib.tiling)
+            'shapes': shapes,  # batched NumPy lines, polygons, circles (see sketchlib.shapes)
+            'stamps': stamps,  # cached raster motifs (see sketchlib.stamps)
+            'palette': palette,  # vectorized colour conversions and gradients (see sketchlib.palette)
         }
-    
-    def execute(self, code: str, output_path: Path) -> tuple[bool, str]:
-        """Execute generated code and save to output_path"""
-        
+
+    def run(self, code: str, seed: int = None, extra: dict = None) -> dict:
+        """Execute code under the timeout and return its namespace.
+
+        Raises TimeoutError or whatever the sketch raised.
+        """
+
+        if self.optimize and isinstance(code, str):
+            code = optimize_sketch(reroute_pixel_loops(code))
+
         # Create isolated namespace
         namespace = self.allowed_imports.copy()
-        
+        if self.optimize:
+            namespace['__raster__'] = PixelRaster()
+        namespace.update(extra or {})
+
+        # Seeding the shared modules makes reruns (e.g. per tile) draw identically
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed & 0xFFFFFFFF)  # NumPy's legacy seed takes 32 bits
+            namespace['__seed__'] = seed  # for sketches rewritten by agents.seed_sweep
+
         # Timeout handler
         def timeout_handler(signum, frame):
-            raise TimeoutError(f"Execution exceeded {self.timeout}s")
-        
+            raise TimeoutError(f"Execution exceeded {self.timeout:g}s")
+
         signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(self.timeout)
-        
+        signal.setitimer(signal.ITIMER_REAL, self.timeout)  # allows fractional timeouts
+
         try:
-            # Execute code
             exec(code, namespace)
-            
+            return namespace
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)  # Cancel alarm
+
+    def execute(self, code: str | CodeType, output_path: Path, seed: int = None) -> tuple[bool, str]:
+        """Execute generated code (source, or compiled by compile_sketch) and save to output_path"""
+
+        try:
+            if isinstance(code, str):
+                code = compile_sketch(code, self.record, self.optimize, reseed=seed is not None)
+            recorder = OpRecorder() if '__recorder__' in code.co_names else None
+
+            # Execute code
+            namespace = self.run(code, seed, {'__recorder__': recorder} if recorder else None)
+
             # Check if surface was created
             if 'surface' not in namespace:
                 return False, "Code didn't create 'surface' variable"
-            
+
             # Save output
             surface = namespace['surface']
-            surface.write_to_png(str(output_path))
-            
+            if recorder:
+                extents = surface.get_extents()
+                recording = Recording((extents.width, extents.height), surface, recorder.ops)
+                recording.to_png(output_path)
+                if recorder.serializable:
+                    recording.save(output_path.with_name(output_path.stem + RECORDING_SUFFIX))
+            else:
+                surface.write_to_png(str(output_path))
+
             return True, "Success"
-            
+
         except TimeoutError as e:
             return False, str(e)
         except Exception as e:
             return False, f"Error: {traceback.format_exc()}"
-        finally:
-            signal.alarm(0)  # Cancel alarm
@@ -0,0 +1,185 @@
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+import json
+import numpy as np
+from PIL import Image
+from agents.image_metrics import variant_score
+from config.settings import GALLERY_DIR, GALLERY_HASHES_PATH, DEDUPE_RADIUS, DEDUPE_RECENT_DAYS
+
+HASH_SIZE = 8  # hash bits come from the HASH_SIZE x HASH_SIZE lowest DCT frequencies
+SAMPLE_SIZE = 32  # grayscale resample the DCT runs on
+
+# Rows of the orthonormal DCT-II matrix for the lowest frequencies only
+_k = np.arange(SAMPLE_SIZE)
+_DCT = np.sqrt(2 / SAMPLE_SIZE) * np.cos(np.pi * (2 * _k[None, :] + 1) * _k[:HASH_SIZE, None] / (2 * SAMPLE_SIZE))
+_DCT[0] /= np.sqrt(2)
+
+
+def phash(image: Path | Image.Image) -> int:
+    """64-bit perceptual hash: low DCT frequencies of the grayscale image above or below their median"""
+    if not isinstance(image, Image.Image):
+        image = Image.open(image)
+    gray = np.asarray(image.convert('L').resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.LANCZOS), dtype=np.float64)
+    frequencies = (_DCT @ gray @ _DCT.T).ravel()
+    bits = frequencies > np.median(frequencies[1:])  # the DC term would skew the median
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class MultiIndex:
+    """Multi-index hash table of 64-bit hashes for Hamming-radius queries.
+
+    Each hash is split into CHUNKS 16-bit chunks with a table per chunk. Two
+    hashes within radius r must agree on at least one chunk to within r // CHUNKS
+    bits (pigeonhole), so a query only probes those few chunk values and
+    checks the full distance of what they turn up.
+    """
+    CHUNKS = 4
+    BITS = 16
+
+    def __init__(self):
+        self.tables = [{} for _ in range(self.CHUNKS)]  # chunk value -> ids
+        self.values = []
+        self.items = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def _chunks(self, value: int):
+        mask = (1 << self.BITS) - 1
+        return [(value >> (i * self.BITS)) & mask for i in range(self.CHUNKS)]
+
+    def add(self, value: int, item):
+        ident = len(self.values)
+        self.values.append(value)
+        self.items.append(item)
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            table.setdefault(chunk, []).append(ident)
+
+    def query(self, value: int, radius: int) -> list[tuple[int, object]]:
+        """(distance, item) for every item within radius, nearest first"""
+        flips = _flips(self.BITS, radius // self.CHUNKS)
+        seen, found = set(), []
+        for table, chunk in zip(self.tables, self._chunks(value)):
+            for flip in flips:
+                for ident in table.get(chunk ^ flip, ()):
+                    if ident in seen:
+                        continue
+                    seen.add(ident)
+                    distance = hamming(value, self.values[ident])
+                    if distance <= radius:
+                        found.append((distance, self.items[ident]))
+        found.sort(key=lambda match: match[0])
+        return found
+
+
+@lru_cache(maxsize=None)
+def _flips(bits: int, count: int) -> tuple[int, ...]:
+    """Every mask of up to count set bits among the low `bits` bits"""
+    return tuple(sum(1 << b for b in chosen) for n in range(count + 1) for chosen in combinations(range(bits), n))
+
+
+def _period(key: str) -> str:
+    """'<date>/period_N' for a gallery render, whether the latest copy or an archived one"""
+    path = Path(key)
+    return f"{path.parts[0]}/{'_'.join(path.stem.split('_')[:2])}"
+
+
+def _day(key: str) -> date | None:
+    try:
+        return date.fromisoformat(Path(key).parts[0])
+    except ValueError:
+        return None
+
+
+class GalleryIndex:
+    """Perceptual hashes of every gallery render (winners and their archive), searchable by Hamming radius.
+
+    Hashes are cached in GALLERY_HASHES_PATH by path and modification time,
+    so a refresh only hashes renders uploaded since the last one.
+    """
+
+    def __init__(self, gallery_dir: Path = GALLERY_DIR, cache_path: Path = GALLERY_HASHES_PATH):
+        self.gallery_dir = Path(gallery_dir)
+        self.cache_path = Path(cache_path)
+        self.hashes = {}  # gallery-relative path -> hash
+        self.table = MultiIndex()
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Sync with the gallery directory; returns how many renders were hashed"""
+        cached = json.loads(self.cache_path.read_text()) if self.cache_path.exists() else {}
+        entries, hashed = {}, 0
+        for path in sorted(self.gallery_dir.glob('**/*.png')):
+            key = str(path.relative_to(self.gallery_dir))
+            mtime = path.stat().st_mtime
+            entry = cached.get(key)
+            if entry is None or entry['mtime'] != mtime:  # period_N.png is overwritten by re-runs
+                entry = {'hash': f"{phash(path):016x}", 'mtime': mtime}
+                hashed += 1
+            entries[key] = entry
+        if hashed or entries.keys() != cached.keys():
+            self.cache_path.write_text(json.dumps(entries, indent=1))
+
+        self.hashes = {key: int(entry['hash'], 16) for key, entry in entries.items()}
+        self.table = MultiIndex()
+        for key, value in self.hashes.items():
+            self.table.add(value, key)
+        return hashed
+
+    def near(self, value: int, radius: int = DEDUPE_RADIUS, since: date = None) -> list[tuple[int, str]]:
+        """(distance, gallery path) of renders within radius, nearest first; since limits them by gallery date"""
+        matches = self.table.query(value, radius)
+        if since is None:
+            return matches
+        return [(distance, key) for distance, key in matches if (_day(key) or date.min) >= since]
+
+
+def collapse(candidates: list[dict], index: GalleryIndex = None, radius: int = DEDUPE_RADIUS,
+             recent_days: int = DEDUPE_RECENT_DAYS) -> tuple[list[dict], list[tuple[dict, str]]]:
+    """Collapse near-duplicate candidates and drop repeats of recent winners.
+
+    Each group of candidates within radius of each other keeps its best
+    variant_score (candidates without metrics keep their order); a survivor
+    within radius of a gallery render from the last recent_days is dropped,
+    unless that would leave nothing to curate. Mutants (MutationSearch) are
+    expected to resemble their parent winner, so its renders don't count. Sets candidate['phash'].
+    Returns (kept, [(dropped candidate, reason)]).
+    """
+    for candidate in candidates:
+        candidate['phash'] = phash(candidate['image'])
+    ranked = sorted(candidates, key=lambda c: -variant_score(c['metrics']) if c.get('metrics') else 0)
+
+    survivors, dropped, seen = [], [], MultiIndex()
+    for candidate in ranked:
+        match = seen.query(candidate['phash'], radius)
+        if match:
+            distance, twin = match[0]
+            dropped.append((candidate, f"near-duplicate of {twin['id']} (distance {distance})"))
+            continue
+        seen.add(candidate['phash'], candidate)
+        survivors.append(candidate)
+
+    if index is not None:
+        since = date.today() - timedelta(days=recent_days)
+        fresh = []
+        for candidate in survivors:
+            match = [(distance, key) for distance, key in index.near(candidate['phash'], radius, since)
+                     if _period(key) != candidate.get('parent_gallery')]
+            if match:
+                distance, key = match[0]
+                dropped.append((candidate, f"repeats gallery {key} (distance {distance})"))
+            else:
+                fresh.append(candidate)
+        if not fresh and survivors:
+            fresh = survivors[:1]
+            dropped = [(c, reason) for c, reason in dropped if c is not fresh[0]]
+        survivors = fresh
+
+    order = {id(c): i for i, c in enumerate(candidates)}
+    return sorted(survivors, key=lambda c: order[id(c)]), dropped
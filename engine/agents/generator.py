@@ -1,6 +1,7 @@
 from google import genai
-from config.settings import GEMINI_API_KEY
+from config.settings import GEMINI_API_KEY, GENERATION_TIMEOUT, TIMEOUT_BOUNDS
 from agents.inspiration_analyzer import InspirationAnalyzer
+from agents.cost_model import load_cost_table
 import re
 import asyncio
 
@@ -33,6 +34,42 @@ ctx.paint()
 # IMPORTANT: Don't call surface.write_to_png() - that's handled externally
 ```
 
+PRE-LOADED HELPERS (already in scope - never import them). They work on NumPy arrays; pick one
+`seed = random.randint(0, 10**6)` per sketch and pass seed=seed. Shape i of (points, offsets) is
+points[offsets[i]:offsets[i + 1]]. Never loop per vertex, pixel or cell, or over all pairs, when one fits:
+- shapes: thousands of lines/polygons/circles in one path, per-item colours (example below)
+- palette: colour tables and HSV/OKLCH conversions on arrays, never colorsys per shape (example below)
+- noise: noise grids and curl fields, never hand-written sin/cos pseudo-noise (example below)
+- flow: `points, offsets = flow.trace(angles_or_vxvy, 3000, steps=150, step_size=2, field_step=4, seed=seed)`, then `flow.draw(ctx, points, offsets); ctx.stroke()`; edges='wrap'
+- contour: `values = contour.evaluate(f, width, height, step=2)` with f(x, y) in np.*, `points, offsets, level = contour.lines(values, levels, step=2)`, `contour.draw(ctx, points, offsets)`
+- geometry: `geometry.delaunay(points)` -> (T, 3) indices, `vertices, offsets = geometry.voronoi(points, (0, 0, width, height))`; also relax, split, edges, centroids
+- tiling: `tiling.penrose(width, height, depth=6, kind='P3', seed=seed)` or `tiling.truchet(width, height, 30, style='arcs', seed=seed)` -> (vertices, offsets, kinds); `tiling.fill(ctx, vertices, offsets, kinds, colours)`, `tiling.outline`/`tiling.draw` + stroke
+- spatial: `spatial.pack(width, height, 800, min_radius=2, max_radius=60, seed=seed)` -> (n, 3) x, y, r; also poisson_disk(width, height, 12), pairs(points, 40), KDTree(points).knn(x, y, 3)
+- stamps: one small shape drawn hundreds of times: `motif = stamps.Motif(draw_fn, radius=11)` (draw_fn(ctx) around 0, 0), `stamps.stamp_many(ctx, motif, centres, rotations=angles, colours=rgb)`
+- pixels: whole-image effects after drawing: `pixels.blend(surface, pixels.radial_gradient(width, height, [(0, rgb), (1, rgb)]), 'overlay', 0.5)`, `pixels.grain(surface, 0.04, seed=seed)`, `pixels.dither(surface, levels=4)`
+- reaction: `field = reaction.gray_scott(width, height, *reaction.PRESETS['maze'], iterations=1000, seed=seed)` (cost grows with iterations), `reaction.draw(ctx, field, width, height, dark=(0, 0, 0), light=(1, 1, 1))`
+
+```python
+import numpy as np
+seed = random.randint(0, 10**6)
+# shapes: compute coordinates with np.* and draw them in one call
+t = np.linspace(0, 2 * np.pi, 20000)
+shapes.lines(ctx, np.column_stack([cx + 250 * np.sin(3 * t + 0.5), cy + 200 * np.sin(4 * t)]))  # one path, one stroke
+shapes.lines(ctx, points, offsets, colours=rgba, widths=w)   # many polylines, (n, 3|4) colours, grouped per style
+shapes.polygons(ctx, vertices, offsets, colours=rgb)          # filled
+k = np.arange(3000); r = 6 * np.sqrt(k); a = k * 2.39996
+shapes.circles(ctx, np.column_stack([cx + r * np.cos(a), cy + r * np.sin(a)]), 3, colours=rgba, levels=32)  # levels: fewer fills
+# palette: float arrays in 0..1, channels last
+lut = palette.gradient(['#1b1f3a', '#e94f37', '#f6f7eb'], n=64)   # OKLab-smooth table
+colours = palette.lookup(lut, t, alpha=0.6)        # t: 0..1 per shape -> (n, 4), ready for shapes/stamps
+rgb = palette.hsv_to_rgb(hues, 0.7, 0.9)           # also rgb_to_hsv, to_oklch/from_oklch, mix(a, b, t), rgb('#ff8800')
+# noise: arrays are [y, x] in about -1..1
+field = noise.grid(width, height, scale=0.01, octaves=4, seed=seed)
+vx, vy = noise.curl_grid(width, height, scale=0.005, seed=seed)       # divergence-free flow vectors
+at = noise.lookup(field)                                              # at(x, y) -> nearest value, cheap in loops
+# also noise.fbm/perlin/simplex(x, y, seed=seed) for single points or arrays
+```
+
 AESTHETIC GUIDELINES:
 - Swiss design principles: grids, precision, hierarchy
 - High contrast (often black/white, minimal color)
@@ -67,6 +104,35 @@ Draw creative INSPIRATION from reference images (DO NOT copy exactly):
 Be creative but maintain systematic thinking. Each sketch should explore a unique concept.
 """
 
+def performance_guidance(costs: dict = None) -> str:
+    """Render budget section for the prompt, from this device's measured cairo costs"""
+    costs = load_cost_table() if costs is None else costs
+    if not costs:
+        return ""
+
+    def us(*ops):
+        return sum(costs.get(op, 0.0) for op in ops) * 1e6
+
+    segment = us('line_to', 'stroke_per_vertex')
+    shape = us('rectangle', 'fill', 'set_source_rgba')
+    # Leave half the timeout as headroom for the sketch's own math
+    budget = int(GENERATION_TIMEOUT * 0.5 / max(segment, 1) * 1e6)
+    reaction = ""
+    if costs.get('gray_scott_iteration'):
+        # Calibrated per-theme timeouts can drop to the floor, so plan reaction-diffusion against that
+        iterations = int(min(GENERATION_TIMEOUT, TIMEOUT_BOUNDS[0]) * 0.5 / costs['gray_scott_iteration'])
+        reaction = f"- reaction.gray_scott: ~{costs['gray_scott_iteration'] * 1e3:.2f}ms per iteration; use at most {iterations:,} iterations\n"
+    return f"""PERFORMANCE BUDGET (measured on the rendering device, {GENERATION_TIMEOUT}s hard timeout):
+- Stroked line segment: ~{segment:.1f}µs per vertex
+- Filled shape with its own color: ~{shape:.1f}µs (alpha adds ~{us('fill_alpha_extra'):.1f}µs)
+- Circle (arc + fill): ~{us('arc', 'arc_fill'):.1f}µs
+- Text (show_text): ~{us('show_text'):.1f}µs
+- Full-canvas paint: ~{us('paint'):.0f}µs
+- Color/line-width change: ~{us('set_source_rgb'):.1f}µs
+{reaction}Keep the total under roughly {budget:,} line segments (or equivalent); batch many vertices into one path before stroke().
+"""
+
+
 class GeneratorAgent:
     def __init__(self):
         self.client = genai.Client(api_key=GEMINI_API_KEY)
@@ -97,13 +163,14 @@ class GeneratorAgent:
         
         # Get visual inspiration for this batch
         inspiration_brief = await self.analyzer.get_creative_direction()
+        guidance = performance_guidance()
         
         sketches = []
         
         for i in range(n):
             theme = themes[i % len(themes)]
             
-            prompt = f"{SYSTEM_PROMPT}\n\nVISUAL INSPIRATION BRIEF:\n{inspiration_brief}\n\nCreate: {theme}\nMake it visually striking, mathematically sophisticated, and systematic."
+            prompt = f"{SYSTEM_PROMPT}\n{guidance}\nVISUAL INSPIRATION BRIEF:\n{inspiration_brief}\n\nCreate: {theme}\nMake it visually striking, mathematically sophisticated, and systematic."
             
             try:
                 response = self.client.models.generate_content(
@@ -0,0 +1,92 @@
+from pathlib import Path
+import numpy as np
+from PIL import Image
+from config.settings import (
+    PREFILTER_MIN_COVERAGE, PREFILTER_MAX_DOMINANT, PREFILTER_MIN_ENTROPY, PREFILTER_MIN_HIGHLIGHT, PREFILTER_MAX_NOISE,
+)
+
+THUMBNAIL_SIZE = 160  # metrics are computed on a thumbnail; plenty for these statistics
+
+
+def _load(image) -> np.ndarray:
+    if not isinstance(image, Image.Image):
+        image = Image.open(image)
+    image = image.convert('RGB')
+    image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    return np.asarray(image, dtype=np.float32)
+
+
+def image_metrics(image: Path | Image.Image) -> dict:
+    """Cheap statistics of a render, each in 0..1.
+
+    coverage: share of pixels that differ from the dominant (background) colour
+    dominant: share of the dominant colour
+    entropy: normalized luminance histogram entropy
+    edges: share of pixels on a noticeable luminance edge
+    colourfulness: Hasler–Süsstrunk colourfulness, scaled
+    highlight: 99.9th percentile luminance (how bright the brightest marks are)
+    noise: spectral flatness of luminance; white noise is about 0.53, drawings far lower
+    """
+    rgb = _load(image)
+    quantized = (rgb.astype(np.uint32) >> 4)
+    keys = (quantized[..., 0] << 8) | (quantized[..., 1] << 4) | quantized[..., 2]
+    counts = np.bincount(keys.ravel(), minlength=4096)
+    dominant_key = int(counts.argmax())
+    background = np.array([(dominant_key >> 8) & 15, (dominant_key >> 4) & 15, dominant_key & 15]) * 16 + 8
+    coverage = float(np.mean(np.abs(rgb - background).sum(axis=2) > 48))
+
+    luminance = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    hist = np.bincount(np.clip(luminance, 0, 255).astype(np.uint8).ravel() >> 2, minlength=64) / luminance.size
+    hist = hist[hist > 0]
+    entropy = float(-(hist * np.log2(hist)).sum() / 6)
+
+    gy, gx = np.gradient(luminance)
+    edges = float(np.mean(np.hypot(gx, gy) > 20))
+    highlight = float(np.percentile(luminance, 99.9)) / 255
+
+    power = (np.abs(np.fft.rfft2(luminance - luminance.mean())) ** 2).ravel()[1:]
+    noise = float(np.exp(np.log(power + 1e-12).mean()) / power.mean()) if power.mean() > 0 else 0.0
+
+    rg = rgb[..., 0] - rgb[..., 1]
+    yb = 0.5 * (rgb[..., 0] + rgb[..., 1]) - rgb[..., 2]
+    colourfulness = float(np.hypot(rg.std(), yb.std()) + 0.3 * np.hypot(rg.mean(), yb.mean())) / 100
+
+    return {
+        'coverage': round(coverage, 4),
+        'dominant': round(float(counts.max() / keys.size), 4),
+        'entropy': round(entropy, 4),
+        'edges': round(edges, 4),
+        'colourfulness': round(min(1.0, colourfulness), 4),
+        'highlight': round(min(1.0, highlight), 4),
+        'noise': round(noise, 4),
+    }
+
+
+def variant_score(metrics: dict) -> float:
+    """Rank renders of the same sketch: favour detail and tonal range over empty canvases"""
+    return round(
+        0.35 * metrics['entropy']
+        + 0.25 * min(1.0, metrics['coverage'] / 0.3)
+        + 0.2 * min(1.0, metrics['edges'] / 0.2)
+        + 0.2 * metrics['colourfulness'],
+        4
+    )
+
+
+def degenerate(metrics: dict) -> str | None:
+    """Why a render isn't worth sending to the curator, or None if it is.
+
+    Thresholds (config.settings PREFILTER_*) let every gallery winner
+    through; re-check them with benchmarks/prefilter.py after changing them.
+    """
+    if metrics['highlight'] < PREFILTER_MIN_HIGHLIGHT:
+        return f"almost black: highlight {metrics['highlight']:.3f}"
+    if metrics['coverage'] < PREFILTER_MIN_COVERAGE:
+        return f"nothing drawn: coverage {metrics['coverage']:.4f}"
+    if metrics['dominant'] > PREFILTER_MAX_DOMINANT:
+        return f"mostly one colour: dominant {metrics['dominant']:.3f}"
+    if metrics['entropy'] < PREFILTER_MIN_ENTROPY:
+        return f"flat: entropy {metrics['entropy']:.3f}"
+    if metrics['noise'] > PREFILTER_MAX_NOISE:
+        return f"noise only: spectral flatness {metrics['noise']:.3f}"
+    return None
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+import base64
+import time
+from PIL import Image, features
+from config.settings import CURATOR_MAX_EDGE, CURATOR_IMAGE_FORMAT, CURATOR_IMAGE_QUALITY, CURATOR_ENCODE_WORKERS
+
+MEDIA_TYPES = {'PNG': 'image/png', 'JPEG': 'image/jpeg', 'WEBP': 'image/webp'}
+
+
+def encode_image(image: Path, max_edge: int | None = CURATOR_MAX_EDGE, fmt: str | None = CURATOR_IMAGE_FORMAT,
+                 quality: int = CURATOR_IMAGE_QUALITY) -> tuple[str, bytes]:
+    """A render as (media type, encoded bytes), shrunk to max_edge and re-encoded.
+
+    fmt=None returns the file untouched as PNG (the original payload).
+    """
+    if fmt is None:
+        return MEDIA_TYPES['PNG'], Path(image).read_bytes()
+    fmt = fmt.upper()
+    if fmt == 'WEBP' and not features.check('webp'):
+        fmt = 'JPEG'
+
+    with Image.open(image) as im:
+        im = im.convert('RGB')  # alpha is dropped, as on the TFT (DisplayManager.compose pastes without a mask)
+        if max_edge and max(im.size) > max_edge:
+            im.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        buffer = BytesIO()
+        if fmt == 'WEBP':
+            im.save(buffer, 'WEBP', quality=quality, method=4)
+        else:
+            im.save(buffer, 'JPEG', quality=quality, optimize=True)
+    return MEDIA_TYPES[fmt], buffer.getvalue()
+
+
+def build_image_blocks(images: list, max_edge: int | None = CURATOR_MAX_EDGE, fmt: str | None = CURATOR_IMAGE_FORMAT,
+                       quality: int = CURATOR_IMAGE_QUALITY,
+                       workers: int = CURATOR_ENCODE_WORKERS) -> tuple[list[dict], dict]:
+    """Base64 image content blocks for the messages API, encoded in a thread pool, in input order.
+
+    Returns (blocks, stats) where stats has the original and sent byte
+    totals and the wall time spent encoding.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        encoded = list(pool.map(lambda image: encode_image(image, max_edge, fmt, quality), images))
+
+    blocks = [{
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": media_type,
+            "data": base64.b64encode(data).decode()
+        }
+    } for media_type, data in encoded]
+
+    stats = {
+        'images': len(blocks),
+        'original_bytes': sum(Path(image).stat().st_size for image in images),
+        'encoded_bytes': sum(len(data) for _, data in encoded),
+        'payload_bytes': sum(len(block['source']['data']) for block in blocks),  # base64, as uploaded
+        'encode_seconds': round(time.perf_counter() - start, 3),
+    }
+    return blocks, stats
@@ -0,0 +1,210 @@
+import ast
+import math
+import time
+from pathlib import Path
+import cairo
+import numpy as np
+from agents.executor import PIXEL_ACCESS, SafeExecutor
+from agents.sketch_ast import find_surface_setup, paint_scaled, reseed_sketch
+from agents.cost_model import module_constants
+from config.settings import (
+    ARTWORK_SIZE, DISPLAY_WIDTH, DISPLAY_HEIGHT, FRAMEBUFFER_PATH,
+    LIVE_FPS, LIVE_MODE, LIVE_DRIFT_AMPLITUDE, LIVE_DRIFT_PERIOD, LIVE_FRAME_TIMEOUT,
+)
+
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))  # decorrelates drift phases between constants
+# Calls whose arguments are counts or sizes; constants passed to them never drift
+SIZE_CALLS = {
+    'range', 'ImageSurface', 'zeros', 'ones', 'empty', 'full', 'arange', 'linspace', 'reshape', 'repeat', 'tile',
+    'integers', 'randint', 'randrange', 'sample', 'choices',
+}
+
+
+class Framebuffer:
+    """Memory-mapped Linux framebuffer (or a plain file standing in for one)"""
+
+    def __init__(self, path: Path = FRAMEBUFFER_PATH, width: int = DISPLAY_WIDTH,
+                 height: int = DISPLAY_HEIGHT, bpp: int = None, stride: int = None):
+        self.path = Path(path)
+        self.width, self.height = width, height
+        sysfs = Path('/sys/class/graphics') / self.path.name
+        self.bpp = bpp or self._read_sysfs(sysfs / 'bits_per_pixel') or 32
+        self.stride = stride or self._read_sysfs(sysfs / 'stride') or width * self.bpp // 8
+        self.buffer = np.memmap(self.path, dtype=np.uint8, mode='r+', shape=(height, self.stride))
+
+    @staticmethod
+    def _read_sysfs(path: Path):
+        try:
+            return int(path.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    def blit(self, bgra: np.ndarray, x: int = 0, y: int = 0):
+        """Copy an (h, w, 4) cairo-layout (BGRA on little-endian) block to the screen"""
+        h, w = bgra.shape[:2]
+        if self.bpp == 32:
+            self.buffer[y:y + h, x * 4:(x + w) * 4] = bgra.reshape(h, w * 4)
+        else:  # RGB565
+            b, g, r = (bgra[..., i].astype(np.uint16) for i in range(3))
+            rgb565 = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+            self.buffer[y:y + h, x * 2:(x + w) * 2] = rgb565.astype('<u2').view(np.uint8).reshape(h, w * 2)
+
+    def blit_image(self, image, x: int = 0, y: int = 0):
+        """Copy a PIL RGB image to the screen"""
+        rgb = np.asarray(image.convert('RGB'))
+        bgra = np.empty(rgb.shape[:2] + (4,), dtype=np.uint8)
+        bgra[..., 0], bgra[..., 1], bgra[..., 2], bgra[..., 3] = rgb[..., 2], rgb[..., 1], rgb[..., 0], 255
+        self.blit(bgra, x, y)
+
+
+def _driftable(tree: ast.Module) -> set:
+    """UPPER_CASE constants safe to modulate independently.
+
+    Each must be bound once, to a bare number literal, and not be a count
+    or size (range bound, array shape, index, list repetition) or part of
+    another top-level assignment such as `CELL = SIZE / GRID`.
+    """
+    def names(node) -> set:
+        return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+    literals, derived = set(), set()
+    for stmt in tree.body:
+        if not isinstance(stmt, ast.Assign):
+            continue
+        value = stmt.value.operand if isinstance(stmt.value, ast.UnaryOp) and isinstance(stmt.value.op, ast.USub) else stmt.value
+        if len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name) \
+                and isinstance(value, ast.Constant) and type(value.value) in (int, float):
+            literals.add(stmt.targets[0].id)
+        else:
+            derived |= names(stmt.value)
+
+    stores, sized = {}, set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            stores[node.id] = stores.get(node.id, 0) + 1
+        elif isinstance(node, ast.Call):
+            func = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, 'attr', None)
+            if func in SIZE_CALLS:
+                sized |= {n for arg in node.args + [k.value for k in node.keywords] for n in names(arg)}
+        elif isinstance(node, ast.Subscript):
+            sized |= names(node.slice)
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+            for seq, count in ((node.left, node.right), (node.right, node.left)):
+                if isinstance(seq, (ast.List, ast.Tuple)) or (isinstance(seq, ast.Constant) and isinstance(seq.value, str)):
+                    sized |= names(count)
+    return {name for name in literals if name.isupper() and stores.get(name) == 1} - sized - derived
+
+
+def prepare_live_code(code: str, size: tuple[int, int], drift: bool) -> tuple[str, dict]:
+    """Rewrite a sketch to draw into a reused surface, scaled to `size`.
+
+    With drift, top-level UPPER_CASE constants that are plain numbers (see
+    _driftable) are read from `__params__` so they can be modulated per frame. Sketches using `pixels`
+    at another size keep their own surface, which is scaled into `__surface__`
+    at the end. Returns the new source and the constants' original values.
+    """
+    tree = ast.parse(code)
+    setup = find_surface_setup(tree)
+    base_w, base_h = setup['size']
+    scale = min(size[0] / base_w, size[1] / base_h)
+    native = scale != 1 and PIXEL_ACCESS.search(code)
+    if native:
+        # Pixel edits ignore the context transform, so scale the finished canvas instead
+        tree = ast.parse(paint_scaled(code, '__surface__', '__surface__', f"{{ctx}}.scale({scale!r}, {scale!r})\n"))
+
+    params = {}
+    if drift:
+        constants = module_constants(tree)
+        driftable = _driftable(tree)
+        for stmt in tree.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                name = stmt.targets[0].id
+                if name in driftable and name in constants:
+                    params[name] = constants[name]
+                    stmt.value = ast.parse(f"__params__[{name!r}]", mode='eval').body
+
+    if not native:
+        tree.body[setup['surface_index']].value = ast.parse('__surface__', mode='eval').body
+        ci = setup['context_index'] + 1
+        if scale != 1:
+            tree.body[ci:ci] = ast.parse(f"{setup['context_name']}.scale({scale!r}, {scale!r})").body
+    return ast.unparse(ast.fix_missing_locations(tree)), params
+
+
+class LiveArtwork:
+    """Re-runs a sketch continuously and pushes frames straight to the framebuffer.
+
+    The sketch is compiled once and every frame draws into the same cairo
+    surface, whose pixel memory is blitted without conversion on 32bpp
+    screens.
+    """
+
+    def __init__(self, code: str, framebuffer: Framebuffer, fps: float = LIVE_FPS,
+                 mode: str = LIVE_MODE, seed: int = None):
+        self.framebuffer = framebuffer
+        self.fps = fps
+        self.mode = mode
+        # The render's seed (gallery metadata) reproduces it, self-seeding sketches included
+        self.seed = 0 if seed is None else seed
+        if seed is not None:
+            code = reseed_sketch(code)
+        self.width, self.height = ARTWORK_SIZE
+        source, self.base_params = prepare_live_code(code, ARTWORK_SIZE, drift=(mode == 'drift'))
+        self.compiled = compile(source, '<live sketch>', 'exec')
+        self.executor = SafeExecutor(timeout=LIVE_FRAME_TIMEOUT)
+
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, self.width, self.height)
+        self._clear = cairo.Context(self.surface)
+        self._clear.set_operator(cairo.OPERATOR_CLEAR)
+        stride = self.surface.get_stride()
+        pixels = np.ndarray((self.height, stride), dtype=np.uint8, buffer=self.surface.get_data())
+        self.pixels = pixels[:, :self.width * 4].reshape(self.height, self.width, 4)
+
+    def params_at(self, t: float) -> dict:
+        """Constants for time t, each oscillating around its original value"""
+        params = {}
+        for i, (name, base) in enumerate(self.base_params.items()):
+            factor = 1 + LIVE_DRIFT_AMPLITUDE * math.sin(2 * math.pi * t / LIVE_DRIFT_PERIOD + i * GOLDEN_ANGLE)
+            value = base * factor
+            params[name] = max(1, round(value)) if isinstance(base, int) and base >= 1 else value
+        return params
+
+    def render_frame(self, frame: int, t: float) -> np.ndarray:
+        """Draw one frame into the reused surface and return its pixel view"""
+        self._clear.paint()
+        seed = self.seed + frame if self.mode == 'seed' else self.seed
+        self.executor.run(self.compiled, seed, {'__surface__': self.surface, '__params__': self.params_at(t)})
+        self.surface.flush()
+        return self.pixels
+
+    def run(self, duration: float = None, frames: int = None) -> dict:
+        """Animate until duration/frames is reached (forever if neither is given)"""
+        interval = 1 / self.fps
+        render_times, blit_times = [], []
+        start = time.perf_counter()
+        next_frame = start
+        frame = 0
+
+        while (duration is None or time.perf_counter() - start < duration) and (frames is None or frame < frames):
+            t0 = time.perf_counter()
+            pixels = self.render_frame(frame, t0 - start)
+            t1 = time.perf_counter()
+            self.framebuffer.blit(pixels)
+            t2 = time.perf_counter()
+            render_times.append(t1 - t0)
+            blit_times.append(t2 - t1)
+            frame += 1
+
+            # Pace to the target rate; late frames are not made up
+            next_frame = max(next_frame + interval, t2)
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+        elapsed = time.perf_counter() - start
+        render_ms = sorted(x * 1000 for x in render_times) or [0.0]
+        return {
+            'frames': frame,
+            'fps': frame / elapsed if elapsed else 0.0,
+            'render_ms_p50': render_ms[len(render_ms) // 2],
+            'render_ms_p95': render_ms[min(len(render_ms) - 1, int(len(render_ms) * 0.95))],
+            'blit_ms_p50': sorted(blit_times)[len(blit_times) // 2] * 1000 if blit_times else 0.0,
+        }
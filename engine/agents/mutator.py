@@ -0,0 +1,169 @@
+import ast
+import itertools
+import json
+import math
+import random
+from pathlib import Path
+from agents.cost_model import extract_features
+from agents.image_metrics import image_metrics, variant_score
+from agents.scheduler import RenderScheduler
+from agents.sketch_ast import find_surface_setup
+from config.settings import (
+    GALLERY_DIR, MUTATION_WINNERS, MUTATION_MAX_KNOBS, MUTATION_COST_RATIO, TIMEOUT_MARGIN,
+)
+
+# Multiplicative range for a mutation; counts are kept >= 1, ratios in (0, 1] stay <= 1
+FACTOR_RANGE = (0.6, 1.6)
+
+
+def _knob_nodes(tree: ast.Module) -> list[tuple[str, ast.Constant]]:
+    """(name, literal) for numeric configuration constants and the literal factors in their expressions"""
+    try:
+        canvas = set()
+        setup = find_surface_setup(tree)
+        for arg in tree.body[setup['surface_index']].value.args[1:]:
+            canvas |= {n.id for n in ast.walk(arg) if isinstance(n, ast.Name)}
+    except ValueError:
+        pass
+
+    # Configuration lives at module level or at the top of a sketch's draw function
+    statements = [(None, stmt) for stmt in tree.body]
+    statements += [(fn.name, stmt) for fn in tree.body if isinstance(fn, ast.FunctionDef) for stmt in fn.body]
+
+    knobs = []
+    for scope, stmt in statements:
+        if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)):
+            continue
+        name = stmt.targets[0].id if scope is None else f"{scope}.{stmt.targets[0].id}"
+        if name in canvas:
+            continue
+        value = stmt.value.operand if isinstance(stmt.value, ast.UnaryOp) else stmt.value
+        if isinstance(value, ast.Constant):
+            knobs.append((name, value))
+            continue
+        # Factors like `min(width, height) * 0.45`; divisors such as `width // 2` are structural
+        for node in ast.walk(stmt.value):
+            if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+                knobs.extend((name, side) for side in (node.left, node.right) if isinstance(side, ast.Constant))
+    return [(name, node) for name, node in knobs
+            if type(node.value) in (int, float) and node.value not in (0, 1)]
+
+
+def tunable_constants(code: str) -> list[dict]:
+    """Numeric literals a mutation may change, with their safe ranges"""
+    knobs = []
+    for index, (name, node) in enumerate(_knob_nodes(ast.parse(code))):
+        value = node.value
+        low, high = sorted((value * FACTOR_RANGE[0], value * FACTOR_RANGE[1]))
+        if isinstance(value, int):
+            low, high = max(1, round(low)), max(2, round(high))
+        elif 0 < value <= 1:
+            high = min(high, 1.0)
+        knobs.append({'index': index, 'name': name, 'value': value, 'low': low, 'high': high, 'line': node.lineno})
+    return knobs
+
+
+def mutate(code: str, rng: random.Random, max_knobs: int = MUTATION_MAX_KNOBS) -> tuple[str, dict]:
+    """Change 1..max_knobs constants within their safe ranges; returns (code, {name: [old, new]})"""
+    knobs = tunable_constants(code)
+    if not knobs:
+        return code, {}
+    chosen = rng.sample(knobs, min(len(knobs), rng.randint(1, max_knobs)))
+    tree = ast.parse(code)
+    nodes = _knob_nodes(tree)
+    changes = {}
+    for knob in chosen:
+        node = nodes[knob['index']][1]
+        if isinstance(knob['value'], int):
+            new = rng.randint(knob['low'], knob['high'])
+        else:
+            # Log-uniform so shrinking and growing are equally likely
+            low, high = sorted((knob['low'] / knob['value'], knob['high'] / knob['value']))
+            new = round(knob['value'] * math.exp(rng.uniform(math.log(low), math.log(high))), 4)
+        if new != knob['value']:
+            node.value = new
+            changes.setdefault(knob['name'], []).append([knob['value'], new])
+    return ast.unparse(tree), changes
+
+
+def gallery_winners(limit: int = MUTATION_WINNERS, gallery_dir: Path = GALLERY_DIR) -> list[dict]:
+    """Most recent published sketches as sketch dicts, newest first"""
+    winners = []
+    for path in sorted(gallery_dir.glob('*/period_*.py'), reverse=True)[:limit]:
+        meta_path = path.with_suffix('.json')
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        winners.append({
+            'id': f"{path.parent.name}_{path.stem}",
+            'gallery': f"{path.parent.name}/{path.stem}",  # its renders are <date>/period_N*.png
+            'theme': meta.get('theme', 'unknown'),
+            'code': path.read_text(),
+            'score': meta.get('score'),
+        })
+    return winners
+
+
+class MutationSearch:
+    """Generates cheap candidates by perturbing the numeric constants of winning sketches.
+
+    Every mutation is checked against the static cost model before it is
+    rendered, so variants can't blow the render budget. No LLM calls.
+    """
+
+    def __init__(self, scheduler: RenderScheduler = None, seed: int = None,
+                 max_knobs: int = MUTATION_MAX_KNOBS, cost_ratio: float = MUTATION_COST_RATIO):
+        self.scheduler = scheduler or RenderScheduler()
+        self.rng = random.Random(seed)
+        self.max_knobs = max_knobs
+        self.cost_ratio = cost_ratio
+
+    def _affordable(self, theme: str, parent: dict, features: dict) -> bool:
+        if parent.get('work') and features.get('work', 0) > parent['work'] * self.cost_ratio:
+            return False
+        predicted = self.scheduler.predict(theme, features)
+        budget = self.scheduler.timeout_for(theme, self.scheduler.predict(theme, parent)) / TIMEOUT_MARGIN
+        return predicted <= budget
+
+    def variants(self, sketch: dict, n: int) -> list[dict]:
+        """Up to n distinct, affordable mutations of a sketch"""
+        parent = extract_features(sketch['code'])
+        seen, variants = set(), []
+        for attempt in range(n * 5):
+            if len(variants) == n:
+                break
+            code, changes = mutate(sketch['code'], self.rng, self.max_knobs)
+            key = json.dumps(changes, sort_keys=True)
+            if not changes or key in seen:
+                continue
+            seen.add(key)
+            if not self._affordable(sketch['theme'], parent, extract_features(code)):
+                continue
+            variants.append({
+                'id': f"mut_{sketch['id']}_{len(variants):02d}",
+                'theme': sketch['theme'],
+                'code': code,
+                'parent': sketch['id'],
+                'parent_gallery': sketch.get('gallery'),
+                'mutations': changes,
+            })
+        return variants
+
+    def fill(self, n: int, winners: list[dict] = None) -> list[dict]:
+        """n mutated candidates spread round-robin over recent winners (for short periods)"""
+        winners = [w for w in (winners or gallery_winners()) if tunable_constants(w['code'])]
+        if not winners or n <= 0:
+            return []
+        per_winner = -(-n // len(winners))
+        pools = [self.variants(w, per_winner) for w in winners]
+        mixed = [v for group in itertools.zip_longest(*pools) for v in group if v]
+        return mixed[:n]
+
+    async def search(self, sketches: list[dict], per_sketch: int, output_dir: Path, label: str = None) -> list[dict]:
+        """Render per_sketch mutations of each sketch; successful results ranked by image metrics"""
+        candidates = [v for sketch in sketches for v in self.variants(sketch, per_sketch)]
+        results = await self.scheduler.render(candidates, output_dir, label=label or 'mutation search')
+        ranked = [r for r in results if r['success']]
+        for result in ranked:
+            result['metrics'] = image_metrics(result['image'])
+            result['variant_score'] = variant_score(result['metrics'])
+        ranked.sort(key=lambda r: r['variant_score'], reverse=True)
+        return ranked
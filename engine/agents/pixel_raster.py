@@ -0,0 +1,435 @@
+import ast
+import builtins
+import cairo
+import numpy as np
+from agents.sketch_optimizer import references
+
+SOURCE_METHODS = {'set_source_rgb', 'set_source_rgba'}
+FIELD_PREFIX = '__raster_field_'
+UNKNOWN_SOURCE = (float('nan'),) * 4  # pixels filled before the loop set a colour of its own
+MAX_LAYERS = 4  # fills of one pixel composited as separate layers; deeper overdraw is replayed
+LAYER_PIXELS_PER_FILL = 256  # layer area allowed per collected fill, so sparse fills are replayed
+
+# Pure scalar functions and their elementwise NumPy equivalents
+NUMPY_MATH = {
+    'sin': 'sin', 'cos': 'cos', 'tan': 'tan', 'asin': 'arcsin', 'acos': 'arccos', 'atan': 'arctan',
+    'atan2': 'arctan2', 'sinh': 'sinh', 'cosh': 'cosh', 'tanh': 'tanh', 'sqrt': 'sqrt', 'exp': 'exp',
+    'hypot': 'hypot', 'fabs': 'abs', 'floor': 'floor', 'ceil': 'ceil', 'pow': 'power',
+}
+NUMPY_BUILTINS = {'abs': 'abs', 'int': 'trunc', 'min': 'minimum', 'max': 'maximum'}
+NUMPY_CONSTANTS = {'pi': 'pi', 'tau': 'pi * 2', 'e': 'e'}
+
+
+def _premultiplied(colours: np.ndarray) -> np.ndarray:
+    """(n, 4) float RGBA -> (n, 4) uint8 BGRA, rounded the way cairo rounds solid colours"""
+    rgba = np.clip(colours, 0.0, 1.0)
+    alpha = rgba[:, 3:4]
+    shorts = np.empty_like(rgba)
+    shorts[:, :3] = rgba[:, :3] * alpha * 65535.0 + 0.5
+    shorts[:, 3:] = alpha * 65535.0 + 0.5
+    pixels = (shorts.astype(np.uint32) >> 8).astype(np.uint8)
+    return pixels[:, [2, 1, 0, 3]]
+
+
+class PixelRaster:
+    """Collects 1x1 pixel fills from a sketch loop and composites them in one paint.
+
+    Rewritten sketches call `begin(ctx)`, then `set_source_rgb[a]()`/`pixel()`
+    in place of the per-pixel cairo calls, then `flush(ctx)`. When the context
+    maps user pixels 1:1 onto device pixels, with the OVER operator and no
+    clip, the fills are rasterized with NumPy and painted as image layers;
+    otherwise (or when layers would cost more than the fills) they are
+    replayed through cairo unchanged.
+    """
+
+    def __init__(self):
+        self.ops = []
+        self.colour = UNKNOWN_SOURCE
+        self.pixels = 0  # composited via NumPy (for benchmarks)
+        self.replayed = 0
+
+    def begin(self, ctx):
+        if self.ops:
+            self.flush(ctx)
+        source = ctx.get_source()
+        self.colour = source.get_rgba() if isinstance(source, cairo.SolidPattern) else UNKNOWN_SOURCE
+
+    def set_source_rgb(self, r, g, b):
+        self.colour = (r, g, b, 1.0)
+
+    def set_source_rgba(self, r, g, b, a=1.0):
+        self.colour = (r, g, b, a)
+
+    def pixel(self, x, y):
+        self.ops.append((x, y) + self.colour)
+
+    @staticmethod
+    def _pixel_aligned(ctx) -> bool:
+        m = ctx.get_matrix()
+        return (m.xx, m.yx, m.xy, m.yy) == (1, 0, 0, 1) and float(m.x0).is_integer() and float(m.y0).is_integer()
+
+    @staticmethod
+    def _unclipped(ctx) -> bool:
+        target = ctx.get_target()
+        if not isinstance(target, cairo.ImageSurface):
+            return False
+        try:
+            rectangles = ctx.copy_clip_rectangle_list()
+        except cairo.Error:
+            return False  # not representable as rectangles
+        x, y = ctx.device_to_user(0, 0)
+        return len(rectangles) == 1 and tuple(rectangles[0]) == (x, y, target.get_width(), target.get_height())
+
+    def flush(self, ctx):
+        """Draw everything collected since begin(), leaving ctx's source as the sketch left it"""
+        ops, self.ops = self.ops, []
+        if ops:
+            data = np.array(ops, dtype=np.float64)
+            if ctx.has_current_point() or np.isnan(data).any() \
+                    or not self._composite(ctx, data[:, 0], data[:, 1], data[:, 2:]):
+                self._replay(ctx, ops)
+        if self.colour is not UNKNOWN_SOURCE:
+            ctx.set_source_rgba(*self.colour)
+
+    def _replay(self, ctx, ops):
+        colour = UNKNOWN_SOURCE
+        for x, y, *rgba in ops:
+            if rgba[0] == rgba[0] and rgba != colour:  # NaN (unknown) keeps the sketch's own source
+                ctx.set_source_rgba(*rgba)
+                colour = rgba
+            ctx.rectangle(x, y, 1, 1)
+            ctx.fill()
+        self.replayed += len(ops)
+
+    def _composite(self, ctx, xs: np.ndarray, ys: np.ndarray, colours: np.ndarray) -> bool:
+        if not self._pixel_aligned(ctx) or ctx.get_operator() != cairo.OPERATOR_OVER or not self._unclipped(ctx) \
+                or not (np.all(xs == np.floor(xs)) and np.all(ys == np.floor(ys))):
+            return False
+        xs, ys = xs.astype(np.int64), ys.astype(np.int64)
+        x0, y0 = int(xs.min()), int(ys.min())
+        w, h = int(xs.max()) - x0 + 1, int(ys.max()) - y0 + 1
+        if w * h > 64_000_000:
+            return False
+        index = (ys - y0) * w + (xs - x0)
+        layers = int(np.bincount(index).max())
+        if layers > MAX_LAYERS or layers * w * h > LAYER_PIXELS_PER_FILL * len(index):
+            return False
+        pixels = _premultiplied(colours)
+
+        # Each pixel's k-th fill goes into layer k, so per-pixel order is kept
+        order = np.argsort(index, kind='stable')
+        sorted_index = index[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(sorted_index)) + 1]
+        group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order)) - starts[group]
+
+        for k in range(layers):
+            selected = rank == k
+            layer = np.zeros((h, w, 4), dtype=np.uint8)
+            layer.reshape(-1, 4)[index[selected]] = pixels[selected]
+            image = cairo.ImageSurface.create_for_data(layer, cairo.FORMAT_ARGB32, w, h, w * 4)
+            ctx.save()
+            ctx.set_source_surface(image, x0, y0)  # integer offset: no resampling
+            ctx.paint()
+            ctx.restore()
+        self.pixels += len(xs)
+        return True
+
+    def field(self, ctx, fn, outer: tuple, inner: tuple, free: tuple) -> bool:
+        """Evaluate a vectorized pixel-loop body over the whole grid at once.
+
+        Returns False (having drawn nothing) if the body can't be evaluated
+        on arrays, in which case the caller runs the original loop. That
+        includes bodies whose integer arithmetic leaves exact range: int64
+        wraps silently where Python ints don't, so the body is evaluated on
+        int64 and on float64 grids and must agree on both.
+        """
+        if ctx.has_current_point() or not all(isinstance(v, (int, float)) for v in free):
+            return False
+        try:
+            outer_values, inner_values = np.arange(*outer), np.arange(*inner)
+            grid = np.meshgrid(outer_values, inner_values, indexing='ij')
+            shape = grid[0].shape
+            with np.errstate(all='raise'):
+                result = fn(np, *grid)
+                check = fn(np, *(g.astype(np.float64) for g in grid))
+            columns = [np.broadcast_to(np.asarray(v, dtype=np.float64), shape).ravel() for v in result]
+            if not all(np.array_equal(c, np.broadcast_to(np.asarray(v, dtype=np.float64), shape).ravel())
+                       for c, v in zip(columns, check)):
+                return False  # overflowed (or lost precision) somewhere: replay the loop with Python ints
+        except Exception:
+            return False
+        if len(columns) == 5:
+            columns.append(np.ones_like(columns[0]))
+        if not columns[0].size:
+            return True
+        if not self._composite(ctx, columns[0], columns[1], np.stack(columns[2:], axis=1)):
+            return False
+        last = [float(c[-1]) for c in columns[2:]]
+        ctx.set_source_rgba(*last)
+        return True
+
+
+class _PixelLoops:
+    """Finds loops whose only drawing is `set_source_rgb[a]` + 1x1 `rectangle` + `fill`"""
+
+    def __init__(self, tree: ast.Module):
+        self.tree = tree
+        self.counter = 0
+        self.rewritten = 0
+        self.functions = {s.name: s for s in tree.body if isinstance(s, ast.FunctionDef)}
+
+    # --- detection ---------------------------------------------------------------
+
+    @staticmethod
+    def _call(stmt, base=None, methods=None):
+        """(base, method) if stmt is an expression statement `base.method(...)`"""
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call) \
+                and isinstance(stmt.value.func, ast.Attribute) and isinstance(stmt.value.func.value, ast.Name):
+            name, method = stmt.value.func.value.id, stmt.value.func.attr
+            if (base is None or name == base) and (methods is None or method in methods):
+                return name, method
+        return None
+
+    def _is_pixel_pair(self, first, second, base=None) -> bool:
+        call = self._call(first, base, {'rectangle'})
+        if not call or not self._call(second, call[0], {'fill'}) or second.value.args:
+            return False
+        args = first.value.args
+        return len(args) == 4 and not first.value.keywords \
+            and all(isinstance(a, ast.Constant) and a.value == 1 for a in args[2:])
+
+    def _context_name(self, loop):
+        for node in ast.walk(loop):
+            for field in ('body', 'orelse'):
+                stmts = getattr(node, field, None)
+                if isinstance(stmts, list):
+                    for first, second in zip(stmts, stmts[1:]):
+                        if self._is_pixel_pair(first, second):
+                            return first.value.func.value.id
+        return None
+
+    def _draws(self, name: str, context: str, seen: set) -> bool:
+        """Whether calling sketch function `name` can touch the context"""
+        if name in seen:
+            return False
+        seen.add(name)
+        fn = self.functions[name]
+        for node in ast.walk(fn):
+            if isinstance(node, ast.Name) and (node.id == context or node.id == 'surface'):
+                return True
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in self.functions \
+                    and self._draws(node.func.id, context, seen):
+                return True
+        return False
+
+    def _qualifies(self, loop, context: str) -> bool:
+        """Every use of the context in the loop is a pixel fill or a source colour"""
+        allowed = set()
+        for node in ast.walk(loop):
+            for field in ('body', 'orelse', 'finalbody'):
+                stmts = getattr(node, field, None)
+                if not isinstance(stmts, list):
+                    continue
+                for i, stmt in enumerate(stmts):
+                    if self._call(stmt, context, SOURCE_METHODS) and not stmt.value.keywords \
+                            and len(stmt.value.args) in (3, 4) and not any(isinstance(a, ast.Starred) for a in stmt.value.args):
+                        allowed.add(id(stmt.value.func.value))
+                    elif i + 1 < len(stmts) and self._is_pixel_pair(stmt, stmts[i + 1], context):
+                        allowed.add(id(stmt.value.func.value))
+                        allowed.add(id(stmts[i + 1].value.func.value))
+        for node in ast.walk(loop):
+            if isinstance(node, (ast.Yield, ast.YieldFrom, ast.Await, ast.Global, ast.Nonlocal, ast.ClassDef)):
+                return False
+            if isinstance(node, ast.Name) and node.id in (context, 'surface') and id(node) not in allowed:
+                return False
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                if node.func.id in self.functions:
+                    if self._draws(node.func.id, context, set()):
+                        return False
+                elif not hasattr(builtins, node.func.id):
+                    return False  # unknown callable (lambda, closure) might draw
+        return True
+
+    # --- rewriting ---------------------------------------------------------------
+
+    def _buffered(self, loop, context: str) -> list:
+        """[begin, try: loop finally: flush] with pixel calls redirected to __raster__"""
+        class Redirect(ast.NodeTransformer):
+            def __init__(self, outer):
+                self.outer = outer
+
+            def _stmts(self, stmts):
+                out, i = [], 0
+                while i < len(stmts):
+                    stmt = stmts[i]
+                    if i + 1 < len(stmts) and self.outer._is_pixel_pair(stmt, stmts[i + 1], context):
+                        x, y = stmt.value.args[:2]
+                        out.append(ast.Expr(ast.Call(ast.Attribute(ast.Name('__raster__', ast.Load()), 'pixel', ast.Load()), [x, y], [])))
+                        i += 2
+                        continue
+                    if self.outer._call(stmt, context, SOURCE_METHODS):
+                        stmt.value.func.value = ast.Name('__raster__', ast.Load())
+                    out.append(self.visit(stmt))
+                    i += 1
+                return out
+
+            def generic_visit(self, node):
+                for field in ('body', 'orelse', 'finalbody'):
+                    if isinstance(getattr(node, field, None), list):
+                        setattr(node, field, self._stmts(getattr(node, field)))
+                for handler in getattr(node, 'handlers', []):
+                    handler.body = self._stmts(handler.body)
+                return node
+
+        Redirect(self).generic_visit(loop)
+        body = ast.parse(f"__raster__.begin({context})\ntry:\n    pass\nfinally:\n    __raster__.flush({context})").body
+        body[1].body = [loop]
+        return body
+
+    def _vector_expr(self, node, names: set, free: set):
+        """NumPy version of a pure scalar expression, or None"""
+        np_attr = lambda attr: ast.parse(f"__np__.{attr}", mode='eval').body
+        if isinstance(node, ast.Constant):
+            return node if type(node.value) in (int, float) else None
+        if isinstance(node, ast.Name):
+            if node.id not in names:
+                free.add(node.id)
+            return node
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self._vector_expr(node.operand, names, free)
+            return operand and ast.UnaryOp(node.op, operand)
+        if isinstance(node, ast.BinOp) and not isinstance(node.op, (ast.MatMult, ast.BitAnd, ast.BitOr, ast.BitXor, ast.LShift, ast.RShift)):
+            left, right = self._vector_expr(node.left, names, free), self._vector_expr(node.right, names, free)
+            return left and right and ast.BinOp(left, node.op, right)
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'math' \
+                and node.attr in NUMPY_CONSTANTS:
+            return ast.parse(f"__np__.{NUMPY_CONSTANTS[node.attr]}", mode='eval').body
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and not isinstance(node.ops[0], (ast.In, ast.NotIn, ast.Is, ast.IsNot)):
+            left, right = self._vector_expr(node.left, names, free), self._vector_expr(node.comparators[0], names, free)
+            return left and right and ast.Compare(left, node.ops, [right])
+        if isinstance(node, ast.IfExp):
+            parts = [self._vector_expr(n, names, free) for n in (node.test, node.body, node.orelse)]
+            return all(parts) and ast.Call(np_attr('where'), parts, [])
+        if isinstance(node, ast.Call) and not node.keywords:
+            func = None
+            if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name) \
+                    and node.func.value.id == 'math' and node.func.attr in NUMPY_MATH:
+                func = NUMPY_MATH[node.func.attr]
+            elif isinstance(node.func, ast.Name) and node.func.id in NUMPY_BUILTINS and node.func.id not in names | free:
+                func = NUMPY_BUILTINS[node.func.id]
+                if node.func.id in ('min', 'max') and len(node.args) != 2:
+                    return None
+            elif isinstance(node.func, ast.Name) and node.func.id == 'float' and len(node.args) == 1:
+                return self._vector_expr(node.args[0], names, free)
+            if func is None:
+                return None
+            args = [self._vector_expr(a, names, free) for a in node.args]
+            return all(args) and ast.Call(np_attr(func), args, [])
+        return None
+
+    def _field(self, loop, context: str, scope_stmts: list):
+        """def __raster_field_N(__np__, outer, inner): ... for a pure `for a in range(): for b in range():` body"""
+        if not (isinstance(loop, ast.For) and len(loop.body) == 1 and isinstance(loop.body[0], ast.For)
+                and not loop.orelse and not loop.body[0].orelse):
+            return None
+        inner = loop.body[0]
+        loops = [loop, inner]
+        if not all(isinstance(l.target, ast.Name) and isinstance(l.iter, ast.Call) and isinstance(l.iter.func, ast.Name)
+                   and l.iter.func.id == 'range' and not l.iter.keywords and 1 <= len(l.iter.args) <= 3 for l in loops):
+            return None
+        names = {loop.target.id, inner.target.id}
+        free = set()
+        range_args = []
+        for l in loops:
+            args = [self._vector_expr(a, set(), free) for a in l.iter.args]
+            if not all(args) or any(isinstance(n, ast.Call) for a in l.iter.args for n in ast.walk(a)):
+                return None
+            range_args.append(l.iter.args)
+        if names & free:
+            return None  # inner range depends on the outer loop
+
+        body, colour, position = [], None, None
+        stmts = inner.body
+        for i, stmt in enumerate(stmts):
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                value = self._vector_expr(stmt.value, names, free)
+                if value is None or colour is not None:
+                    return None
+                body.append(ast.Assign([ast.Name(stmt.targets[0].id, ast.Store())], value))
+                names.add(stmt.targets[0].id)
+            elif self._call(stmt, context, SOURCE_METHODS) and colour is None:
+                colour = [self._vector_expr(a, names, free) for a in stmt.value.args]
+                if not all(colour) or stmt.value.keywords or len(colour) not in (3, 4):
+                    return None
+            elif i == len(stmts) - 2 and colour is not None and self._is_pixel_pair(stmt, stmts[i + 1], context):
+                position = [self._vector_expr(a, names, free) for a in stmt.value.args[:2]]
+                if not all(position):
+                    return None
+                break
+            else:
+                return None
+        if position is None:
+            return None
+        free -= names
+
+        # The loop's variables must be dead afterwards, since the field path never assigns them
+        for stmt in scope_stmts:
+            if stmt is not loop and any(references(stmt, name) for name in names):
+                return None
+
+        self.counter += 1
+        fn_name = f"{FIELD_PREFIX}{self.counter}"
+        fn = ast.parse(f"def {fn_name}(__np__, {loop.target.id}, {inner.target.id}):\n    pass").body[0]
+        fn.body = body + [ast.Return(ast.Tuple(position + colour, ast.Load()))]
+        free = sorted(free)
+        call = ast.parse(
+            f"__raster__.field({context}, {fn_name}, (), (), ({', '.join(free)}{',' if free else ''}))", mode='eval').body
+        call.args[2] = ast.Tuple(range_args[0], ast.Load())
+        call.args[3] = ast.Tuple(range_args[1], ast.Load())
+        return fn, call
+
+    def rewrite(self, stmts: list, scope: list) -> list:
+        """Rewrite pixel loops in stmts; scope is the enclosing module/function body"""
+        out = []
+        for stmt in stmts:
+            if isinstance(stmt, (ast.For, ast.While)):
+                context = self._context_name(stmt)
+                if context and self._qualifies(stmt, context):
+                    field = self._field(stmt, context, scope)
+                    buffered = self._buffered(stmt, context)
+                    if field:
+                        fn, call = field
+                        fallback = ast.If(ast.UnaryOp(ast.Not(), call), buffered, [])
+                        out.extend([fn, fallback])
+                    else:
+                        out.extend(buffered)
+                    self.rewritten += 1
+                    continue
+            inner_scope = stmt.body if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)) else scope
+            for field in ('body', 'orelse', 'finalbody'):
+                if isinstance(getattr(stmt, field, None), list):
+                    setattr(stmt, field, self.rewrite(getattr(stmt, field), inner_scope))
+            for handler in getattr(stmt, 'handlers', []):
+                handler.body = self.rewrite(handler.body, inner_scope)
+            out.append(stmt)
+        return out
+
+
+def reroute_pixel_loops(code: str) -> str:
+    """Rewrite per-pixel `rectangle(x, y, 1, 1); fill()` loops to draw through __raster__.
+
+    Returns the code unchanged if it has no such loops or can't be parsed.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code
+    if any(isinstance(n, ast.Name) and n.id in ('__raster__', '__np__') for n in ast.walk(tree)):
+        return code
+    loops = _PixelLoops(tree)
+    tree.body = loops.rewrite(tree.body, tree.body)
+    if not loops.rewritten:
+        return code
+    return ast.unparse(ast.fix_missing_locations(tree))
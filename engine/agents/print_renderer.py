@@ -0,0 +1,131 @@
+import ast
+import struct
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from agents.executor import PIXEL_ACCESS, SafeExecutor
+from agents.sketch_ast import find_surface_setup, paint_scaled, reseed_sketch, rewrite_surface
+from config.settings import RENDER_WORKERS, TEMP_DIR, PRINT_WIDTH, PRINT_TILE_SIZE, PRINT_TILE_TIMEOUT
+
+PNG_ROWS_PER_CHUNK = 16  # scanlines converted per numpy pass while stitching
+
+
+def tile_code(code: str, scale: float, x: int, y: int, w: int, h: int) -> str:
+    """Rewrite a sketch so it draws only the (x, y, w, h) tile of a scaled canvas"""
+    surface = f"cairo.ImageSurface(cairo.FORMAT_ARGB32, {w}, {h})"
+    transform = (
+        f"{{ctx}}.rectangle(0, 0, {w}, {h})\n"
+        f"{{ctx}}.clip()\n"
+        f"{{ctx}}.translate({-x}, {-y})\n"
+        f"{{ctx}}.scale({scale!r}, {scale!r})\n"
+    )
+    if PIXEL_ACCESS.search(code):
+        # Pixel edits ignore the transform: draw the canvas at its own size and upscale the tile from it
+        return paint_scaled(code, '__tile__', surface, transform)
+    return rewrite_surface(code, surface, transform)
+
+
+def _render_tile(code: str, seed: int, tile: tuple, raw_path: str) -> str:
+    """Worker entry point: render one tile and dump its pixels (BGRA premultiplied, no stride padding)"""
+    x, y, w, h, scale = tile
+    namespace = SafeExecutor(timeout=PRINT_TILE_TIMEOUT).run(tile_code(code, scale, x, y, w, h), seed)
+    surface = namespace['__tile__'] if '__tile__' in namespace else namespace['surface']
+    surface.flush()
+    stride = surface.get_stride()
+    data = np.frombuffer(surface.get_data(), dtype=np.uint8).reshape(h, stride)[:, :w * 4]
+    data.tofile(raw_path)
+    return raw_path
+
+
+def _png_chunk(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I', len(payload)) + kind + payload + struct.pack('>I', zlib.crc32(kind + payload))
+
+
+def _to_rgba(rows: np.ndarray) -> np.ndarray:
+    """Cairo ARGB32 (native-endian, premultiplied) rows -> straight RGBA bytes"""
+    if sys.byteorder == 'little':
+        b, g, r, a = (rows[..., i].astype(np.uint16) for i in range(4))
+    else:
+        a, r, g, b = (rows[..., i].astype(np.uint16) for i in range(4))
+    out = np.empty(rows.shape, dtype=np.uint8)
+    safe_a = np.maximum(a, 1)
+    for i, c in enumerate((r, g, b)):
+        out[..., i] = np.where(a > 0, np.minimum(255, (c * 255 + safe_a // 2) // safe_a), 0)
+    out[..., 3] = a
+    return out
+
+
+class TiledRenderer:
+    """Renders a sketch at print resolution as independently rendered tiles.
+
+    Each tile re-runs the sketch with the same seed, a clip and a scale
+    transform, so a worker never holds more than one tile. Sketches using
+    `pixels` are drawn at their own size and each tile is upscaled from that. Tiles are
+    stitched into the PNG band by band as scanlines, so the full image is
+    never in memory either.
+    """
+
+    def __init__(self, tile_size: int = PRINT_TILE_SIZE, workers: int = RENDER_WORKERS):
+        self.tile_size = tile_size
+        self.workers = workers
+
+    def plan(self, code: str, width: int = PRINT_WIDTH) -> tuple[float, int, int, list]:
+        """Scale, output size and tile rows for rendering `code` with long edge `width`"""
+        base_w, base_h = find_surface_setup(ast.parse(code))['size']
+        scale = width / max(base_w, base_h)
+        out_w, out_h = round(base_w * scale), round(base_h * scale)
+        bands = []
+        for y in range(0, out_h, self.tile_size):
+            h = min(self.tile_size, out_h - y)
+            bands.append([(x, y, min(self.tile_size, out_w - x), h, scale)
+                          for x in range(0, out_w, self.tile_size)])
+        return scale, out_w, out_h, bands
+
+    def render(self, code: str, output_path: Path, width: int = PRINT_WIDTH, seed: int = None) -> tuple[int, int]:
+        """Render `code` to a PNG whose long edge is `width` pixels.
+
+        seed is the one the sketch was rendered with (gallery metadata), so
+        its own random.seed() calls are mixed the same way as in the render;
+        without one every tile still shares seed 0.
+        """
+        scale, out_w, out_h, bands = self.plan(code, width)
+        if seed is None:
+            seed = 0
+        else:
+            code = reseed_sketch(code)
+        print(f"Rendering {out_w}x{out_h} (scale {scale:.2f}) as {sum(map(len, bands))} tiles...")
+
+        with tempfile.TemporaryDirectory(dir=TEMP_DIR) as tmp, \
+                ProcessPoolExecutor(max_workers=self.workers) as pool, \
+                open(output_path, 'wb') as png:
+            # Tiles are queued in row-major order so bands finish roughly in order
+            futures = [[pool.submit(_render_tile, code, seed, tile, str(Path(tmp) / f"{tile[0]}_{tile[1]}.raw"))
+                        for tile in band] for band in bands]
+
+            png.write(b'\x89PNG\r\n\x1a\n')
+            png.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', out_w, out_h, 8, 6, 0, 0, 0)))
+            compressor = zlib.compressobj(6)
+
+            for band, band_futures in zip(bands, futures):
+                paths = [f.result() for f in band_futures]
+                h = band[0][3]
+                tiles = [np.memmap(p, dtype=np.uint8, mode='r', shape=(h, t[2], 4)) for p, t in zip(paths, band)]
+                for y in range(0, h, PNG_ROWS_PER_CHUNK):
+                    rows = np.concatenate([t[y:y + PNG_ROWS_PER_CHUNK] for t in tiles], axis=1)
+                    rgba = _to_rgba(rows).reshape(rows.shape[0], -1)
+                    filtered = np.hstack([np.zeros((rows.shape[0], 1), dtype=np.uint8), rgba])
+                    data = compressor.compress(filtered.tobytes())
+                    if data:
+                        png.write(_png_chunk(b'IDAT', data))
+                del tiles
+                for p in paths:
+                    Path(p).unlink()
+                print(f"  ✓ Band {band[0][1] // self.tile_size + 1}/{len(bands)}")
+
+            png.write(_png_chunk(b'IDAT', compressor.flush()))
+            png.write(_png_chunk(b'IEND', b''))
+
+        return out_w, out_h
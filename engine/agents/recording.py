@@ -0,0 +1,239 @@
+import base64
+import gzip
+import io
+import json
+from pathlib import Path
+import cairo
+
+RECORDING_SUFFIX = '.rec.gz'
+FORMAT_VERSION = 1
+
+# Context methods that only read state; they are forwarded but not recorded
+QUERY_METHODS = {
+    'text_extents', 'font_extents', 'has_current_point', 'path_extents', 'fill_extents',
+    'stroke_extents', 'clip_extents', 'in_fill', 'in_stroke', 'in_clip', 'user_to_device',
+    'device_to_user', 'user_to_device_distance', 'device_to_user_distance', 'copy_path',
+    'copy_path_flat', 'copy_clip_rectangle_list',
+}
+
+
+class UnserializableOp(Exception):
+    pass
+
+
+def _encode_pattern(pattern) -> dict:
+    """Describe a cairo pattern by value so it can be rebuilt on replay"""
+    spec = {'extend': int(pattern.get_extend()), 'matrix': list(pattern.get_matrix())}
+    if isinstance(pattern, cairo.SolidPattern):
+        spec.update(kind='solid', rgba=list(pattern.get_rgba()))
+    elif isinstance(pattern, cairo.LinearGradient):
+        spec.update(kind='linear', points=list(pattern.get_linear_points()),
+                    stops=[list(s) for s in pattern.get_color_stops_rgba()])
+    elif isinstance(pattern, cairo.RadialGradient):
+        spec.update(kind='radial', circles=list(pattern.get_radial_circles()),
+                    stops=[list(s) for s in pattern.get_color_stops_rgba()])
+    elif isinstance(pattern, cairo.SurfacePattern):
+        spec.update(kind='surface', surface=_encode_surface(pattern.get_surface()),
+                    filter=int(pattern.get_filter()))
+    else:
+        raise UnserializableOp(f"pattern {type(pattern).__name__}")
+    return spec
+
+
+def _encode_surface(surface) -> dict:
+    if not isinstance(surface, cairo.ImageSurface):
+        raise UnserializableOp(f"surface {type(surface).__name__}")
+    buf = io.BytesIO()
+    surface.write_to_png(buf)
+    return {'png': base64.b64encode(buf.getvalue()).decode()}
+
+
+def _encode(arg, refs: dict):
+    if arg is None or isinstance(arg, (bool, int, float, str)):
+        return arg  # cairo enums are int subclasses
+    if id(arg) in refs:
+        return {'ref': refs[id(arg)]}
+    if isinstance(arg, (list, tuple)):
+        return [_encode(a, refs) for a in arg]
+    if isinstance(arg, cairo.Matrix):
+        return {'matrix': list(arg)}
+    if isinstance(arg, cairo.Pattern):
+        return {'pattern': _encode_pattern(arg)}
+    if isinstance(arg, cairo.Surface):
+        return {'surface': _encode_surface(arg)}
+    if isinstance(arg, cairo.Path):
+        return {'path': [[int(kind), list(points)] for kind, points in arg]}
+    raise UnserializableOp(type(arg).__name__)
+
+
+def _decode_pattern(spec: dict):
+    kind = spec['kind']
+    if kind == 'solid':
+        pattern = cairo.SolidPattern(*spec['rgba'])
+    elif kind in ('linear', 'radial'):
+        pattern = cairo.LinearGradient(*spec['points']) if kind == 'linear' else cairo.RadialGradient(*spec['circles'])
+        for stop in spec['stops']:
+            pattern.add_color_stop_rgba(*stop)
+    else:
+        pattern = cairo.SurfacePattern(_decode_surface(spec['surface']))
+        pattern.set_filter(spec['filter'])
+    pattern.set_extend(spec['extend'])
+    pattern.set_matrix(cairo.Matrix(*spec['matrix']))
+    return pattern
+
+
+def _decode_surface(spec: dict):
+    return cairo.ImageSurface.create_from_png(io.BytesIO(base64.b64decode(spec['png'])))
+
+
+def _decode(arg, refs: list):
+    if isinstance(arg, list):
+        return [_decode(a, refs) for a in arg]
+    if not isinstance(arg, dict):
+        return arg
+    if 'ref' in arg:
+        return refs[arg['ref']]
+    if 'matrix' in arg:
+        return cairo.Matrix(*arg['matrix'])
+    if 'pattern' in arg:
+        return _decode_pattern(arg['pattern'])
+    if 'surface' in arg:
+        return _decode_surface(arg['surface'])
+    if 'path' in arg:
+        # Rebuild the path on a scratch context; cairo.Path can't be constructed directly
+        scratch = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+        for kind, points in arg['path']:
+            if kind == cairo.PATH_MOVE_TO:
+                scratch.move_to(*points)
+            elif kind == cairo.PATH_LINE_TO:
+                scratch.line_to(*points)
+            elif kind == cairo.PATH_CURVE_TO:
+                scratch.curve_to(*points)
+            else:
+                scratch.close_path()
+        return scratch.copy_path()
+    return arg
+
+
+class RecordingContext:
+    """cairo.Context proxy that logs every drawing call it forwards"""
+
+    def __init__(self, ctx: cairo.Context, recorder: 'OpRecorder'):
+        self._ctx = ctx
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        target = getattr(self._ctx, name)
+        if not callable(target) or name.startswith('get_') or name in QUERY_METHODS:
+            return target
+
+        ops = self._recorder.ops
+        recorder = self._recorder
+
+        def method(*args):
+            if recorder.serializable:
+                try:
+                    ops.append([name, *[_encode(a, recorder.refs) for a in args]])
+                except UnserializableOp as e:
+                    recorder.serializable = False
+                    recorder.reason = f"{name}({e})"
+            result = target(*args)
+            if isinstance(result, cairo.Pattern):  # e.g. pop_group(); later ops refer to it
+                recorder.keep(result)
+            return result
+
+        self.__dict__[name] = method  # later lookups skip __getattr__
+        return method
+
+
+class OpRecorder:
+    """Collects the op log for a recorded sketch run"""
+
+    def __init__(self):
+        self.ops = []
+        self.refs = {}
+        self._alive = []
+        self.serializable = True
+        self.reason = None
+
+    def keep(self, obj):
+        """Register an object returned by a recorded call so later ops can reference it"""
+        self.refs[id(obj)] = len(self._alive)
+        self._alive.append(obj)  # keeps id() unique for the rest of the run
+        self.ops.append(['__keep__'])
+
+    def wrap(self, ctx: cairo.Context) -> RecordingContext:
+        return RecordingContext(ctx, self)
+
+
+class Recording:
+    """A sketch's drawing, replayable at any scale without re-running its Python.
+
+    Holds the live cairo.RecordingSurface after a run, or the op log when
+    loaded from disk.
+    """
+
+    def __init__(self, size: tuple[int, int], surface: cairo.RecordingSurface = None, ops: list = None):
+        self.size = tuple(size)
+        self.surface = surface
+        self.ops = ops
+
+    def replay(self, ctx: cairo.Context):
+        """Draw the recording into ctx using ctx's current transform"""
+        if self.surface is not None:
+            ctx.set_source_surface(self.surface, 0, 0)
+            ctx.paint()
+            return
+
+        base = ctx.get_matrix()
+        refs = []
+        result = None
+        for name, *args in self.ops:
+            args = [_decode(a, refs) for a in args]
+            # Keep the replay transform underneath any matrix the sketch set
+            if name == '__keep__':
+                refs.append(result)
+            elif name == 'identity_matrix':
+                ctx.set_matrix(base)
+            elif name == 'set_matrix':
+                ctx.set_matrix(args[0].multiply(base))
+            else:
+                result = getattr(ctx, name)(*args)
+
+    def _draw(self, surface, scale: float):
+        ctx = cairo.Context(surface)
+        ctx.scale(scale, scale)
+        self.replay(ctx)
+        surface.flush()
+
+    def to_png(self, path: Path, scale: float = 1.0):
+        w, h = self.size
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, round(w * scale), round(h * scale))
+        self._draw(surface, scale)
+        surface.write_to_png(str(path))
+
+    def to_svg(self, path: Path, scale: float = 1.0):
+        w, h = self.size
+        surface = cairo.SVGSurface(str(path), w * scale, h * scale)
+        self._draw(surface, scale)
+        surface.finish()
+
+    def to_pdf(self, path: Path, scale: float = 1.0):
+        w, h = self.size
+        surface = cairo.PDFSurface(str(path), w * scale, h * scale)
+        self._draw(surface, scale)
+        surface.finish()
+
+    def save(self, path: Path):
+        """Write the op log as gzipped JSON"""
+        payload = {'version': FORMAT_VERSION, 'size': list(self.size), 'ops': self.ops}
+        with gzip.open(path, 'wt', compresslevel=9) as f:
+            json.dump(payload, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: Path) -> 'Recording':
+        with gzip.open(path, 'rt') as f:
+            payload = json.load(f)
+        if payload.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version: {payload.get('version')}")
+        return cls(payload['size'], ops=payload['ops'])
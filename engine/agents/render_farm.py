@@ -0,0 +1,453 @@
+import asyncio
+import base64
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Process
+from pathlib import Path
+import httpx
+from agents.executor import SafeExecutor
+from agents.recording import RECORDING_SUFFIX
+from agents.scheduler import RenderScheduler, lpt_makespan
+from config.settings import (
+    RECORD_RENDERS, RENDER_WORKERS, SKETCHES_PER_PERIOD,
+    FARM_HOST, FARM_PORT, FARM_URL, FARM_TOKEN, FARM_DB_PATH, FARM_MAX_ATTEMPTS,
+    FARM_LEASE_GRACE, FARM_WORKER_TTL, FARM_DISCOVERY_WAIT, FARM_POLL_INTERVAL, FARM_BATCH_DEADLINE,
+    FARM_SKETCHES_PER_WORKER, FARM_MAX_SKETCHES,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    batch TEXT NOT NULL,
+    code TEXT NOT NULL,
+    seed INTEGER,
+    timeout REAL NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending | leased | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    success INTEGER,
+    msg TEXT,
+    seconds REAL,
+    png BLOB,
+    recording BLOB
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, priority);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+
+class JobQueue:
+    """SQLite-backed render queue with leases and bounded retries"""
+
+    def __init__(self, path: Path = FARM_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+            if 'seed' not in {r['name'] for r in db.execute("PRAGMA table_info(jobs)")}:
+                db.execute("ALTER TABLE jobs ADD COLUMN seed INTEGER")  # queue from before seed sweeps
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.row_factory = sqlite3.Row
+        return db
+
+    def submit(self, batch: str, jobs: list[dict]):
+        """Queue jobs ({'id', 'code', 'timeout', 'priority', 'seed'}); higher priority is leased first"""
+        with self._connect() as db:
+            db.executemany(
+                "INSERT INTO jobs (id, batch, code, seed, timeout, priority) VALUES (?, ?, ?, ?, ?, ?)",
+                [(f"{batch}/{j['id']}", batch, j['code'], j.get('seed'), j['timeout'], j.get('priority', 0)) for j in jobs]
+            )
+
+    def _touch(self, db, worker: str, host: str):
+        db.execute("INSERT INTO workers (id, host, last_seen) VALUES (?, ?, ?) "
+                   "ON CONFLICT(id) DO UPDATE SET last_seen = excluded.last_seen", (worker, host, time.time()))
+
+    def lease(self, worker: str, host: str) -> dict:
+        """Hand the highest-priority pending job to a worker, or None"""
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            self._touch(db, worker, host)
+            # Expired leases go back to the queue, or fail once out of attempts
+            db.execute("UPDATE jobs SET status = 'failed', success = 0, msg = 'Lease expired ' || attempts || ' times' "
+                       "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?", (now, FARM_MAX_ATTEMPTS))
+            db.execute("UPDATE jobs SET status = 'pending', worker = NULL "
+                       "WHERE status = 'leased' AND lease_expires < ?", (now,))
+            row = db.execute("SELECT id, code, seed, timeout FROM jobs WHERE status = 'pending' "
+                             "ORDER BY priority DESC, rowid LIMIT 1").fetchone()
+            if row:
+                db.execute("UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1, lease_expires = ? "
+                           "WHERE id = ?", (worker, now + row['timeout'] + FARM_LEASE_GRACE, row['id']))
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        finally:
+            db.close()
+        return dict(row) if row else None
+
+    def complete(self, job_id: str, worker: str, success: bool, msg: str, seconds: float,
+                 png: bytes = None, recording: bytes = None) -> bool:
+        """Store a result; ignored if the lease has since moved to another worker"""
+        with self._connect() as db:
+            cur = db.execute(
+                "UPDATE jobs SET status = ?, success = ?, msg = ?, seconds = ?, png = ?, recording = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                ('done' if success else 'failed', int(success), msg, seconds, png, recording, job_id, worker)
+            )
+            return cur.rowcount == 1
+
+    def finished_ids(self, batch: str) -> list[str]:
+        with self._connect() as db:
+            return [r['id'] for r in db.execute(
+                "SELECT id FROM jobs WHERE batch = ? AND status IN ('done', 'failed')", (batch,))]
+
+    def result(self, job_id: str) -> dict:
+        with self._connect() as db:
+            return dict(db.execute(
+                "SELECT id, status, success, msg, seconds, png, recording FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def abandon(self, batch: str):
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET status = 'failed', success = 0, msg = 'Abandoned at batch deadline' "
+                       "WHERE batch = ? AND status IN ('pending', 'leased')", (batch,))
+
+    def prune(self, batch: str = None):
+        """Delete a batch's jobs (every job by default) and hand the freed space back to the SD card"""
+        with self._connect() as db:
+            if batch is None:
+                db.execute("DELETE FROM jobs")
+            else:
+                db.execute("DELETE FROM jobs WHERE batch = ?", (batch,))
+            db.execute("DELETE FROM workers WHERE last_seen < ?", (time.time() - 86400,))
+            db.execute('VACUUM')
+
+    def active_workers(self, ttl: float = FARM_WORKER_TTL) -> list[dict]:
+        with self._connect() as db:
+            return [dict(r) for r in db.execute("SELECT id, host FROM workers WHERE last_seen > ?", (time.time() - ttl,))]
+
+
+class _FarmHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /lease, POST /result, GET /workers"""
+
+    queue: JobQueue = None
+
+    def log_message(self, format, *args):
+        pass  # keep cron output readable
+
+    def _reply(self, status: int, body: dict = None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _authorized(self) -> bool:
+        if FARM_TOKEN and self.headers.get('Authorization') != f'Bearer {FARM_TOKEN}':
+            self._reply(401, {'error': 'unauthorized'})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == '/workers':
+            self._reply(200, {'workers': self.queue.active_workers()})
+        else:
+            self._reply(404, {'error': 'not found'})
+
+    def _body(self, fields: dict) -> dict:
+        """The JSON request body if it has every field with the expected type; otherwise replies 400 and returns None"""
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            body = None
+        if not isinstance(body, dict):
+            self._reply(400, {'error': 'body must be a JSON object'})
+            return None
+        missing = [name for name, kind in fields.items() if not isinstance(body.get(name), kind)]
+        if missing:
+            self._reply(400, {'error': f"missing or invalid: {', '.join(missing)}"})
+            return None
+        for name in ('png', 'recording'):
+            if body.get(name) is not None:
+                try:
+                    body[name] = base64.b64decode(body[name], validate=True)
+                except (TypeError, ValueError):
+                    self._reply(400, {'error': f"invalid base64: {name}"})
+                    return None
+        return body
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path == '/lease':
+            body = self._body({'worker': str, 'host': str})
+            if body is not None:
+                self._reply(200, {'job': self.queue.lease(body['worker'], body['host'])})
+        elif self.path == '/result':
+            body = self._body({'id': str, 'worker': str, 'success': bool, 'msg': str, 'seconds': (int, float)})
+            if body is not None:
+                accepted = self.queue.complete(body['id'], body['worker'], body['success'], body['msg'],
+                                               body['seconds'], body.get('png') or None, body.get('recording') or None)
+                self._reply(200, {'accepted': accepted})
+        else:
+            self._reply(404, {'error': 'not found'})
+
+
+def _loopback(host: str) -> bool:
+    try:
+        return host == 'localhost' or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class FarmServer:
+    """Job server running in a background thread of the orchestrator.
+
+    Anyone who can reach it can submit, claim and read jobs, so it only
+    listens beyond loopback when FARM_TOKEN is set.
+    """
+
+    def __init__(self, queue: JobQueue, host: str = FARM_HOST, port: int = FARM_PORT):
+        if not FARM_TOKEN and not _loopback(host):
+            raise ValueError(f"Refusing to serve the render farm on {host} without FARM_TOKEN")
+        handler = type('FarmHandler', (_FarmHandler,), {'queue': queue})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FarmWorker:
+    """Pulls render jobs from a farm server and runs them in the local sandbox"""
+
+    def __init__(self, server_url: str = FARM_URL):
+        self.server_url = server_url.rstrip('/')
+        self.host = socket.gethostname()
+        self.id = f"{self.host}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        headers = {'Authorization': f'Bearer {FARM_TOKEN}'} if FARM_TOKEN else {}
+        self.client = httpx.Client(timeout=30.0, headers=headers)
+
+    def run_job(self, job: dict) -> dict:
+        """Render a leased job and build its result payload"""
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = Path(tmp) / 'render.png'
+            start = time.perf_counter()
+            executor = SafeExecutor(timeout=job['timeout'], record=RECORD_RENDERS)
+            success, msg = executor.execute(job['code'], output_path, job.get('seed'))
+            seconds = time.perf_counter() - start
+            recording = output_path.with_name(output_path.stem + RECORDING_SUFFIX)
+            return {
+                'id': job['id'],
+                'worker': self.id,
+                'success': success,
+                'msg': msg,
+                'seconds': seconds,
+                'png': base64.b64encode(output_path.read_bytes()).decode() if success else None,
+                'recording': base64.b64encode(recording.read_bytes()).decode() if success and recording.exists() else None,
+            }
+
+    def run(self, max_jobs: int = None):
+        """Lease and render jobs until max_jobs are done (forever by default)"""
+        done = 0
+        while max_jobs is None or done < max_jobs:
+            try:
+                response = self.client.post(f"{self.server_url}/lease", json={'worker': self.id, 'host': self.host})
+                response.raise_for_status()
+                job = response.json()['job']
+            except httpx.HTTPError:
+                time.sleep(FARM_POLL_INTERVAL * 5)  # server down between periods
+                continue
+            if job is None:
+                time.sleep(FARM_POLL_INTERVAL)
+                continue
+
+            result = self.run_job(job)
+            try:
+                self.client.post(f"{self.server_url}/result", json=result).raise_for_status()
+            except httpx.HTTPError as e:
+                print(f"✗ Result upload failed for {job['id']}: {e}")  # lease expiry will retry it
+            done += 1
+
+
+def run_worker(server_url: str = FARM_URL):
+    """Process entry point for a farm worker"""
+    FarmWorker(server_url).run()
+
+
+class FarmScheduler(RenderScheduler):
+    """RenderScheduler that dispatches jobs through the farm queue instead of a local pool.
+
+    Jobs are queued a few at a time rather than all at once: the farm's local
+    worker processes share this Pi, so the ThermalGovernor caps how many are
+    in flight beyond one per remote worker process, and stretches timeouts
+    while the SoC is throttling.
+    """
+
+    def __init__(self, queue: JobQueue, **kwargs):
+        super().__init__(**kwargs)
+        self.queue = queue
+
+    def available_workers(self) -> list[dict]:
+        return self.queue.active_workers()
+
+    def _slots(self) -> int:
+        host = socket.gethostname()
+        remote = sum(w['host'] != host for w in self.available_workers())
+        return self.governor.concurrency() + remote
+
+    async def render(self, sketches: list[dict], output_dir: Path, on_progress=None, label: str = None) -> list[dict]:
+        """Render all sketches on the farm; returns results in the original sketch order"""
+        jobs = self.plan(sketches)
+        batch = f"{label or 'batch'}-{uuid.uuid4().hex[:8]}"
+        workers = max(1, len(self.available_workers()))
+        predicted_makespan = lpt_makespan([j['predicted'] for j in jobs], workers)
+        by_id = {f"{batch}/{j['sketch']['id']}": j for j in jobs}
+        results = [None] * len(jobs)
+        pending = list(jobs)  # LPT order; queued while there are free slots
+        in_flight = 0
+        start = time.perf_counter()
+        first_event = len(self.governor.events)
+
+        def result(job, success, msg, image, recording, seconds):
+            return {
+                'sketch': job['sketch'],
+                'success': success,
+                'msg': msg,
+                'image': image,
+                'recording': recording,
+                'seconds': seconds,
+                'predicted': job['predicted'],
+                'timeout': job['timeout'],
+                'throttled': job['throttled'],
+            }
+
+        while any(r is None for r in results):
+            if time.perf_counter() - start > FARM_BATCH_DEADLINE:
+                self.queue.abandon(batch)
+                for job in pending:
+                    job['throttled'] = False
+                    results[job['index']] = result(job, False, 'Abandoned at batch deadline', None, None, 0.0)
+                pending = []
+
+            queued = []
+            while pending and in_flight + len(queued) < self._slots():
+                job = pending.pop(0)
+                job['throttled'] = self.governor.throttled()
+                if job['throttled']:
+                    job['timeout'] = round(job['timeout'] * self.governor.timeout_scale(), 2)
+                job['temp_c'] = self.governor.last.get('temp_c')
+                queued.append(job)
+            if queued:
+                self.queue.submit(batch, [{
+                    'id': j['sketch']['id'],
+                    'code': j['sketch']['code'],
+                    'seed': j['sketch'].get('seed'),
+                    'timeout': j['timeout'],
+                    'priority': j['predicted'],  # LPT: longest predicted job is leased first
+                } for j in queued])
+                in_flight += len(queued)
+
+            for job_id in self.queue.finished_ids(batch):
+                job = by_id[job_id]
+                if results[job['index']] is not None:
+                    continue
+                in_flight -= 1
+                row = self.queue.result(job_id)
+                output_path = output_dir / f"{job['sketch']['id']}.png"
+                recording = None
+                if row['png']:
+                    output_path.write_bytes(row['png'])
+                if row['recording']:
+                    recording = output_path.with_name(output_path.stem + RECORDING_SUFFIX)
+                    recording.write_bytes(row['recording'])
+                seconds = row['seconds'] if row['seconds'] is not None else job['timeout']
+                timed_out = (row['msg'] or '').startswith('Execution exceeded')
+                if row['success'] or timed_out:  # as RenderScheduler: fast failures would skew the p95
+                    self.history.record(job['sketch']['theme'], max(seconds, job['timeout']) if timed_out else seconds,
+                                        job['work'], timed_out, throttled=job['throttled'], temp_c=job['temp_c'])
+                results[job['index']] = result(job, bool(row['success']), row['msg'], output_path, recording, seconds)
+                if on_progress:
+                    await on_progress(sum(r is not None for r in results), len(results))
+            if any(r is None for r in results):
+                await asyncio.sleep(FARM_POLL_INTERVAL)
+        self.queue.prune(batch)  # results are on disk now; PNG/recording BLOBs would pile up
+
+        actual_makespan = time.perf_counter() - start
+        self.history.record_period({
+            'label': label or batch,
+            'workers': workers,
+            'jobs': len(jobs),
+            'predicted_makespan': round(predicted_makespan, 2),
+            'actual_makespan': round(actual_makespan, 2),
+            'throttled_jobs': sum(j['throttled'] for j in jobs),
+            'governor_events': self.governor.events[first_event:],
+            'farm': True,
+        })
+        self.history.save()
+        print(f"  ⏱ Makespan: predicted {predicted_makespan:.1f}s, actual {actual_makespan:.1f}s "
+              f"({len(jobs)} jobs on {workers} farm workers)")
+        return results
+
+
+class RenderFarm:
+    """Job server plus local worker processes for one period.
+
+    Remote Pis run farm_worker.py against this server; every remote worker
+    process that checks in adds FARM_SKETCHES_PER_WORKER candidates.
+    """
+
+    def __init__(self, local_workers: int = RENDER_WORKERS):
+        self.queue = JobQueue()
+        self.server = FarmServer(self.queue)
+        self.local = [Process(target=run_worker, args=(f"http://localhost:{FARM_PORT}",), daemon=True)
+                      for _ in range(local_workers)]
+
+    async def start(self) -> 'RenderFarm':
+        self.queue.prune()  # leftovers of an interrupted period
+        self.server.start()
+        for p in self.local:
+            p.start()
+        await asyncio.sleep(FARM_DISCOVERY_WAIT)  # let idle remote workers check in
+        return self
+
+    def remote_workers(self) -> list[dict]:
+        host = socket.gethostname()
+        return [w for w in self.queue.active_workers() if w['host'] != host]
+
+    def candidate_count(self) -> int:
+        return min(FARM_MAX_SKETCHES, SKETCHES_PER_PERIOD + FARM_SKETCHES_PER_WORKER * len(self.remote_workers()))
+
+    def scheduler(self) -> FarmScheduler:
+        return FarmScheduler(self.queue)
+
+    def stop(self):
+        for p in self.local:
+            p.terminate()
+        self.server.stop()
@@ -0,0 +1,230 @@
+import asyncio
+import heapq
+import json
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from agents.cost_model import extract_features
+from agents.executor import SafeExecutor
+from agents.recording import RECORDING_SUFFIX
+from agents.thermal import ThermalGovernor
+from config.settings import (
+    GENERATION_TIMEOUT, RECORD_RENDERS, RENDER_WORKERS, RENDER_HISTORY_PATH, RENDER_HISTORY_SAMPLES,
+    TIMEOUT_MIN_SAMPLES, TIMEOUT_MARGIN, TIMEOUT_BOUNDS,
+)
+
+
+def _render_job(code: str, output_path: str, timeout: float, seed: int = None) -> tuple[bool, str, float]:
+    """Worker process entry point: render one sketch and time it"""
+    start = time.perf_counter()
+    success, msg = SafeExecutor(timeout=timeout, record=RECORD_RENDERS).execute(code, Path(output_path), seed)
+    return success, msg, time.perf_counter() - start
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def lpt_makespan(durations: list[float], workers: int) -> float:
+    """Makespan of longest-processing-time-first list scheduling"""
+    finish = [0.0] * max(1, workers)
+    for d in sorted(durations, reverse=True):
+        heapq.heappush(finish, heapq.heappop(finish) + d)
+    return max(finish)
+
+
+class RenderHistory:
+    """Per-theme render timings persisted as JSON"""
+
+    def __init__(self, path: Path = RENDER_HISTORY_PATH):
+        self.path = Path(path)
+        self.data = self._load()
+
+    def _load(self) -> dict:
+        if self.path.exists():
+            try:
+                return json.loads(self.path.read_text())
+            except (json.JSONDecodeError, OSError):
+                print(f"✗ Render history unreadable, starting fresh: {self.path}")
+        return {'themes': {}, 'periods': []}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.data, indent=1))
+
+    def samples(self, theme: str) -> list[dict]:
+        return self.data['themes'].get(theme, [])
+
+    def all_samples(self) -> list[dict]:
+        return [s for samples in self.data['themes'].values() for s in samples]
+
+    def record(self, theme: str, seconds: float, work: float, timed_out: bool, **extra):
+        """Add a finished render, or a timed-out one as a censored sample (seconds is a lower bound)"""
+        samples = self.data['themes'].setdefault(theme, [])
+        samples.append({'seconds': round(seconds, 4), 'work': work, 'timed_out': timed_out, **extra})
+        del samples[:-RENDER_HISTORY_SAMPLES]
+
+    def record_period(self, report: dict):
+        self.data['periods'].append(report)
+        del self.data['periods'][:-200]
+
+
+class RenderScheduler:
+    """Renders a batch of sketches across worker processes, longest predicted job first.
+
+    Runtimes are predicted from each theme's history scaled by the sketch's
+    static work estimate, and per-sketch timeouts come from the theme's p95.
+    Only successful and timed-out renders enter the history, since fast
+    failures would drag the p95 down. If a worker dies (e.g. the OOM killer),
+    the pool is recreated and the jobs it took down are retried one at a time,
+    so only the job that crashes again fails.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS, history: RenderHistory = None,
+                 governor: ThermalGovernor = None):
+        self.workers = workers
+        self.history = history or RenderHistory()
+        self.governor = governor or ThermalGovernor(workers)
+
+    def predict(self, theme: str, features: dict) -> float:
+        """Predicted render seconds for a sketch"""
+        samples = self.history.samples(theme)
+        if len(samples) < TIMEOUT_MIN_SAMPLES:
+            samples = self.history.all_samples()
+        finished = [s for s in samples if not s['timed_out'] and not s.get('throttled')]
+        if not finished:
+            return features.get('cost', GENERATION_TIMEOUT / 4)  # calibrated static estimate if available
+
+        work = features.get('work', 0)
+        rates = [s['seconds'] / s['work'] for s in finished if s['work'] > 0]
+        if work > 0 and rates:
+            return statistics.median(rates) * work
+        return statistics.median(s['seconds'] for s in finished)
+
+    def timeout_for(self, theme: str, predicted: float) -> float:
+        """Per-sketch timeout from the theme's observed p95 runtime.
+
+        Timed-out samples only record the timeout they hit, so counting them
+        would ratchet each period's timeout up by TIMEOUT_MARGIN.
+        """
+        samples = [s for s in self.history.samples(theme) if not s['timed_out'] and not s.get('throttled')]
+        if len(samples) < TIMEOUT_MIN_SAMPLES:
+            return GENERATION_TIMEOUT
+        p95 = _percentile([s['seconds'] for s in samples], 95)
+        low, high = TIMEOUT_BOUNDS
+        return round(min(high, max(low, max(p95, predicted) * TIMEOUT_MARGIN)), 2)
+
+    def plan(self, sketches: list[dict]) -> list[dict]:
+        """Jobs with predictions and timeouts, in dispatch (LPT) order"""
+        jobs = []
+        for idx, sketch in enumerate(sketches):
+            features = extract_features(sketch['code'])
+            predicted = self.predict(sketch['theme'], features)
+            jobs.append({
+                'index': idx,
+                'sketch': sketch,
+                'work': features.get('work', 0),
+                'predicted': predicted,
+                'timeout': self.timeout_for(sketch['theme'], predicted),
+            })
+        jobs.sort(key=lambda j: j['predicted'], reverse=True)
+        return jobs
+
+    def _slots(self) -> int:
+        """How many renders may run right now"""
+        return self.governor.concurrency()
+
+    async def render(self, sketches: list[dict], output_dir: Path, on_progress=None, label: str = None) -> list[dict]:
+        """Render all sketches; returns results in the original sketch order"""
+        jobs = self.plan(sketches)
+        predicted_makespan = lpt_makespan([j['predicted'] for j in jobs], self.workers)
+        results = [None] * len(jobs)
+        loop = asyncio.get_running_loop()
+        pending = list(jobs)
+        running = {}
+        start = time.perf_counter()
+        first_event = len(self.governor.events)
+
+        async def finish(job, output_path, success, msg, seconds):
+            timed_out = msg.startswith('Execution exceeded')
+            if success or timed_out:
+                self.history.record(job['sketch']['theme'], max(seconds, job['timeout']) if timed_out else seconds,
+                                    job['work'], timed_out, throttled=job['throttled'], temp_c=job['temp_c'])
+            recording = output_path.with_name(output_path.stem + RECORDING_SUFFIX)
+            results[job['index']] = {
+                'sketch': job['sketch'],
+                'success': success,
+                'msg': msg,
+                'image': output_path,
+                'recording': recording if recording.exists() else None,
+                'seconds': seconds,
+                'predicted': job['predicted'],
+                'timeout': job['timeout'],
+                'throttled': job['throttled'],
+            }
+            if on_progress:
+                await on_progress(sum(r is not None for r in results), len(results))
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            while pending or running:
+                while pending and len(running) < self._slots():
+                    # Jobs from a crashed pool run alone, so a second crash pins down the culprit
+                    if any(job.get('crashed') for job, _ in running.values()) or (pending[0].get('crashed') and running):
+                        break
+                    job = pending.pop(0)
+                    output_path = output_dir / f"{job['sketch']['id']}.png"
+                    job['throttled'] = self.governor.throttled()
+                    if job['throttled']:
+                        job['timeout'] = round(job['timeout'] * self.governor.timeout_scale(), 2)
+                    job['temp_c'] = self.governor.last.get('temp_c')
+                    future = loop.run_in_executor(pool, _render_job, job['sketch']['code'], str(output_path),
+                                                  job['timeout'], job['sketch'].get('seed'))
+                    running[future] = (job, output_path)
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # A dead worker breaks the whole pool: every job still running fails with it
+                    done, _ = await asyncio.wait(running)
+                    crashed = [running.pop(future) for future in done if isinstance(future.exception(), BrokenProcessPool)]
+                    pool.shutdown(wait=False)
+                    pool = ProcessPoolExecutor(max_workers=self.workers)
+                    for job, output_path in crashed:
+                        if len(crashed) == 1 or job.get('crashed'):
+                            await finish(job, output_path, False, "Worker process died (out of memory?)", job['timeout'])
+                        else:
+                            job['crashed'] = True
+                            pending.append(job)
+                    print(f"  ✗ Render worker died, pool restarted ({len(crashed)} jobs affected)")
+                for future in done:
+                    if future not in running:
+                        continue
+                    job, output_path = running.pop(future)
+                    try:
+                        success, msg, seconds = future.result()
+                    except Exception as e:  # worker crashed (e.g. segfault in cairo)
+                        success, msg, seconds = False, f"Worker error: {e}", job['timeout']
+                    await finish(job, output_path, success, msg, seconds)
+        finally:
+            pool.shutdown()
+
+        actual_makespan = time.perf_counter() - start
+        report = {
+            'label': label or datetime.now().isoformat(timespec='minutes'),
+            'workers': self.workers,
+            'jobs': len(jobs),
+            'predicted_makespan': round(predicted_makespan, 2),
+            'actual_makespan': round(actual_makespan, 2),
+            'throttled_jobs': sum(j['throttled'] for j in jobs),
+            'governor_events': self.governor.events[first_event:],
+        }
+        self.history.record_period(report)
+        self.history.save()
+        print(f"  ⏱ Makespan: predicted {predicted_makespan:.1f}s, actual {actual_makespan:.1f}s "
+              f"({len(jobs)} jobs on {self.workers} workers)")
+        return results
@@ -0,0 +1,48 @@
+import asyncio
+import random
+from pathlib import Path
+from agents.image_metrics import image_metrics, variant_score
+from config.settings import SEED_VARIANTS, SEED_KEEP
+
+
+class SeedSweep:
+    """Renders every sketch under several random seeds and keeps the best-looking variants.
+
+    One generated sketch can draw very different images depending on its
+    seed, so each API call yields several candidates. Variants are ranked
+    with cheap local image metrics (see agents.image_metrics) before the
+    curator sees them. Each worker process compiles a sketch once and
+    reuses it across seeds (see executor.compile_sketch).
+    """
+
+    def __init__(self, scheduler, variants: int = SEED_VARIANTS, keep: int = SEED_KEEP):
+        self.scheduler = scheduler
+        self.variants = max(1, variants)
+        self.keep = max(1, min(keep, self.variants))
+
+    def expand(self, sketches: list[dict]) -> list[dict]:
+        """One sketch dict per (sketch, seed); the code is shared, only 'seed' differs"""
+        expanded = []
+        for sketch in sketches:
+            base = random.randrange(2 ** 31)
+            for k in range(self.variants):
+                expanded.append({**sketch, 'id': f"{sketch['id']}_s{k}", 'seed': base + k, 'parent': sketch['id']})
+        return expanded
+
+    async def render(self, sketches: list[dict], output_dir: Path, on_progress=None, label: str = None) -> list[dict]:
+        """Render all variants; returns the kept variants' results (or a failure per sketch) in sketch order"""
+        results = await self.scheduler.render(self.expand(sketches), output_dir, on_progress=on_progress, label=label)
+
+        loop = asyncio.get_running_loop()
+        succeeded = [r for r in results if r['success']]
+        metrics = await asyncio.gather(*(loop.run_in_executor(None, image_metrics, r['image']) for r in succeeded))
+        for result, m in zip(succeeded, metrics):
+            result['metrics'] = m
+            result['variant_score'] = variant_score(m)
+
+        kept = []
+        for sketch in sketches:
+            variants = [r for r in results if r['sketch']['parent'] == sketch['id']]
+            ranked = sorted((r for r in variants if r['success']), key=lambda r: r['variant_score'], reverse=True)
+            kept.extend(ranked[:self.keep] or variants[:1])
+        return kept
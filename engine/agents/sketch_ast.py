@@ -0,0 +1,100 @@
+import ast
+from agents.cost_model import module_constants, resolve_number
+
+
+def _is_cairo_call(node, name: str) -> bool:
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == name and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == 'cairo')
+
+
+def find_surface_setup(tree: ast.Module) -> dict:
+    """Locate the sketch's `surface = cairo.ImageSurface(...)` / `ctx = cairo.Context(surface)` pair.
+
+    Returns statement indices, variable names and the resolved canvas size.
+    Raises ValueError when the sketch doesn't follow the standard setup.
+    """
+    constants = module_constants(tree)
+    setup = {}
+    for idx, stmt in enumerate(tree.body):
+        if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1 or not isinstance(stmt.targets[0], ast.Name):
+            continue
+        name = stmt.targets[0].id
+        if 'surface_index' not in setup and _is_cairo_call(stmt.value, 'ImageSurface') and len(stmt.value.args) == 3:
+            # Resolve size against constants defined *before* this statement
+            before = module_constants(ast.Module(body=tree.body[:idx], type_ignores=[]))
+            size = [resolve_number(a, before) for a in stmt.value.args[1:]]
+            if None in size:
+                size = [resolve_number(a, constants) for a in stmt.value.args[1:]]
+            if None in size:
+                raise ValueError("Could not resolve the sketch's canvas size")
+            setup.update(surface_index=idx, surface_name=name, size=(int(size[0]), int(size[1])))
+        elif 'surface_index' in setup and _is_cairo_call(stmt.value, 'Context') \
+                and stmt.value.args and isinstance(stmt.value.args[0], ast.Name) \
+                and stmt.value.args[0].id == setup['surface_name']:
+            setup.update(context_index=idx, context_name=name)
+            return setup
+    raise ValueError("Sketch has no top-level ImageSurface/Context setup")
+
+
+def rewrite_surface(code: str, surface_expr: str, after_context: str = '') -> str:
+    """Replace the sketch's surface construction and inject code after its Context.
+
+    `surface_expr` and `after_context` may use `{ctx}`, `{surface}`, `{width}`
+    and `{height}` placeholders for the sketch's own names and canvas size.
+    """
+    tree = ast.parse(code)
+    setup = find_surface_setup(tree)
+    fields = {
+        'ctx': setup['context_name'],
+        'surface': setup['surface_name'],
+        'width': setup['size'][0],
+        'height': setup['size'][1],
+    }
+    surface_stmt = tree.body[setup['surface_index']]
+    surface_stmt.value = ast.parse(surface_expr.format(**fields), mode='eval').body
+    injected = ast.parse(after_context.format(**fields)).body if after_context else []
+    ci = setup['context_index'] + 1
+    tree.body[ci:ci] = injected
+    return ast.unparse(ast.fix_missing_locations(tree))
+
+
+def paint_scaled(code: str, target: str, target_expr: str, transform: str) -> str:
+    """Keep the sketch's own surface and paint the finished canvas into `target = target_expr`.
+
+    For sketches that edit pixels directly, which ignore context transforms,
+    so their surface can't be swapped for a scaled one. `transform` sets up
+    the copy's context, using `{ctx}` for its name.
+    """
+    tree = ast.parse(code)
+    setup = find_surface_setup(tree)
+    tree.body += ast.parse(
+        f"{target} = {target_expr}\n"
+        f"__copy__ = cairo.Context({target})\n"
+        + transform.format(ctx='__copy__') +
+        f"__copy__.set_source_surface({setup['surface_name']}, 0, 0)\n"
+        f"__copy__.get_source().set_extend(cairo.EXTEND_PAD)\n"
+        f"__copy__.paint()\n"
+    ).body
+    return ast.unparse(ast.fix_missing_locations(tree))
+
+
+def reseed_sketch(code: str) -> str:
+    """Make the sketch's own `random.seed(...)` calls depend on the run's `__seed__`.
+
+    Sketches that seed themselves would otherwise draw the same image under
+    every run seed. Returns the code unchanged if it never calls random.seed.
+    """
+    tree = ast.parse(code)
+    calls = [node for node in ast.walk(tree) if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+             and node.func.attr == 'seed' and isinstance(node.func.value, ast.Name) and node.func.value.id == 'random'
+             and len(node.args) <= 1 and not node.keywords]
+    if not calls:
+        return code
+    for call in calls:
+        # Strings seed deterministically (unlike hash-based mixing), so "42:7" is stable across processes
+        mixed = ast.parse("f'{__a__}:{__seed__}'" if call.args else "__seed__", mode='eval').body
+        if call.args:
+            mixed.values[0].value = call.args[0]
+        call.args = [mixed]
+    return ast.unparse(ast.fix_missing_locations(tree))
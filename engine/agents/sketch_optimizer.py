@@ -0,0 +1,400 @@
+import ast
+import math
+import random
+
+PREFIX = '_opt_'
+
+# Attributes that are safe to bind to locals: they are methods that always exist
+CONTEXT_METHODS = {
+    'arc', 'arc_negative', 'clip', 'clip_preserve', 'close_path', 'curve_to', 'fill', 'fill_preserve',
+    'line_to', 'mask', 'move_to', 'new_path', 'new_sub_path', 'paint', 'paint_with_alpha', 'rectangle',
+    'rel_curve_to', 'rel_line_to', 'rel_move_to', 'restore', 'rotate', 'save', 'scale', 'set_dash',
+    'set_font_size', 'set_line_cap', 'set_line_join', 'set_line_width', 'set_operator', 'set_source',
+    'set_source_rgb', 'set_source_rgba', 'set_source_surface', 'show_text', 'stroke', 'stroke_preserve',
+    'translate', 'select_font_face', 'text_extents', 'get_current_point',
+}
+MODULE_ATTRS = {
+    'math': {n for n in dir(math) if not n.startswith('_')},
+    'random': {n for n in dir(random) if not n.startswith('_') and callable(getattr(random, n))},
+}
+BUILTINS = {'range', 'len', 'min', 'max', 'abs', 'int', 'float', 'round', 'enumerate', 'zip', 'sum', 'list', 'tuple'}
+
+# Pure functions that can't raise for finite numeric input; only these are hoisted out of loops
+TOTAL_MATH = {'sin', 'cos', 'tan', 'atan', 'atan2', 'hypot', 'fabs', 'radians', 'degrees'}
+NUMERIC_RANDOM = {'random', 'uniform', 'randint', 'randrange', 'gauss', 'normalvariate'}
+NUMERIC_BUILTINS = {'int', 'float', 'abs', 'round', 'min', 'max'}
+MATH_CONSTANTS = {'pi': math.pi, 'tau': math.tau, 'e': math.e}
+FOLDABLE_OPS = {ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b, ast.Mult: lambda a, b: a * b}
+
+
+def _names(node, ctx_type=None) -> set:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and (ctx_type is None or isinstance(n.ctx, ctx_type))}
+
+
+def assigned_names(stmts) -> set:
+    """Names bound by statements, not descending into nested scopes"""
+    names = set()
+    stack = list(stmts)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+            continue
+        if isinstance(node, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            continue
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, ast.alias):
+            names.add((node.asname or node.name).split('.')[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        stack.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def references(node, name: str, loads_only: bool = False) -> bool:
+    """Whether node refers to the global `name` (functions that shadow it don't count)"""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+        args = node.args
+        params = {a.arg for a in args.args + args.kwonlyargs + args.posonlyargs + [args.vararg, args.kwarg] if a}
+        body = node.body if isinstance(node.body, list) else [ast.Expr(node.body)]
+        declared = {n for stmt in body for sub in ast.walk(stmt) if isinstance(sub, ast.Global) for n in sub.names}
+        if name not in declared and (name in params or name in assigned_names(body)):
+            return False
+        children = body
+    else:
+        if isinstance(node, ast.Name) and node.id == name:
+            return isinstance(node.ctx, ast.Load) or not loads_only
+        children = ast.iter_child_nodes(node)
+    return any(references(child, name, loads_only) for child in children)
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """Folds math.pi/tau/e and arithmetic between constants (left-to-right only, so floats stay identical)"""
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        if isinstance(node.ctx, ast.Load) and isinstance(node.value, ast.Name) and node.value.id == 'math' \
+                and node.attr in MATH_CONSTANTS:
+            return ast.copy_location(ast.Constant(MATH_CONSTANTS[node.attr]), node)
+        return node
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        op = FOLDABLE_OPS.get(type(node.op))
+        if op is None and isinstance(node.op, ast.Div) and isinstance(node.right, ast.Constant) and node.right.value:
+            op = lambda a, b: a / b
+        if op and all(isinstance(v, ast.Constant) and type(v.value) in (int, float) for v in (node.left, node.right)):
+            return ast.copy_location(ast.Constant(op(node.left.value, node.right.value)), node)
+        return node
+
+
+class SketchOptimizer:
+    """Source-to-source speedups for generated sketches that keep drawing identical.
+
+    - folds math constants and constant arithmetic
+    - wraps top-level loops in functions so their temporaries are fast locals
+    - hoists loop-invariant pure math on numbers out of `for ... in range()` loops
+    - binds hot globals/attributes (math.sin, ctx.line_to, range, ...) to locals
+    """
+
+    def __init__(self, code: str):
+        self.tree = ast.parse(code)
+        self.counter = 0
+        module_assigned = assigned_names(self.tree.body)
+        # `global` in any function means that name can change behind a loop's back
+        self.global_decls = {n for node in ast.walk(self.tree) if isinstance(node, ast.Global) for n in node.names}
+        self.reassigned_modules = {m for m in MODULE_ATTRS if self._assignment_count(m) > 1}
+        self.functions = {s.name for s in self.tree.body if isinstance(s, ast.FunctionDef)}
+        self.module_assigned = module_assigned
+        self.numeric = self._numeric_names()
+        if any(isinstance(n, ast.Name) and n.id.startswith(PREFIX) for n in ast.walk(self.tree)):
+            raise ValueError("Sketch already uses optimizer-reserved names")
+
+    def _assignment_count(self, name: str) -> int:
+        count = 0
+        for node in ast.walk(self.tree):
+            if isinstance(node, ast.Name) and node.id == name and isinstance(node.ctx, ast.Store):
+                count += 1
+            elif isinstance(node, ast.alias) and (node.asname or node.name) == name:
+                count += 1
+        return count
+
+    def _fresh(self, hint: str) -> str:
+        self.counter += 1
+        return f"{PREFIX}{hint}_{self.counter}"
+
+    # --- top-level loop wrapping -------------------------------------------------
+
+    def _loads_outside(self, loop, name: str, exclude_for_targets: bool) -> bool:
+        """Whether name is referenced outside `loop` anywhere in the module"""
+        for stmt in self.tree.body:
+            if stmt is loop:
+                continue
+            if exclude_for_targets and isinstance(stmt, ast.For) and name in _names(stmt.target):
+                continue
+            if references(stmt, name, loads_only=exclude_for_targets):
+                return True
+        return False
+
+    def _wrap_loops(self):
+        body = []
+        for stmt in self.tree.body:
+            if not isinstance(stmt, (ast.For, ast.While)) or self._unsafe_to_wrap(stmt):
+                body.append(stmt)
+                continue
+            targets = _names(stmt.target) if isinstance(stmt, ast.For) else set()
+            needs_global = set()
+            for name in assigned_names([stmt]):
+                if name in targets:
+                    if self._loads_outside(stmt, name, exclude_for_targets=True):
+                        needs_global.add(name)
+                elif self._loads_outside(stmt, name, exclude_for_targets=False) or name in self.global_decls:
+                    needs_global.add(name)
+            fn_name = self._fresh('loop')
+            fn_body = ([ast.Global(names=sorted(needs_global))] if needs_global else []) + [stmt]
+            fn = ast.parse(f"def {fn_name}():\n    pass").body[0]
+            fn.body = fn_body
+            call = ast.Expr(ast.Call(func=ast.Name(fn_name, ast.Load()), args=[], keywords=[]))
+            body.extend([fn, call])
+        self.tree.body = body
+
+    @staticmethod
+    def _unsafe_to_wrap(loop) -> bool:
+        for node in ast.walk(loop):
+            if isinstance(node, (ast.ClassDef, ast.Nonlocal, ast.Global, ast.Yield, ast.YieldFrom, ast.Await)):
+                return True
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ('locals', 'globals', 'vars', 'exec', 'eval'):
+                return True
+        return False
+
+    # --- loop-invariant hoisting -------------------------------------------------
+
+    def _numeric_names(self) -> set:
+        """Names only ever bound (in any scope) to numbers: literals, or arithmetic and math on such names"""
+        bindings, covered = {}, set()
+        for node in ast.walk(self.tree):
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    pairs = [(target, node.value)]
+                    if isinstance(target, ast.Tuple) and isinstance(node.value, ast.Tuple) \
+                            and len(target.elts) == len(node.value.elts):
+                        pairs = zip(target.elts, node.value.elts)
+                    for name, value in pairs:
+                        if isinstance(name, ast.Name):
+                            bindings.setdefault(name.id, []).append(value)
+                            covered.add(id(name))
+        for node in ast.walk(self.tree):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)) and id(node) not in covered:
+                bindings.setdefault(node.id, []).append(None)  # for/with targets, augmented assignment, ...
+            elif isinstance(node, ast.arg):
+                bindings.setdefault(node.arg, []).append(None)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                bindings.setdefault(node.name, []).append(None)
+            elif isinstance(node, ast.alias):
+                bindings.setdefault((node.asname or node.name).split('.')[0], []).append(None)
+            elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+                bindings.setdefault(node.name, []).append(None)
+
+        numeric = {name for name, values in bindings.items() if None not in values}
+        while True:
+            kept = {name for name in numeric if all(self._numeric_expr(v, numeric) for v in bindings[name])}
+            if kept == numeric:
+                return numeric
+            numeric = kept
+
+    def _numeric_expr(self, node, numeric: set) -> bool:
+        """Whether node can only evaluate to an int or float (or raise)"""
+        if isinstance(node, ast.Constant):
+            return type(node.value) in (int, float)
+        if isinstance(node, ast.Name):
+            return node.id in numeric
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'math' \
+                and 'math' not in self.reassigned_modules:
+            return node.attr in MATH_CONSTANTS
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            return self._numeric_expr(node.operand, numeric)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod)):
+            return self._numeric_expr(node.left, numeric) and self._numeric_expr(node.right, numeric)
+        if isinstance(node, ast.Call) and not node.keywords and all(self._numeric_expr(a, numeric) for a in node.args):
+            func = node.func
+            if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) \
+                    and func.value.id not in self.reassigned_modules:
+                return (func.value.id == 'math' and func.attr in TOTAL_MATH | {'sqrt', 'exp', 'log', 'floor', 'ceil'}) \
+                    or (func.value.id == 'random' and func.attr in NUMERIC_RANDOM)
+            return isinstance(func, ast.Name) and func.id in NUMERIC_BUILTINS and func.id not in self.module_assigned
+        return False
+
+    @staticmethod
+    def _is_pure(node) -> bool:
+        """Names, constants and arithmetic only: evaluating it twice has no side effects"""
+        return all(isinstance(n, (ast.Name, ast.Constant, ast.BinOp, ast.UnaryOp, ast.operator, ast.unaryop, ast.Load))
+                   for n in ast.walk(node))
+
+    def _range_guard(self, loop):
+        """`if range(...):` with the loop's own arguments, when it can be evaluated safely ahead of the loop"""
+        if isinstance(loop, ast.For) and isinstance(loop.iter, ast.Call) and isinstance(loop.iter.func, ast.Name) \
+                and loop.iter.func.id == 'range' and 'range' not in self.module_assigned | self.global_decls \
+                and not loop.iter.keywords and all(self._is_pure(a) for a in loop.iter.args):
+            return ast.If(ast.Call(ast.Name('range', ast.Load()), list(loop.iter.args), []), [], [])
+        return None
+
+    def _is_invariant(self, node, variant: set) -> bool:
+        if isinstance(node, ast.Constant):
+            return type(node.value) in (int, float)
+        if isinstance(node, ast.Name):
+            return node.id in self.numeric and node.id not in variant and node.id not in self.global_decls
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return self._is_invariant(node.operand, variant)
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, (ast.Add, ast.Sub, ast.Mult)):
+                return self._is_invariant(node.left, variant) and self._is_invariant(node.right, variant)
+            if isinstance(node.op, ast.Div) and isinstance(node.right, ast.Constant) and node.right.value:
+                return self._is_invariant(node.left, variant)
+            return False
+        if isinstance(node, ast.Call) and not node.keywords and isinstance(node.func, ast.Attribute) \
+                and isinstance(node.func.value, ast.Name) and node.func.value.id == 'math' \
+                and 'math' not in self.reassigned_modules and node.func.attr in TOTAL_MATH:
+            return all(self._is_invariant(a, variant) for a in node.args)
+        return False
+
+    def _hoist_expr(self, node, variant: set, hoisted: list):
+        """Replace maximal invariant non-trivial subexpressions of node with temps"""
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            return  # own scope: its names aren't the loop's
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, ast.expr):
+                        value[i] = self._hoist_or_recurse(item, variant, hoisted)
+                    elif isinstance(item, ast.AST):
+                        self._hoist_expr(item, variant, hoisted)
+            elif isinstance(value, ast.expr):
+                setattr(node, field, self._hoist_or_recurse(value, variant, hoisted))
+
+    def _hoist_or_recurse(self, expr, variant: set, hoisted: list):
+        if isinstance(expr, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.NamedExpr)):
+            return expr
+        if isinstance(expr, (ast.BinOp, ast.Call)) and self._is_invariant(expr, variant):
+            name = self._fresh('inv')
+            hoisted.append(ast.Assign(targets=[ast.Name(name, ast.Store())], value=expr))
+            return ast.Name(name, ast.Load())
+        self._hoist_expr(expr, variant, hoisted)
+        return expr
+
+    def _hoist_in(self, stmts: list) -> list:
+        """Hoist invariants out of every loop in stmts, outermost loops first"""
+        out = []
+        for stmt in stmts:
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                out.append(stmt)
+                continue
+            guard = self._range_guard(stmt)
+            if guard:
+                # Hoisted code only runs if the loop would, so the guard re-checks its range
+                variant = assigned_names([stmt])
+                hoisted = []
+                for inner in stmt.body:
+                    self._hoist_expr(inner, variant, hoisted)
+                if hoisted:
+                    guard.body = hoisted
+                    out.append(guard)
+            for field in ('body', 'orelse', 'finalbody'):
+                if isinstance(getattr(stmt, field, None), list):
+                    setattr(stmt, field, self._hoist_in(getattr(stmt, field)))
+            if isinstance(stmt, ast.Try):
+                for handler in stmt.handlers:
+                    handler.body = self._hoist_in(handler.body)
+            out.append(stmt)
+        return out
+
+    # --- binding hot names to locals ---------------------------------------------
+
+    def _bindable(self, node, fn_assigned: set):
+        """(key, expression source) if node is a hot name worth binding, else None"""
+        if isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load) and isinstance(node.value, ast.Name):
+            base = node.value.id
+            if base in fn_assigned or base in self.global_decls:
+                return None
+            if base in MODULE_ATTRS and base not in self.reassigned_modules and node.attr in MODULE_ATTRS[base]:
+                return (base, node.attr)
+            if base == 'ctx' and node.attr in CONTEXT_METHODS:
+                return (base, node.attr)
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in fn_assigned \
+                and node.id not in self.global_decls:
+            if node.id in BUILTINS and node.id not in self.module_assigned:
+                return (None, node.id)
+            if node.id in self.functions and self._assignment_count(node.id) == 0:
+                return (None, node.id)
+        return None
+
+    def _bind_in_function(self, fn: ast.FunctionDef):
+        fn_assigned = assigned_names(fn.body) | {a.arg for a in fn.args.args + fn.args.kwonlyargs + fn.args.posonlyargs}
+        fn_assigned -= {n for node in fn.body for n in (node.names if isinstance(node, ast.Global) else [])}
+        local_globals = {n for node in ast.walk(fn) if isinstance(node, ast.Global) for n in node.names}
+        fn_assigned |= local_globals  # names this function rebinds globally are never bound
+
+        # Only names used inside loops are worth a prologue binding
+        counts = {}
+        for loop in (n for n in ast.walk(fn) if isinstance(n, (ast.For, ast.While))):
+            for node in ast.walk(loop):
+                key = self._bindable(node, fn_assigned)
+                if key:
+                    counts[key] = counts.get(key, 0) + 1
+        if not counts:
+            return
+
+        aliases = {}
+        prologue = []
+        for base, attr in sorted(counts, key=lambda k: (k[0] or '', k[1])):
+            alias = self._fresh(f"{base}_{attr}" if base else attr)
+            aliases[(base, attr)] = alias
+            source = f"{base}.{attr}" if base else attr
+            prologue.append(ast.Assign(targets=[ast.Name(alias, ast.Store())], value=ast.parse(source, mode='eval').body))
+
+        optimizer = self
+
+        class Rebinder(ast.NodeTransformer):
+            def visit_FunctionDef(self, node):
+                return node if node is not fn else self.generic_visit(node)
+
+            def visit_ClassDef(self, node):
+                return node
+
+            def _swap(self, node):
+                key = optimizer._bindable(node, fn_assigned)
+                if key in aliases:
+                    return ast.copy_location(ast.Name(aliases[key], ast.Load()), node)
+                return self.generic_visit(node)
+
+            visit_Attribute = _swap
+            visit_Name = _swap
+
+        Rebinder().visit(fn)
+        docstring = 1 if fn.body and isinstance(fn.body[0], ast.Expr) and isinstance(fn.body[0].value, ast.Constant) \
+            and isinstance(fn.body[0].value.value, str) else 0
+        globals_first = sum(1 for s in fn.body[docstring:] if isinstance(s, ast.Global))
+        at = docstring + globals_first
+        fn.body[at:at] = prologue
+
+    # --- driver ------------------------------------------------------------------
+
+    def optimize(self) -> str:
+        self.tree = _ConstantFolder().visit(self.tree)
+        self._wrap_loops()
+        for node in list(ast.walk(self.tree)):
+            if isinstance(node, ast.FunctionDef):
+                node.body = self._hoist_in(node.body)
+        for node in [n for n in ast.walk(self.tree) if isinstance(n, ast.FunctionDef)]:
+            self._bind_in_function(node)
+        return ast.unparse(ast.fix_missing_locations(self.tree))
+
+
+def optimize_sketch(code: str) -> str:
+    """Optimized source for a sketch, or the original if it can't be transformed"""
+    try:
+        optimized = SketchOptimizer(code).optimize()
+        compile(optimized, '<optimized sketch>', 'exec')
+        return optimized
+    except (SyntaxError, ValueError, RecursionError):
+        return code
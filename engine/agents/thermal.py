@@ -0,0 +1,105 @@
+import time
+from pathlib import Path
+from config.settings import (
+    THERMAL_ZONE_PATH, MEMINFO_PATH, PSI_MEMORY_PATH,
+    THERMAL_SOFT_LIMIT, THERMAL_HARD_LIMIT, MEMORY_MIN_AVAILABLE_MB, PSI_MEMORY_LIMIT,
+    GOVERNOR_INTERVAL, THROTTLE_TIMEOUT_STRETCH,
+)
+
+
+class ThermalGovernor:
+    """Adjusts render concurrency to stay under temperature and memory limits.
+
+    Reads the SoC temperature, MemAvailable and memory PSI. Any reading that
+    is unavailable (e.g. PSI disabled in the kernel) is simply ignored.
+    """
+
+    def __init__(self, max_workers: int, thermal_path: Path = THERMAL_ZONE_PATH,
+                 meminfo_path: Path = MEMINFO_PATH, psi_path: Path = PSI_MEMORY_PATH,
+                 interval: float = GOVERNOR_INTERVAL):
+        self.max_workers = max_workers
+        self.target = max_workers
+        self.thermal_path = Path(thermal_path)
+        self.meminfo_path = Path(meminfo_path)
+        self.psi_path = Path(psi_path)
+        self.interval = interval
+        self.events = []
+        self.last = {}
+        self._last_adjust = 0.0
+
+    def _read_temp(self):
+        try:
+            return int(self.thermal_path.read_text().strip()) / 1000  # millidegrees
+        except (OSError, ValueError):
+            return None
+
+    def _read_mem_available(self):
+        try:
+            for line in self.meminfo_path.read_text().splitlines():
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024  # kB -> MB
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def _read_psi(self):
+        try:
+            for line in self.psi_path.read_text().splitlines():
+                if line.startswith('some'):
+                    fields = dict(f.split('=') for f in line.split()[1:])
+                    return float(fields['avg10'])
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def sample(self) -> dict:
+        """Current temperature (°C), available memory (MB) and memory PSI"""
+        self.last = {
+            'temp_c': self._read_temp(),
+            'mem_available_mb': self._read_mem_available(),
+            'psi_some_avg10': self._read_psi(),
+        }
+        return self.last
+
+    def _pressure(self, reading: dict) -> str:
+        """'high', 'low' or 'ok' depending on how close readings are to the limits"""
+        temp, mem, psi = reading['temp_c'], reading['mem_available_mb'], reading['psi_some_avg10']
+        if (temp is not None and temp >= THERMAL_HARD_LIMIT) \
+                or (mem is not None and mem < MEMORY_MIN_AVAILABLE_MB) \
+                or (psi is not None and psi >= PSI_MEMORY_LIMIT):
+            return 'high'
+        if (temp is None or temp < THERMAL_SOFT_LIMIT) \
+                and (mem is None or mem >= 2 * MEMORY_MIN_AVAILABLE_MB) \
+                and (psi is None or psi < PSI_MEMORY_LIMIT / 2):
+            return 'low'
+        return 'ok'
+
+    def _log(self, event: str, reading: dict):
+        self.events.append({'time': round(time.time(), 1), 'event': event, 'workers': self.target, **reading})
+        print(f"  ⚠ Governor {event}: {self.target} workers "
+              f"(temp={reading['temp_c']}°C, mem={reading['mem_available_mb']}MB, psi={reading['psi_some_avg10']})")
+
+    def concurrency(self) -> int:
+        """Number of renders allowed to run now, stepping by one per interval"""
+        now = time.monotonic()
+        if now - self._last_adjust < self.interval:
+            return self.target
+        self._last_adjust = now
+
+        reading = self.sample()
+        pressure = self._pressure(reading)
+        if pressure == 'high' and self.target > 1:
+            self.target -= 1
+            self._log('shrink', reading)
+        elif pressure == 'low' and self.target < self.max_workers:
+            self.target += 1
+            self._log('grow', reading)
+        return self.target
+
+    def throttled(self) -> bool:
+        temp = self.last.get('temp_c') if self.last else self._read_temp()
+        return temp is not None and temp >= THERMAL_HARD_LIMIT
+
+    def timeout_scale(self) -> float:
+        """Timeout multiplier; renders are slower while the SoC is throttling"""
+        return THROTTLE_TIMEOUT_STRETCH if self.throttled() else 1.0
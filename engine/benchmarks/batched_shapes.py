@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.shapes against per-vertex and per-item cairo calls from the curve themes.
+
+Lissajous: math.sin per vertex + line_to, against np.sin + shapes.lines.
+Fibonacci: one set_source/arc/fill per dot with its own colour, against
+shapes.circles with colours rounded to --levels steps. Moiré: two rotated
+line grids with a stroke per line, against shapes.lines with per-line
+widths. Reports time and cairo calls; the batched versions must emit the
+same geometry (segment and arc counts).
+
+Usage: python benchmarks/batched_shapes.py [--vertices 20000] [--dots 3000] [--levels 32]
+"""
+import argparse
+from collections import Counter
+import colorsys
+import math
+from pathlib import Path
+import sys
+import time
+import cairo
+import numpy as np
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sketchlib import shapes
+
+WIDTH, HEIGHT = 600, 480
+CX, CY = WIDTH / 2, HEIGHT / 2
+
+
+class Counting:
+    """Context proxy that counts calls by name"""
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        method = getattr(self._ctx, name)
+
+        def call(*args):
+            self.calls[name] += 1
+            return method(*args)
+        return call
+
+
+def lissajous_loop(ctx, n):
+    for i in range(n):
+        t = i / (n - 1) * 2 * math.pi
+        x, y = CX + 250 * math.sin(3 * t + 0.5), CY + 200 * math.sin(4 * t)
+        if i == 0:
+            ctx.move_to(x, y)
+        else:
+            ctx.line_to(x, y)
+    ctx.stroke()
+
+
+def lissajous_batched(ctx, n):
+    t = np.linspace(0, 2 * np.pi, n)
+    shapes.lines(ctx, np.column_stack([CX + 250 * np.sin(3 * t + 0.5), CY + 200 * np.sin(4 * t)]))
+
+
+def fibonacci_loop(ctx, n, levels):
+    for k in range(n):
+        r, a = 4 * math.sqrt(k), k * 2.39996
+        ctx.set_source_rgba(*colorsys.hsv_to_rgb(k / n, 0.7, 0.9), 0.8)
+        ctx.arc(CX + r * math.cos(a), CY + r * math.sin(a), 2 + k / n * 3, 0, 2 * math.pi)
+        ctx.fill()
+
+
+def fibonacci_batched(ctx, n, levels):
+    k = np.arange(n)
+    r, a = 4 * np.sqrt(k), k * 2.39996
+    rgb = np.array([colorsys.hsv_to_rgb(h, 0.7, 0.9) for h in (k / n).tolist()])
+    colours = np.column_stack([rgb, np.full(n, 0.8)])
+    shapes.circles(ctx, np.column_stack([CX + r * np.cos(a), CY + r * np.sin(a)]), 2 + k / n * 3,
+                   colours=colours, levels=levels)
+
+
+def moire_loop(ctx, n, levels):
+    for angle in (0.0, 0.05):
+        c, s = math.cos(angle), math.sin(angle)
+        for i in range(n):
+            offset = (i - n / 2) * 4
+            ctx.set_line_width(0.5 + (i % 3) * 0.5)
+            ctx.move_to(CX + offset * c - 400 * s, CY + offset * s + 400 * c)
+            ctx.line_to(CX + offset * c + 400 * s, CY + offset * s - 400 * c)
+            ctx.stroke()
+
+
+def moire_batched(ctx, n, levels):
+    offset = (np.arange(n) - n / 2) * 4
+    ends = []
+    for angle in (0.0, 0.05):
+        c, s = math.cos(angle), math.sin(angle)
+        ends.append(np.stack([np.column_stack([CX + offset * c - 400 * s, CY + offset * s + 400 * c]),
+                              np.column_stack([CX + offset * c + 400 * s, CY + offset * s - 400 * c])], axis=1))
+    points = np.concatenate(ends).reshape(-1, 2)
+    widths = np.tile(0.5 + (np.arange(n) % 3) * 0.5, 2)
+    shapes.lines(ctx, points, np.arange(0, len(points) + 1, 2), widths=widths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vertices', type=int, default=20000)
+    parser.add_argument('--dots', type=int, default=3000)
+    parser.add_argument('--lines', type=int, default=150)
+    parser.add_argument('--levels', type=int, default=32)
+    args = parser.parse_args()
+
+    def context():
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, WIDTH, HEIGHT)
+        ctx = cairo.Context(surface)
+        ctx.set_source_rgba(1, 1, 1, 0.8)
+        return ctx
+
+    cases = {
+        'lissajous': (lissajous_loop, lissajous_batched, args.vertices),
+        'fibonacci': (fibonacci_loop, fibonacci_batched, args.dots),
+        'moire': (moire_loop, moire_batched, args.lines),
+    }
+    mismatches = []
+    print(f"{'theme':<10} {'loop':>8} {'shapes':>8} {'speedup':>8}   calls (loop -> shapes)")
+    for theme, (loop, batched, n) in cases.items():
+        extra = () if theme == 'lissajous' else (args.levels,)
+        timings = []
+        for fn in (loop, batched):
+            start = time.perf_counter()
+            fn(context(), n, *extra)
+            timings.append(time.perf_counter() - start)
+        counts = []
+        for fn in (loop, batched):
+            ctx = Counting(context())
+            fn(ctx, n, *extra)
+            counts.append(ctx.calls)
+        geometry = ('line_to', 'arc')  # shapes adds a move_to per circle to keep them apart
+        if any(counts[0][op] != counts[1][op] for op in geometry):
+            mismatches.append(theme)
+        state = ('set_source_rgb', 'set_source_rgba', 'set_line_width', 'stroke', 'fill')
+        summary = ', '.join(f"{op} {counts[0][op]}->{counts[1][op]}" for op in state if counts[0][op] or counts[1][op])
+        print(f"{theme:<10} {timings[0] * 1000:>6.0f}ms {timings[1] * 1000:>6.0f}ms {timings[0] / timings[1]:>7.1f}x   {summary}")
+
+    if mismatches:
+        sys.exit(f"✗ Batched drawing emits different geometry: {', '.join(mismatches)}")
+    print("✓ Same geometry with fewer state changes")
+
+if __name__ == "__main__":
+    main()
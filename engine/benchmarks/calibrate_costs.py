@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Measure pycairo primitive costs on this device and write the cost table.
+
+The table feeds the static render-time estimator and the generator's
+performance guidance. Run once per device; compare devices with --compare.
+
+Usage: python benchmarks/calibrate_costs.py [--output cost_table.json] [--quick]
+       python benchmarks/calibrate_costs.py --compare pi4.json pi5.json
+"""
+import argparse
+import json
+from pathlib import Path
+import sys
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import COST_TABLE_PATH
+
+def compare(paths: list[Path]):
+    tables = [json.loads(p.read_text()) for p in paths]
+    print(f"{'op':<20}" + ''.join(f"{t['device'][:22]:>24}" for t in tables))
+    for op in sorted(set().union(*(t['costs'] for t in tables))):
+        print(f"{op:<20}" + ''.join(f"{t['costs'].get(op, float('nan')) * 1e6:>22.2f}µs" for t in tables))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', type=Path, default=COST_TABLE_PATH)
+    parser.add_argument('--quick', action='store_true', help='10x fewer iterations')
+    parser.add_argument('--compare', type=Path, nargs='+', metavar='TABLE')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return
+
+    from agents.cost_calibrator import CostCalibrator
+    table = CostCalibrator(scale=0.1 if args.quick else 1.0).run(args.output)
+    print(f"Device: {table['device']} (cairo {table['cairo']})")
+    for op, seconds in sorted(table['costs'].items(), key=lambda kv: -kv[1]):
+        print(f"  {op:<20} {seconds * 1e6:>10.2f}µs")
+    print(f"✓ Cost table written to {args.output}")
+
+if __name__ == "__main__":
+    main()
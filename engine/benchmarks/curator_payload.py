@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark the curator image payload: full-size PNGs against resized WebP/JPEG.
+
+Builds the image blocks CuratorAgent.select_best sends for a period's worth
+of gallery renders, as the original PNGs and as configured (CURATOR_MAX_EDGE,
+CURATOR_IMAGE_FORMAT, CURATOR_IMAGE_QUALITY), and reports payload bytes,
+encode time (one thread vs the pool) and the upload time at --uplink Mbit/s.
+Offline quality check: the recompressed images must keep the local
+variant_score pick, move no score by more than --score-drift and stay
+within --tolerance mean pixel difference of the originals. That is only a
+proxy for the curator's judgement; whether its selections hold is shown by
+--live (needs ANTHROPIC_API_KEY), which calls the curator --trials times
+with each payload and compares end-to-end latency and picks.
+
+Usage: python benchmarks/curator_payload.py [image.png ...] [--count 8] [--uplink 5] [--live --trials 3]
+"""
+import argparse
+import asyncio
+from collections import Counter
+from io import BytesIO
+from pathlib import Path
+import base64
+import sys
+import numpy as np
+from PIL import Image
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.image_metrics import image_metrics, variant_score
+from agents.image_payload import build_image_blocks
+from config.settings import CURATOR_MAX_EDGE, CURATOR_IMAGE_FORMAT, CURATOR_IMAGE_QUALITY, GALLERY_DIR
+
+
+def decoded(block: dict) -> Image.Image:
+    return Image.open(BytesIO(base64.b64decode(block['source']['data']))).convert('RGB')
+
+
+def scores(images) -> np.ndarray:
+    return np.array([variant_score(image_metrics(image)) for image in images])
+
+
+async def curate(images: list[Path], max_edge, fmt, trials: int) -> tuple[list[str], list[float]]:
+    from agents.curator import CuratorAgent
+    sketches = [{'id': f"sketch_{i:03d}", 'theme': image.parent.name, 'image': image} for i, image in enumerate(images)]
+    curator = CuratorAgent()
+    curator.max_edge, curator.image_format = max_edge, fmt
+    picks, seconds = [], []
+    for _ in range(trials):
+        best = await curator.select_best([dict(s) for s in sketches])
+        picks.append(best['id'])
+        seconds.append(curator.last_stats['total_seconds'])
+    return picks, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('images', nargs='*', type=Path)
+    parser.add_argument('--count', type=int, default=8)
+    parser.add_argument('--uplink', type=float, default=5.0, help='Mbit/s')
+    parser.add_argument('--tolerance', type=float, default=6.0)
+    parser.add_argument('--score-drift', type=float, default=0.02)
+    parser.add_argument('--live', action='store_true')
+    parser.add_argument('--trials', type=int, default=3)
+    args = parser.parse_args()
+    images = args.images or sorted(GALLERY_DIR.glob('*/period_*.png'))[-args.count:]
+    if not images:
+        sys.exit("✗ No images to benchmark")
+
+    original, before = build_image_blocks(images, fmt=None, workers=1)
+    _, serial = build_image_blocks(images, workers=1)
+    blocks, after = build_image_blocks(images)
+
+    print(f"{len(images)} images, {CURATOR_IMAGE_FORMAT} q{CURATOR_IMAGE_QUALITY}, max edge {CURATOR_MAX_EDGE}")
+    print(f"{'payload':<12} {'bytes':>9} {'encode':>9} {'upload':>9}")
+    for name, stats in (('PNG', before), ('resized', after)):
+        upload = stats['payload_bytes'] * 8 / (args.uplink * 1e6)
+        print(f"{name:<12} {stats['payload_bytes'] / 1024:>7.0f}KB {stats['encode_seconds'] * 1000:>7.0f}ms {upload:>8.2f}s")
+    print(f"payload {before['payload_bytes'] / after['payload_bytes']:.1f}x smaller; "
+          f"encode {serial['encode_seconds'] * 1000:.0f}ms on one thread, {after['encode_seconds'] * 1000:.0f}ms pooled")
+
+    sources = [Image.open(image).convert('RGB') for image in images]
+    sent = [decoded(block) for block in blocks]
+    difference = float(np.mean([np.abs(np.asarray(src, dtype=np.float32) -
+                                       np.asarray(img.resize(src.size, Image.LANCZOS), dtype=np.float32)).mean()
+                                for src, img in zip(sources, sent)]))
+    expected, result = scores(sources), scores(sent)
+    drift = float(np.abs(expected - result).max())
+    same_pick = expected.argmax() == result.argmax()
+    print(f"mean pixel difference {difference:.2f}, variant_score drift {drift:.4f}, "
+          f"pick {'unchanged' if same_pick else 'changed'}")
+    failures = []
+    if difference > args.tolerance or drift > args.score_drift or not same_pick:
+        failures.append("recompressed images drift from the originals")
+
+    if args.live:
+        picks_png, seconds_png = asyncio.run(curate(images, None, None, args.trials))
+        picks_new, seconds_new = asyncio.run(curate(images, CURATOR_MAX_EDGE, CURATOR_IMAGE_FORMAT, args.trials))
+        agreement = np.mean([a == b for a, b in zip(picks_png, picks_new)])
+        print(f"curator PNG:     {np.median(seconds_png):.1f}s median, picks {picks_png}")
+        print(f"curator resized: {np.median(seconds_new):.1f}s median, picks {picks_new}")
+        print(f"pick agreement {agreement:.0%} per trial")
+        if Counter(picks_png).most_common(1)[0][0] != Counter(picks_new).most_common(1)[0][0]:
+            failures.append("the curator's usual pick changed")
+
+    if failures:
+        sys.exit(f"✗ {'; '.join(failures)}")
+    if args.live:
+        print("✓ Smaller curator payload with the same curator pick")
+    else:
+        print("✓ Smaller curator payload within the offline quality proxy (curator picks unchecked; run --live)")
+
+if __name__ == "__main__":
+    main()
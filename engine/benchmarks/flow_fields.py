@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.flow against the per-particle flow-field loop found in gallery sketches.
+
+The gallery steps one particle at a time, evaluating its noise function and
+calling line_to per step. Times that against noise.grid + flow.trace +
+flow.draw for the same particle and step counts, split into tracing and
+drawing, then scales the batched version up to see how much more fits in
+the gallery's time.
+
+Usage: python benchmarks/flow_fields.py [--particles 1000] [--steps 100]
+"""
+import argparse
+import math
+from pathlib import Path
+import random
+import sys
+import time
+import cairo
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.noise_fields import harmonic_noise
+from sketchlib import flow, noise
+
+WIDTH, HEIGHT = 600, 480
+
+
+def gallery_flow(ctx, particles: int, steps: int, step_length: float = 2.0):
+    rng = random.Random(1)
+    for _ in range(particles):
+        px, py = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+        ctx.move_to(px, py)
+        for _ in range(steps):
+            angle = harmonic_noise(px, py, scale=0.004)
+            px += math.cos(angle) * step_length
+            py += math.sin(angle) * step_length
+            if px < 0 or px > WIDTH or py < 0 or py > HEIGHT:
+                break
+            ctx.line_to(px, py)
+        ctx.stroke()
+
+
+def batched_flow(ctx, particles: int, steps: int, step_length: float = 2.0) -> tuple[float, float]:
+    start = time.perf_counter()
+    angles = noise.grid(WIDTH, HEIGHT, scale=0.004, octaves=3, seed=1, step=4) * math.pi * 2
+    points, offsets = flow.trace(angles, particles, steps=steps, step_size=step_length, field_step=4, seed=1)
+    traced = time.perf_counter()
+    flow.draw(ctx, points, offsets)
+    ctx.stroke()
+    return traced - start, time.perf_counter() - traced
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--particles', type=int, default=1000)
+    parser.add_argument('--steps', type=int, default=100)
+    args = parser.parse_args()
+
+    def context():
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, WIDTH, HEIGHT)
+        ctx = cairo.Context(surface)
+        ctx.set_source_rgba(1, 1, 1, 0.3)
+        ctx.set_line_width(0.5)
+        return ctx
+
+    start = time.perf_counter()
+    gallery_flow(context(), args.particles, args.steps)
+    gallery = time.perf_counter() - start
+    noise.grid.cache_clear()
+    trace, draw = batched_flow(context(), args.particles, args.steps)
+
+    print(f"{args.particles} particles x {args.steps} steps")
+    print(f"{'gallery loop':<22} {gallery * 1000:>8.0f}ms")
+    print(f"{'flow.trace':<22} {trace * 1000:>8.0f}ms  {gallery / trace:>6.0f}x")
+    print(f"{'flow.trace + draw':<22} {(trace + draw) * 1000:>8.0f}ms  {gallery / (trace + draw):>6.0f}x")
+
+    # Tracing alone, scaled up until it takes the gallery loop's time
+    scale = 1
+    while True:
+        noise.grid.cache_clear()
+        start = time.perf_counter()
+        angles = noise.grid(WIDTH, HEIGHT, scale=0.004, octaves=3, seed=1, step=4) * math.pi * 2
+        flow.trace(angles, args.particles * scale, steps=args.steps, step_size=2.0, field_step=4, seed=1)
+        if time.perf_counter() - start > gallery or scale >= 1024:
+            break
+        scale *= 2
+    print(f"particle-steps traced in the gallery loop's time: {scale // 2 or 1}-{scale}x more")
+
+    if trace + draw > gallery:
+        sys.exit("✗ Batched flow field is slower than the gallery loop")
+    print("✓ Batched flow field beats the gallery loop")
+
+if __name__ == "__main__":
+    main()
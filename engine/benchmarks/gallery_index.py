@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark the gallery pHash index and calibrate DEDUPE_RADIUS.
+
+Builds a GalleryIndex over the gallery (cold, then a warm refresh from the
+cache) and runs a radius query for every gallery render, timing the
+multi-index against a linear scan; both must return the same matches. The
+index is then padded with --extra hashes near the gallery ones to show how
+queries scale. For calibration it reports the closest pair of distinct
+gallery renders and how many slightly altered copies of each winner
+(re-encoded, brightened, shifted) still fall within DEDUPE_RADIUS.
+
+Usage: python benchmarks/gallery_index.py [--extra 20000] [--budget-ms 1]
+"""
+import argparse
+from io import BytesIO
+import hashlib
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from PIL import Image, ImageChops, ImageEnhance
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.gallery_index import MultiIndex, GalleryIndex, hamming, phash
+from config.settings import DEDUPE_RADIUS, GALLERY_DIR
+
+
+def reencoded(image):
+    buffer = BytesIO()
+    image.convert('RGB').save(buffer, 'JPEG', quality=70)
+    return Image.open(buffer)
+
+
+ALTERATIONS = {
+    'jpeg q70': reencoded,
+    'brighter 10%': lambda image: ImageEnhance.Brightness(image).enhance(1.1),
+    'shifted 2px': lambda image: ImageChops.offset(image, 2, 2),
+}
+
+
+def timed_queries(query, values, radius):
+    results, worst = [], 0.0
+    start = time.perf_counter()
+    for value in values:
+        begin = time.perf_counter()
+        results.append(sorted(key for _, key in query(value, radius)))
+        worst = max(worst, time.perf_counter() - begin)
+    return (time.perf_counter() - start) / len(values), worst, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--extra', type=int, default=20000)
+    parser.add_argument('--budget-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / 'hashes.json'
+        start = time.perf_counter()
+        index = GalleryIndex(GALLERY_DIR, cache)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        index.refresh()
+        warm = time.perf_counter() - start
+    if not index.hashes:
+        sys.exit("✗ No gallery renders to index")
+    print(f"{len(index.hashes)} gallery renders: indexed in {cold:.2f}s, refreshed from cache in {warm * 1000:.0f}ms")
+
+    entries = list(index.hashes.items())
+    values = [value for _, value in entries]
+
+    def linear(value, radius):
+        return [(d, key) for key, h in entries if (d := hamming(value, h)) <= radius]
+
+    failures = []
+    print(f"{'index':<22} {'mean':>9} {'worst':>9}")
+    table_mean, table_worst, table_results = timed_queries(index.table.query, values, DEDUPE_RADIUS)
+    scan_mean, scan_worst, scan_results = timed_queries(linear, values, DEDUPE_RADIUS)
+    print(f"{'multi-index':<22} {table_mean * 1e6:>7.0f}µs {table_worst * 1e6:>7.0f}µs")
+    print(f"{'linear scan':<22} {scan_mean * 1e6:>7.0f}µs {scan_worst * 1e6:>7.0f}µs")
+    if table_results != scan_results:
+        failures.append("multi-index matches differ from a linear scan")
+    if table_worst * 1000 > args.budget_ms:
+        failures.append(f"queries over {args.budget_ms}ms")
+
+    # Padded with hashes 6-20 bits from a gallery one, like years of renders of recurring themes
+    rng = random.Random(0)
+    table = MultiIndex()
+    padded = list(entries)
+    for key, value in entries:
+        table.add(value, key)
+    for i in range(args.extra):
+        value = rng.choice(values)
+        for bit in rng.sample(range(64), rng.randint(6, 20)):
+            value ^= 1 << bit
+        table.add(value, f"extra/{i}")
+        padded.append((f"extra/{i}", value))
+    entries = padded
+    table_mean, table_worst, table_results = timed_queries(table.query, values, DEDUPE_RADIUS)
+    scan_mean, scan_worst, scan_results = timed_queries(linear, values, DEDUPE_RADIUS)
+    print(f"{f'multi-index ({len(table)})':<22} {table_mean * 1e6:>7.0f}µs {table_worst * 1e6:>7.0f}µs")
+    print(f"{f'linear scan ({len(table)})':<22} {scan_mean * 1e6:>7.0f}µs {scan_worst * 1e6:>7.0f}µs")
+    if table_results != scan_results:
+        failures.append("padded multi-index matches differ from a linear scan")
+
+    # Calibration: distinct renders should be apart, altered copies within the radius
+    distinct = {}
+    for path in sorted(GALLERY_DIR.glob('**/*.png')):
+        distinct.setdefault(hashlib.md5(path.read_bytes()).hexdigest(), path)
+    renders = list(distinct.values())
+    hashes = [index.hashes[str(path.relative_to(GALLERY_DIR))] for path in renders]
+    closest = min((hamming(a, b), i, j) for i, a in enumerate(hashes) for j, b in enumerate(hashes[:i]))
+    print(f"closest distinct renders ({len(renders)}): distance {closest[0]}, "
+          f"{renders[closest[1]].relative_to(GALLERY_DIR)} ~ {renders[closest[2]].relative_to(GALLERY_DIR)}")
+    winners = sorted(GALLERY_DIR.glob('*/period_*.png'))
+    for name, alter in ALTERATIONS.items():
+        within = sum(hamming(phash(alter(Image.open(path))), index.hashes[str(path.relative_to(GALLERY_DIR))])
+                     <= DEDUPE_RADIUS for path in winners)
+        print(f"  {name:<14} {within / len(winners):>6.1%} of altered winners within radius {DEDUPE_RADIUS}")
+
+    if failures:
+        sys.exit(f"✗ {'; '.join(failures)}")
+    print(f"✓ multi-index queries match a linear scan within {args.budget_ms}ms")
+
+if __name__ == "__main__":
+    main()
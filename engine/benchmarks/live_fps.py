@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Headless fps/latency benchmark for living artwork mode.
+
+Animates gallery sketches against a file-backed framebuffer and reports the
+achieved frame rate and per-frame render/blit latency.
+
+Usage: python benchmarks/live_fps.py [sketch.py ...] [--seconds 5] [--fps 10] [--bpp 32]
+"""
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.live_display import Framebuffer, LiveArtwork
+from config.settings import DISPLAY_WIDTH, DISPLAY_HEIGHT, GALLERY_DIR, LIVE_FPS, LIVE_MODE
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sketches', type=Path, nargs='*')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--fps', type=float, default=LIVE_FPS)
+    parser.add_argument('--bpp', type=int, default=32, choices=(16, 32))
+    parser.add_argument('--mode', default=LIVE_MODE, choices=('drift', 'seed'))
+    args = parser.parse_args()
+
+    sketches = args.sketches or sorted(GALLERY_DIR.glob('*/period_*.py'))[-8:]
+
+    with tempfile.NamedTemporaryFile(suffix='.fb') as fb_file:
+        fb_file.truncate(DISPLAY_WIDTH * DISPLAY_HEIGHT * args.bpp // 8)
+        framebuffer = Framebuffer(fb_file.name, bpp=args.bpp)
+
+        print(f"{'sketch':<32} {'fps':>6} {'render p50':>11} {'render p95':>11} {'blit p50':>9}")
+        for path in sketches:
+            name = f"{path.parent.name}/{path.stem}"
+            try:
+                stats = LiveArtwork(path.read_text(), framebuffer, fps=args.fps, mode=args.mode).run(duration=args.seconds)
+            except Exception as e:
+                print(f"{name:<32} ✗ {type(e).__name__}: {e}")
+                continue
+            print(f"{name:<32} {stats['fps']:>6.1f} {stats['render_ms_p50']:>9.1f}ms "
+                  f"{stats['render_ms_p95']:>9.1f}ms {stats['blit_ms_p50']:>7.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Validate the sketch optimizer against the gallery and report its speedup.
+
+Renders every gallery sketch with and without agents.sketch_optimizer under
+the same seed, requires pixel-identical output and prints per-sketch and
+total render times.
+
+Usage: python benchmarks/optimizer_corpus.py [sketch.py ...] [--seed 0] [--repeats 3]
+"""
+import argparse
+from pathlib import Path
+import sys
+import time
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.executor import SafeExecutor
+from config.settings import GALLERY_DIR, GENERATION_TIMEOUT
+
+def render(code: str, optimize: bool, seed: int, repeats: int) -> tuple[float, bytes]:
+    executor = SafeExecutor(timeout=GENERATION_TIMEOUT * 3, optimize=optimize)
+    best, pixels = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        namespace = executor.run(code, seed)
+        best = min(best, time.perf_counter() - start)
+        surface = namespace['surface']
+        surface.flush()
+        pixels = bytes(surface.get_data())
+    return best, pixels
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sketches', type=Path, nargs='*')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3, help='best-of-N timing')
+    args = parser.parse_args()
+
+    sketches = args.sketches or sorted(GALLERY_DIR.glob('*/period_*.py'))
+    total_plain = total_optimized = 0.0
+    mismatches, failures = [], 0
+
+    print(f"{'sketch':<32} {'plain':>8} {'optimized':>10} {'speedup':>8}  pixels")
+    for path in sketches:
+        name = f"{path.parent.name}/{path.stem}"
+        code = path.read_text()
+        try:
+            plain, expected = render(code, False, args.seed, args.repeats)
+        except Exception as e:
+            failures += 1
+            print(f"{name:<32} skipped ({type(e).__name__})")
+            continue
+        try:
+            optimized, actual = render(code, True, args.seed, args.repeats)
+            same = actual == expected
+        except Exception as e:
+            optimized, same = plain, False
+            print(f"  optimized run failed: {type(e).__name__}: {e}")
+        if not same:
+            mismatches.append(name)
+        total_plain += plain
+        total_optimized += optimized
+        print(f"{name:<32} {plain * 1000:>6.0f}ms {optimized * 1000:>8.0f}ms {plain / optimized:>7.2f}x  "
+              f"{'identical' if same else 'DIFFERENT'}")
+
+    if total_optimized:
+        print(f"\nTotal: {total_plain:.2f}s -> {total_optimized:.2f}s ({total_plain / total_optimized:.2f}x), "
+              f"{failures} skipped")
+    if mismatches:
+        sys.exit(f"✗ {len(mismatches)} sketches render differently: {', '.join(mismatches)}")
+    print("✓ All optimized renders are pixel-identical")
+
+if __name__ == "__main__":
+    main()
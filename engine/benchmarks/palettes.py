@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.palette against per-primitive colour code from gallery sketches.
+
+For n primitives: colorsys.hsv_to_rgb per item against palette.hsv_to_rgb,
+a hand-rolled three-stop gradient lerp per item against palette.gradient +
+palette.lookup, and nearest-palette-colour snapping per item against
+palette.quantize. HSV must match colorsys exactly; the gradient within one
+lookup-table step.
+
+Usage: python benchmarks/palettes.py [--count 100000]
+"""
+import argparse
+import colorsys
+from pathlib import Path
+import sys
+import time
+import numpy as np
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sketchlib import palette
+
+STOPS = [(0.11, 0.12, 0.23), (0.91, 0.31, 0.22), (0.96, 0.97, 0.92)]
+SWATCHES = [(0.05, 0.05, 0.1), (0.9, 0.3, 0.2), (0.95, 0.85, 0.6), (0.2, 0.4, 0.6), (1, 1, 1)]
+
+
+def lerp_gradient(t):
+    if t < 0.5:
+        a, b, f = STOPS[0], STOPS[1], t * 2
+    else:
+        a, b, f = STOPS[1], STOPS[2], (t - 0.5) * 2
+    return tuple(x + (y - x) * f for x, y in zip(a, b))
+
+
+def nearest_swatch(colour):
+    return min(SWATCHES, key=lambda s: sum((a - b) ** 2 for a, b in zip(colour, s)))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    hues, values = rng.random(args.count), rng.random(args.count)
+    listed = values.tolist()
+
+    rows = []
+    loop, expected = timed(lambda: [colorsys.hsv_to_rgb(h, 0.7, 0.9) for h in hues.tolist()])
+    fast, result = timed(lambda: palette.hsv_to_rgb(hues, 0.7, 0.9))
+    rows.append(('hsv -> rgb', loop, fast, float(np.abs(np.array(expected) - result).max())))
+
+    loop, expected = timed(lambda: [lerp_gradient(t) for t in listed])
+    fast, result = timed(lambda: palette.lookup(palette.gradient(STOPS, n=1024, space='srgb'), values))
+    rows.append(('gradient', loop, fast, float(np.abs(np.array(expected) - result).max())))
+
+    colours = rng.random((args.count, 3))
+    loop, expected = timed(lambda: [nearest_swatch(c) for c in colours.tolist()])
+    fast, result = timed(lambda: palette.quantize(colours, SWATCHES))
+    agreement = float((np.array(expected) == result).all(axis=1).mean())
+
+    print(f"{args.count} primitives")
+    print(f"{'task':<12} {'per item':>9} {'palette':>9} {'speedup':>8}")
+    for name, slow, quick, error in rows:
+        print(f"{name:<12} {slow * 1000:>7.0f}ms {quick * 1000:>7.1f}ms {slow / quick:>7.0f}x   max error {error:.1e}")
+    print(f"{'quantize':<12} {loop * 1000:>7.0f}ms {fast * 1000:>7.1f}ms {loop / fast:>7.0f}x   "
+          f"{agreement:.1%} same swatch (palette uses OKLab distance)")
+
+    if rows[0][3] > 1e-12 or rows[1][3] > 2 / 1023:
+        sys.exit("✗ Vectorized colours differ from the per-item code")
+    print("✓ Vectorized colours match the per-item code")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Calibrate the degenerate-render pre-filter against the gallery.
+
+Computes image metrics for every gallery render (period winners and their
+archived predecessors) and for synthetic degenerate renders: blank, black,
+almost black, single colour and several kinds of pixel noise. Prints each
+metric's range over the winners next to its PREFILTER_* threshold. Every
+winner must pass and every synthetic render must be dropped.
+
+Usage: python benchmarks/prefilter.py [image.png ...]
+"""
+import argparse
+from pathlib import Path
+import sys
+import time
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.image_metrics import image_metrics, degenerate
+from config.settings import (
+    ARTWORK_SIZE, GALLERY_DIR, PREFILTER_MIN_COVERAGE, PREFILTER_MAX_DOMINANT, PREFILTER_MIN_ENTROPY,
+    PREFILTER_MIN_HIGHLIGHT, PREFILTER_MAX_NOISE,
+)
+
+THRESHOLDS = {
+    'coverage': ('min', PREFILTER_MIN_COVERAGE),
+    'dominant': ('max', PREFILTER_MAX_DOMINANT),
+    'entropy': ('min', PREFILTER_MIN_ENTROPY),
+    'highlight': ('min', PREFILTER_MIN_HIGHLIGHT),
+    'noise': ('max', PREFILTER_MAX_NOISE),
+}
+
+
+def synthetic() -> dict[str, Image.Image]:
+    width, height = ARTWORK_SIZE
+    rng = np.random.default_rng(0)
+
+    def image(pixels):
+        return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+    dot = Image.new('RGB', ARTWORK_SIZE, (10, 10, 15))
+    ImageDraw.Draw(dot).ellipse((width / 2 - 3, height / 2 - 3, width / 2 + 3, height / 2 + 3), fill=(230, 60, 50))
+    return {
+        'blank white': Image.new('RGB', ARTWORK_SIZE, (255, 255, 255)),
+        'black': Image.new('RGB', ARTWORK_SIZE, (0, 0, 0)),
+        'single colour': Image.new('RGB', ARTWORK_SIZE, (40, 90, 160)),
+        'lone dot': dot,
+        'almost black strokes': image((rng.random((height, width, 1)) < 0.05) * np.array([6, 5, 8])),
+        'almost black gradient': image(np.linspace(0, 6, width)[None, :, None] + rng.random((height, width, 3)) * 2),
+        'uniform noise': image(rng.integers(0, 256, (height, width, 3))),
+        'grey noise': image(np.repeat(rng.integers(0, 256, (height, width, 1)), 3, axis=2)),
+        'gaussian noise': image(128 + 40 * rng.standard_normal((height, width, 3))),
+        'salt noise': image((rng.random((height, width, 1)) < 0.1) * np.array([255, 255, 255])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('images', nargs='*', type=Path)
+    args = parser.parse_args()
+    winners = args.images or sorted(GALLERY_DIR.glob('**/*.png'))
+    if not winners:
+        sys.exit("✗ No gallery renders to calibrate against")
+
+    start = time.perf_counter()
+    metrics = [image_metrics(path) for path in winners]
+    elapsed = (time.perf_counter() - start) / len(winners)
+
+    print(f"{len(winners)} gallery renders, {elapsed * 1000:.1f}ms per render")
+    print(f"{'metric':<10} {'winners':>17} {'threshold':>14}")
+    for name, (bound, threshold) in THRESHOLDS.items():
+        values = [m[name] for m in metrics]
+        print(f"{name:<10} {min(values):>8.4f}..{max(values):<7.4f} {bound:>5} {threshold:<8}")
+
+    rejected = [(path, reason) for path, m in zip(winners, metrics) if (reason := degenerate(m))]
+    for path, reason in rejected:
+        print(f"  ✗ winner {path.relative_to(GALLERY_DIR) if path.is_relative_to(GALLERY_DIR) else path}: {reason}")
+
+    missed = []
+    for name, image in synthetic().items():
+        reason = degenerate(image_metrics(image))
+        print(f"  {'⊘' if reason else '✗'} {name}: {reason or 'passed'}")
+        if reason is None:
+            missed.append(name)
+
+    if rejected or missed:
+        sys.exit(f"✗ {len(rejected)} winners rejected, {len(missed)} degenerate renders passed")
+    print("✓ Every winner passes, every degenerate render is dropped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.reaction against a per-cell Python Gray–Scott loop.
+
+Runs the same grid with both, checks they agree, and reports iterations
+per second (run it on the target device: the render timeout is what the
+iteration count has to fit in).
+
+Usage: python benchmarks/reaction_diffusion.py [--size 300 240] [--naive-iterations 5] [--iterations 500]
+"""
+import argparse
+from pathlib import Path
+import sys
+import time
+import numpy as np
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sketchlib import reaction
+
+FEED, KILL = reaction.PRESETS['coral']
+DU, DV, DT = 0.2, 0.1, 1.0
+
+
+def naive_step(u, v, rows, cols):
+    """The per-cell loop a sketch would write: lists of lists, wrapping edges"""
+    nu = [row[:] for row in u]
+    nv = [row[:] for row in v]
+    for y in range(rows):
+        up, down = (y - 1) % rows, (y + 1) % rows
+        for x in range(cols):
+            left, right = (x - 1) % cols, (x + 1) % cols
+            cu, cv = u[y][x], v[y][x]
+            lap_u = u[up][x] + u[down][x] + u[y][left] + u[y][right] - 4 * cu
+            lap_v = v[up][x] + v[down][x] + v[y][left] + v[y][right] - 4 * cv
+            uvv = cu * cv * cv
+            nu[y][x] = cu + DT * (DU * lap_u - uvv + FEED * (1 - cu))
+            nv[y][x] = cv + DT * (DV * lap_v + uvv - (FEED + KILL) * cv)
+    return nu, nv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, nargs=2, default=[300, 240], metavar=('COLS', 'ROWS'))
+    parser.add_argument('--naive-iterations', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+    cols, rows = args.size
+
+    u, v = reaction._initial(rows, cols, seed=1, spots=12, mask=None)
+    lists = u[1:-1, 1:-1].tolist(), v[1:-1, 1:-1].tolist()
+    start = time.perf_counter()
+    for _ in range(args.naive_iterations):
+        lists = naive_step(*lists, rows, cols)
+    naive = args.naive_iterations / (time.perf_counter() - start)
+
+    check_u, check_v = u.copy(), v.copy()
+    reaction._step(check_u, check_v, FEED, KILL, DU, DV, DT, args.naive_iterations)
+    error = float(np.abs(check_v[1:-1, 1:-1] - np.array(lists[1])).max())
+
+    start = time.perf_counter()
+    reaction._step(u, v, FEED, KILL, DU, DV, DT, args.iterations)
+    fast = args.iterations / (time.perf_counter() - start)
+
+    # Full call as a sketch makes it (canvas at half resolution, coarse-to-fine start)
+    start = time.perf_counter()
+    reaction.gray_scott(cols * 2, rows * 2, FEED, KILL, iterations=args.iterations, seed=1)
+    staged = args.iterations / (time.perf_counter() - start)
+
+    print(f"{cols}x{rows} grid")
+    print(f"{'per-cell loop':<24} {naive:>9.1f} it/s")
+    print(f"{'numpy stencil':<24} {fast:>9.1f} it/s  {fast / naive:>6.0f}x")
+    print(f"{'gray_scott (coarse 0.5)':<24} {staged:>9.1f} it/s  {staged / naive:>6.0f}x")
+    print(f"iterations in a 10s render: {int(naive * 10)} -> {int(staged * 10)}")
+
+    if error > 1e-4:
+        sys.exit(f"✗ Solvers disagree after {args.naive_iterations} iterations (max |Δv| = {error:.2e})")
+    print(f"✓ Solvers agree (max |Δv| = {error:.1e})")
+
+if __name__ == "__main__":
+    main()
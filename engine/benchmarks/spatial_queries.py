@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.spatial against the all-pairs loops of packing and proximity sketches.
+
+For each n: connect every pair closer than r (the "constellation" pattern),
+find each point's nearest neighbour, and pack circles with random starts.
+The naive O(n²) versions run up to --naive-limit; above it their time is
+extrapolated quadratically from the largest measured size. Results of
+measured sizes must match.
+
+Usage: python benchmarks/spatial_queries.py [--sizes 1000 5000 20000 50000] [--naive-limit 5000]
+"""
+import argparse
+import math
+from pathlib import Path
+import random
+import sys
+import time
+import numpy as np
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sketchlib import spatial
+
+WIDTH, HEIGHT = 600, 480
+
+
+def naive_pairs(points, r):
+    found = []
+    for i in range(len(points)):
+        x1, y1 = points[i]
+        for j in range(i + 1, len(points)):
+            x2, y2 = points[j]
+            if math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2) < r:
+                found.append((i, j))
+    return found
+
+
+def naive_nearest(points):
+    nearest = []
+    for i, (x1, y1) in enumerate(points):
+        best, best_d = -1, float('inf')
+        for j, (x2, y2) in enumerate(points):
+            d = (x1 - x2) ** 2 + (y1 - y2) ** 2
+            if i != j and d < best_d:
+                best, best_d = j, d
+        nearest.append(best)
+    return nearest
+
+
+def naive_pack(count, min_radius, max_radius, seed):
+    rng = random.Random(seed)
+    circles = []
+    for _ in range(count * 20):
+        if len(circles) >= count:
+            break
+        x, y = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+        r = min(max_radius, x, y, WIDTH - x, HEIGHT - y)
+        for cx, cy, cr in circles:
+            r = min(r, math.hypot(cx - x, cy - y) - cr - 1.0)
+            if r < min_radius:
+                break
+        if r >= min_radius:
+            circles.append((x, y, r))
+    return circles
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000, 50000])
+    parser.add_argument('--naive-limit', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    mismatches = []
+    measured = {}  # task -> (n, seconds) of the largest naive run
+    print(f"{'n':>6} {'task':<10} {'naive':>11} {'spatial':>9} {'speedup':>8}")
+    for n in args.sizes:
+        points = rng.random((n, 2)) * [WIDTH, HEIGHT]
+        listed = points.tolist()
+        r = math.sqrt(WIDTH * HEIGHT * 6 / (math.pi * n))  # about six neighbours each
+        max_radius = math.sqrt(WIDTH * HEIGHT / n)
+
+        def nearest_all():
+            tree = spatial.KDTree(points)
+            return [tree.knn(x, y, 2)[0][1] for x, y in listed]
+
+        tasks = {
+            'pairs': (lambda: naive_pairs(listed, r), lambda: spatial.pairs(points, r),
+                      lambda a, b: set(a) == set(map(tuple, b.tolist()))),
+            'nearest': (lambda: naive_nearest(listed), nearest_all, lambda a, b: a == b),
+            'packing': (lambda: naive_pack(n, 1.0, max_radius, 1),
+                        lambda: spatial.pack(WIDTH, HEIGHT, n, 1.0, max_radius, padding=1.0, seed=1),
+                        lambda a, b: np.allclose(np.array(a).reshape(-1, 3), b)),
+        }
+        for task, (naive_fn, fast_fn, same) in tasks.items():
+            fast, result = timed(fast_fn)
+            if n <= args.naive_limit:
+                naive, expected = timed(naive_fn)
+                measured[task] = (n, naive)
+                if not same(expected, result):
+                    mismatches.append(f"{task}@{n}")
+                label = f"{naive * 1000:.0f}ms"
+            else:
+                base_n, base = measured[task]
+                naive = base * (n / base_n) ** 2
+                label = f"~{naive:.0f}s"
+            print(f"{n:>6} {task:<10} {label:>11} {fast * 1000:>7.0f}ms {naive / fast:>7.0f}x")
+
+    if mismatches:
+        sys.exit(f"✗ Results differ from the naive loops: {', '.join(mismatches)}")
+    print("✓ Spatial queries match the naive loops")
+
+if __name__ == "__main__":
+    main()
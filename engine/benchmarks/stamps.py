@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.stamps against redrawing a motif's path for every instance.
+
+An isometric-lattice sketch draws a shaded cube (three filled faces plus an
+outline) at every lattice point, rotated a little per row. The vector loop
+rebuilds and rasterizes those paths each time; stamps rasterize one image
+per rotation bucket and composite it. A second lattice of stroked rings
+sets no colour or width of its own, so stamps must pick up the caller's
+source, line width and cap. Both cases are compared pixel by pixel and must
+stay within --tolerance (mean absolute difference, 0-255). The cube lattice
+is also timed on a recording surface (RECORD_RENDERS), where stamps draw
+vectors so the recording still replays at any scale.
+
+Usage: python benchmarks/stamps.py [--size 600 480] [--cube 14] [--tolerance 2]
+"""
+import argparse
+import math
+from pathlib import Path
+import sys
+import time
+import cairo
+import numpy as np
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.recording import OpRecorder
+from sketchlib import stamps
+
+
+def cube_drawer(size: float):
+    """Isometric cube around (0, 0): three shaded faces, then the outline"""
+    h = size * math.sqrt(3) / 2
+    top = [(0, -size), (h, -size / 2), (0, 0), (-h, -size / 2)]
+    left = [(-h, -size / 2), (0, 0), (0, size), (-h, size / 2)]
+    right = [(h, -size / 2), (h, size / 2), (0, size), (0, 0)]
+
+    def draw(ctx):
+        for face, shade in ((top, 0.9), (left, 0.55), (right, 0.3)):
+            ctx.move_to(*face[0])
+            for x, y in face[1:]:
+                ctx.line_to(x, y)
+            ctx.close_path()
+            ctx.set_source_rgb(shade, shade * 0.9, shade * 0.8)
+            ctx.fill()
+        ctx.set_source_rgb(0.05, 0.05, 0.1)
+        ctx.set_line_width(0.8)
+        for face in (top, left, right):
+            ctx.move_to(*face[0])
+            for x, y in face[1:]:
+                ctx.line_to(x, y)
+            ctx.close_path()
+        ctx.stroke()
+    return draw
+
+
+def ring(ctx):
+    """Open ring stroked with whatever source, width and cap the caller set"""
+    ctx.arc(0, 0, 8, 0.3, 2 * math.pi - 0.3)
+    ctx.stroke()
+
+
+def lattice(width, height, cube):
+    h = cube * math.sqrt(3)
+    points, rotations = [], []
+    for row, y in enumerate(np.arange(0, height + cube, cube * 1.5)):
+        for x in np.arange((row % 2) * h / 2, width + h, h):
+            points.append((x, y))
+            rotations.append(0.02 * row)
+    return np.array(points), np.array(rotations)
+
+
+def render(width, height, draw_all):
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    ctx = cairo.Context(surface)
+    ctx.set_source_rgb(1, 1, 1)
+    ctx.paint()
+    start = time.perf_counter()
+    draw_all(ctx)
+    elapsed = time.perf_counter() - start
+    surface.flush()
+    pixels = np.frombuffer(surface.get_data(), dtype=np.uint8).reshape(height, surface.get_stride())[:, :width * 4]
+    return elapsed, pixels.astype(np.int16)
+
+
+def recorded(width, height, draw_all):
+    surface = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, cairo.Rectangle(0, 0, width, height))
+    ctx = OpRecorder().wrap(cairo.Context(surface))
+    start = time.perf_counter()
+    draw_all(ctx)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, nargs=2, default=[600, 480])
+    parser.add_argument('--cube', type=float, default=14)
+    parser.add_argument('--tolerance', type=float, default=2.0)
+    args = parser.parse_args()
+    width, height = args.size
+    draw = cube_drawer(args.cube)
+    points, rotations = lattice(width, height, args.cube)
+
+    def vector(ctx):
+        for (x, y), rotation in zip(points.tolist(), rotations.tolist()):
+            ctx.save()
+            ctx.translate(x, y)
+            ctx.rotate(rotation)
+            draw(ctx)
+            ctx.restore()
+
+    motif = stamps.Motif(draw, radius=args.cube + 1)
+    naive, expected = render(width, height, vector)
+    cold, _ = render(width, height, lambda ctx: stamps.stamp_many(ctx, motif, points, rotations=rotations))
+    images = len(stamps._cache)
+    warm, result = render(width, height, lambda ctx: stamps.stamp_many(ctx, motif, points, rotations=rotations))
+    difference = float(np.abs(expected - result).mean())
+    recorded_vector = recorded(width, height, vector)
+    recorded_stamps = recorded(width, height, lambda ctx: stamps.stamp_many(ctx, motif, points, rotations=rotations))
+
+    def styled(draw_all):
+        def setup(ctx):
+            ctx.set_source_rgba(0.8, 0.2, 0.3, 0.9)
+            ctx.set_line_width(3)
+            ctx.set_line_cap(cairo.LINE_CAP_ROUND)
+            draw_all(ctx)
+        return setup
+
+    def rings_vector(ctx):
+        for (x, y), rotation in zip(points.tolist(), rotations.tolist()):
+            ctx.save()
+            ctx.translate(x, y)
+            ctx.rotate(rotation * 20)
+            ring(ctx)
+            ctx.restore()
+
+    ring_motif = stamps.Motif(ring, radius=10)
+    _, ring_expected = render(width, height, styled(rings_vector))
+    _, ring_result = render(width, height, styled(
+        lambda ctx: stamps.stamp_many(ctx, ring_motif, points, rotations=rotations * 20)))
+    ring_difference = float(np.abs(ring_expected - ring_result).mean())
+
+    print(f"{len(points)} cubes on {width}x{height}")
+    print(f"{'vector per cube':<20} {naive * 1000:>8.1f}ms")
+    print(f"{'stamps (cold)':<20} {cold * 1000:>8.1f}ms  {images} cached images  {naive / cold:.1f}x")
+    print(f"{'stamps (warm)':<20} {warm * 1000:>8.1f}ms  {naive / warm:.1f}x")
+    print(f"{'recorded, vector':<20} {recorded_vector * 1000:>8.1f}ms")
+    print(f"{'recorded, stamps':<20} {recorded_stamps * 1000:>8.1f}ms  (vector fallback)")
+    print(f"mean pixel difference: cubes {difference:.2f}, rings with inherited style {ring_difference:.2f}")
+
+    if max(difference, ring_difference) > args.tolerance:
+        sys.exit(f"✗ Stamped render differs from vector drawing by {max(difference, ring_difference):.2f}")
+    print("✓ Stamped render matches vector drawing")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.geometry against the Voronoi construction found in gallery sketches.
+
+The gallery builds each cell by clipping the canvas against the bisector
+with every other site (O(n²) clips). Compares that with geometry.voronoi
+and geometry.delaunay at growing site counts, and checks that both produce
+the same cell areas.
+
+Usage: python benchmarks/tessellation.py [--sites 50 200 1000 5000] [--naive-limit 1000]
+"""
+import argparse
+from pathlib import Path
+import sys
+import time
+import numpy as np
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sketchlib import geometry
+
+WIDTH, HEIGHT = 600, 480
+
+
+def clip_poly(poly, p1, p2):
+    """As in the gallery: keep the side of the p1/p2 bisector nearer p1"""
+    new_poly = []
+    mx, my = (p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2
+    nx, ny = p2[0] - p1[0], p2[1] - p1[1]
+    for i in range(len(poly)):
+        curr, prev = poly[i], poly[i - 1]
+        curr_in = (curr[0] - mx) * nx + (curr[1] - my) * ny < 0
+        prev_in = (prev[0] - mx) * nx + (prev[1] - my) * ny < 0
+        if curr_in != prev_in:
+            t = ((mx - prev[0]) * nx + (my - prev[1]) * ny) / ((curr[0] - prev[0]) * nx + (curr[1] - prev[1]) * ny)
+            new_poly.append((prev[0] + t * (curr[0] - prev[0]), prev[1] + t * (curr[1] - prev[1])))
+        if curr_in:
+            new_poly.append(curr)
+    return new_poly
+
+
+def naive_voronoi(points):
+    cells = []
+    for i, p in enumerate(points):
+        cell = [(0, 0), (WIDTH, 0), (WIDTH, HEIGHT), (0, HEIGHT)]
+        for j, other in enumerate(points):
+            if i != j and cell:
+                cell = clip_poly(cell, p, other)
+        cells.append(cell)
+    return cells
+
+
+def area(cell) -> float:
+    cell = np.asarray(cell, dtype=np.float64).reshape(-1, 2)
+    x, y = cell[:, 0], cell[:, 1]
+    return float(abs((x * np.roll(y, -1) - np.roll(x, -1) * y).sum()) / 2)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sites', type=int, nargs='+', default=[50, 200, 1000, 5000])
+    parser.add_argument('--naive-limit', type=int, default=1000, help='skip the O(n²) version above this')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    bounds = (0, 0, WIDTH, HEIGHT)
+    mismatches = []
+    print(f"{'sites':>6} {'gallery':>10} {'voronoi':>9} {'delaunay':>9} {'relax x2':>9} {'speedup':>8}")
+    for n in args.sites:
+        points = rng.random((n, 2)) * [WIDTH, HEIGHT]
+        fast, (vertices, offsets) = timed(lambda: geometry.voronoi(points, bounds))
+        tri, _ = timed(lambda: geometry.delaunay(points))
+        relax, _ = timed(lambda: geometry.relax(points, bounds, iterations=2))
+        naive = None
+        if n <= args.naive_limit:
+            naive, cells = timed(lambda: naive_voronoi(points.tolist()))
+            expected = np.array([area(c) for c in cells])
+            actual = np.array([area(c) for c in geometry.split(vertices, offsets)])
+            if not np.allclose(actual, expected, rtol=1e-6, atol=1e-6):
+                mismatches.append(n)
+        print(f"{n:>6} {(f'{naive * 1000:.0f}ms' if naive else '-'):>10} {fast * 1000:>7.0f}ms "
+              f"{tri * 1000:>7.0f}ms {relax * 1000:>7.0f}ms {(f'{naive / fast:.0f}x' if naive else '-'):>8}")
+
+    if mismatches:
+        sys.exit(f"✗ Cell areas differ from the gallery construction at {mismatches} sites")
+    print("✓ Voronoi cells match the gallery construction")
+
+if __name__ == "__main__":
+    main()
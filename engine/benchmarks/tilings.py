@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark sketchlib.tiling against recursive per-triangle Penrose and per-tile Truchet drawing.
+
+The recursive version deflates Robinson triangles as Python tuples over the
+whole starting sun (nothing is culled) and fills each rhomb half on its own;
+the tiling version deflates with NumPy, drops triangles outside the canvas
+after every level and fills once per colour. Both must keep the same
+triangles on the canvas. Truchet: one arc + stroke per quarter circle against
+tiling.truchet with a single stroke.
+
+Usage: python benchmarks/tilings.py [--size 600 480] [--depth 8] [--cell 12]
+"""
+import argparse
+import math
+from pathlib import Path
+import random
+import sys
+import time
+import cairo
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sketchlib import tiling
+
+COLOURS = [(0.9, 0.5, 0.2), (0.1, 0.3, 0.5)]
+
+
+def recursive_penrose(ctx, width, height, depth):
+    radius = math.hypot(width / 2, height / 2) / math.cos(math.pi / 10)
+    centre = complex(width / 2, height / 2)
+    triangles = []
+    for i in range(10):
+        b = centre + radius * complex(math.cos((2 * i - 1) * math.pi / 10), math.sin((2 * i - 1) * math.pi / 10))
+        c = centre + radius * complex(math.cos((2 * i + 1) * math.pi / 10), math.sin((2 * i + 1) * math.pi / 10))
+        triangles.append((0, centre, c, b) if i % 2 == 0 else (0, centre, b, c))
+
+    def subdivide(triangle, level):
+        if level == 0:
+            return [triangle]
+        kind, a, b, c = triangle
+        if kind == 0:
+            p = a + (b - a) / tiling.PHI
+            children = [(0, c, p, b), (1, p, c, a)]
+        else:
+            q = b + (a - b) / tiling.PHI
+            r = b + (c - b) / tiling.PHI
+            children = [(1, r, c, a), (1, q, r, b), (0, r, q, a)]
+        return [t for child in children for t in subdivide(child, level - 1)]
+
+    triangles = [t for triangle in triangles for t in subdivide(triangle, depth)]
+    for kind, a, b, c in triangles:
+        ctx.set_source_rgb(*COLOURS[kind])
+        ctx.move_to(a.real, a.imag)
+        ctx.line_to(b.real, b.imag)
+        ctx.line_to(c.real, c.imag)
+        ctx.close_path()
+        ctx.fill()
+    return [t for t in triangles
+            if max(p.real for p in t[1:]) >= 0 and min(p.real for p in t[1:]) <= width
+            and max(p.imag for p in t[1:]) >= 0 and min(p.imag for p in t[1:]) <= height]
+
+
+def per_tile_truchet(ctx, width, height, cell):
+    rng = random.Random(1)
+    r = cell / 2
+    for y in range(0, height, cell):
+        for x in range(0, width, cell):
+            if rng.randint(0, 1) == 0:
+                ctx.arc(x, y, r, 0, math.pi / 2)
+                ctx.stroke()
+                ctx.arc(x + cell, y + cell, r, math.pi, 3 * math.pi / 2)
+                ctx.stroke()
+            else:
+                ctx.arc(x + cell, y, r, math.pi / 2, math.pi)
+                ctx.stroke()
+                ctx.arc(x, y + cell, r, 3 * math.pi / 2, 2 * math.pi)
+                ctx.stroke()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, nargs=2, default=[600, 480])
+    parser.add_argument('--depth', type=int, default=8)
+    parser.add_argument('--cell', type=int, default=12)
+    args = parser.parse_args()
+    width, height = args.size
+
+    def context():
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        ctx = cairo.Context(surface)
+        ctx.set_line_width(1)
+        return ctx
+
+    naive, kept = timed(lambda: recursive_penrose(context(), width, height, args.depth))
+
+    def batched():
+        vertices, offsets, kinds = tiling.penrose(width, height, depth=args.depth)
+        tiling.fill(context(), vertices, offsets, kinds, COLOURS)
+    fast, _ = timed(batched)
+    # Same canvas one level deeper: only the new level is deflated
+    deeper, _ = timed(lambda: tiling.penrose(width, height, depth=args.depth + 1))
+    halves = len(tiling._halves('P3', args.depth, width, height, None, None)[0])
+    tiles = len(tiling.penrose(width, height, depth=args.depth)[2])
+
+    truchet_naive, _ = timed(lambda: per_tile_truchet(context(), width, height, args.cell))
+
+    def batched_truchet():
+        ctx = context()
+        points, offsets, kinds = tiling.truchet(width, height, args.cell, style='arcs', seed=1)
+        tiling.draw(ctx, points, offsets)
+        ctx.stroke()
+    truchet_fast, _ = timed(batched_truchet)
+
+    print(f"{width}x{height} canvas, Penrose P3 depth {args.depth}, Truchet cell {args.cell}")
+    print(f"{'recursive penrose':<22} {naive * 1000:>8.0f}ms  {len(kept)} triangles on the canvas")
+    print(f"{'tiling.penrose + fill':<22} {fast * 1000:>8.0f}ms  {halves} triangles -> {tiles} tiles  {naive / fast:.0f}x")
+    print(f"{'  depth + 1, cached':<22} {deeper * 1000:>8.0f}ms")
+    print(f"{'per-tile truchet':<22} {truchet_naive * 1000:>8.0f}ms")
+    print(f"{'tiling.truchet + draw':<22} {truchet_fast * 1000:>8.0f}ms  {truchet_naive / truchet_fast:.1f}x")
+
+    if halves != len(kept):
+        sys.exit("✗ Culled deflation keeps a different set of triangles")
+    print("✓ Same triangles on the canvas, culled and batched")
+
+if __name__ == "__main__":
+    main()
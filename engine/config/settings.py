@@ -17,15 +17,97 @@ OUTPUT_DIR = ENGINE_ROOT / 'output'
 GALLERY_DIR = PROJECT_ROOT / 'gallery' / 'public' / 'gallery'
 TEMP_DIR = Path('/tmp/generative_studio')
 TEMP_DIR.mkdir(exist_ok=True)
+STATE_DIR = ENGINE_ROOT / 'state'  # Local, machine-specific state (not published)
+STATE_DIR.mkdir(exist_ok=True)
 
 # Display settings
 DISPLAY_WIDTH = 800
 DISPLAY_HEIGHT = 480
 ARTWORK_SIZE = (600, 480)  # Generated artwork size to fit 800x480 display with info panel
+FRAMEBUFFER_PATH = Path(os.getenv('FRAMEBUFFER_PATH', '/dev/fb0'))
+
+# Living artwork mode (animated winner on the TFT)
+LIVE_FPS = 10
+LIVE_MODE = 'drift'  # 'drift' modulates the sketch's constants, 'seed' reseeds every frame
+LIVE_DRIFT_AMPLITUDE = 0.15  # max relative change of each constant
+LIVE_DRIFT_PERIOD = 20.0  # seconds per drift cycle
+LIVE_FRAME_TIMEOUT = 2  # seconds; slower sketches fall back to the static image
+LIVE_RELOAD_INTERVAL = 300  # seconds between checks for a new winner
 
 # Generation settings
 SKETCHES_PER_PERIOD = 8
-GENERATION_TIMEOUT = 10  # seconds per sketch
+GENERATION_TIMEOUT = 10  # seconds per sketch (fallback until a theme has history)
+RECORD_RENDERS = False  # keep a replayable op log (.rec.gz) next to each render; slows drawing and disables stamps
+OPTIMIZE_SKETCHES = True  # AST speedups before exec (validate with benchmarks/optimizer_corpus.py)
+SEED_VARIANTS = 3  # renders per generated sketch, each under its own random seed
+SEED_KEEP = 1  # best variants per sketch passed on to the curator
+
+# Parameter mutation of past winners (no LLM calls)
+MUTATION_FILL = True  # top up a period with mutated winners when generation falls short
+MUTATION_WINNERS = 8  # most recent gallery sketches used as parents
+MUTATION_MAX_KNOBS = 3  # constants changed per mutation
+MUTATION_COST_RATIO = 2.0  # max static work of a mutation relative to its parent
+
+# Degenerate-render pre-filter (agents.image_metrics.degenerate, calibrated with benchmarks/prefilter.py)
+PREFILTER_ENABLED = True
+PREFILTER_MIN_COVERAGE = 0.0002  # share of non-background pixels; faintest winner 0.0004
+PREFILTER_MAX_DOMINANT = 0.99  # share of the background colour; winners reach 0.977
+PREFILTER_MIN_ENTROPY = 0.05  # winners start at 0.086
+PREFILTER_MIN_HIGHLIGHT = 0.03  # brightest marks (0..1 luminance); darkest winner 0.065
+PREFILTER_MAX_NOISE = 0.45  # spectral flatness; winners stay under 0.40, white noise is ~0.53
+
+# Near-duplicate detection (agents.gallery_index, calibrated with benchmarks/gallery_index.py)
+DEDUPE_ENABLED = True
+DEDUPE_RADIUS = 8  # max Hamming distance between 64-bit pHashes of "the same" image; distinct winners are 10+ apart
+DEDUPE_RECENT_DAYS = 14  # candidates repeating a winner from this many days back are dropped
+GALLERY_HASHES_PATH = STATE_DIR / 'gallery_hashes.json'
+
+# Curator payload (images sent for evaluation)
+CURATOR_MAX_EDGE = 512  # long edge in pixels; None sends renders at full size
+CURATOR_IMAGE_FORMAT = 'WEBP'  # 'WEBP' or 'JPEG' (WEBP falls back to JPEG without libwebp); None sends the PNG as is
+CURATOR_IMAGE_QUALITY = 80
+CURATOR_ENCODE_WORKERS = 4  # threads; Pillow releases the GIL while resizing and encoding
+
+# Render scheduling
+RENDER_WORKERS = 4  # parallel render processes (one per Pi core)
+RENDER_HISTORY_PATH = STATE_DIR / 'render_history.json'
+RENDER_HISTORY_SAMPLES = 50  # runtimes kept per theme
+TIMEOUT_MIN_SAMPLES = 5  # theme runs needed before calibrating its timeout
+TIMEOUT_MARGIN = 1.5  # multiplier applied to a theme's p95 runtime
+TIMEOUT_BOUNDS = (3, 30)  # calibrated timeouts are clamped to this range (seconds)
+COST_TABLE_PATH = Path(os.getenv('COST_TABLE_PATH', STATE_DIR / 'cost_table.json'))  # from benchmarks/calibrate_costs.py
+
+# Thermal / memory pressure governor (paths overridable for testing off-device)
+THERMAL_ZONE_PATH = Path(os.getenv('THERMAL_ZONE_PATH', '/sys/class/thermal/thermal_zone0/temp'))
+MEMINFO_PATH = Path(os.getenv('MEMINFO_PATH', '/proc/meminfo'))
+PSI_MEMORY_PATH = Path(os.getenv('PSI_MEMORY_PATH', '/proc/pressure/memory'))
+THERMAL_SOFT_LIMIT = 70.0  # °C, below this the pool may grow again
+THERMAL_HARD_LIMIT = 80.0  # °C, Pi firmware starts throttling here
+MEMORY_MIN_AVAILABLE_MB = 150
+PSI_MEMORY_LIMIT = 10.0  # 'some avg10' stall percentage
+GOVERNOR_INTERVAL = 2.0  # seconds between concurrency adjustments
+THROTTLE_TIMEOUT_STRETCH = 1.5  # timeout multiplier while throttled
+
+# Print (hi-res tiled) rendering
+PRINT_WIDTH = 7680  # default long edge for poster renders
+PRINT_TILE_SIZE = 1024  # tile edge in pixels; bounds memory per worker
+PRINT_TILE_TIMEOUT = 60  # seconds per tile (each tile re-runs the whole sketch)
+
+# Render farm (distributed rendering across Pis)
+FARM_ENABLED = os.getenv('FARM_ENABLED') == '1'
+FARM_HOST = os.getenv('FARM_HOST', '127.0.0.1')  # 0.0.0.0 serves other Pis, and then needs FARM_TOKEN
+FARM_PORT = int(os.getenv('FARM_PORT', '8765'))
+FARM_URL = os.getenv('FARM_URL', f'http://localhost:{FARM_PORT}')  # where workers find the job server
+FARM_TOKEN = os.getenv('FARM_TOKEN')  # shared secret between server and workers
+FARM_DB_PATH = STATE_DIR / 'render_farm.sqlite'
+FARM_MAX_ATTEMPTS = 3  # leases per job before it's marked failed
+FARM_LEASE_GRACE = 15  # seconds added to a job's timeout before its lease expires
+FARM_WORKER_TTL = 30  # seconds since last contact for a worker to count as available
+FARM_DISCOVERY_WAIT = 5  # seconds to let idle workers check in before sizing the batch
+FARM_POLL_INTERVAL = 1.0
+FARM_SKETCHES_PER_WORKER = 2  # extra candidates per remote worker process
+FARM_MAX_SKETCHES = 32
+FARM_BATCH_DEADLINE = 900  # seconds before unfinished jobs are abandoned
 
 # Schedule (4 periods per day)
 PERIODS = [
@@ -9,11 +9,19 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from agents.generator import GeneratorAgent
 from agents.curator import CuratorAgent
-from agents.executor import SafeExecutor
+from agents.scheduler import RenderScheduler
+from agents.render_farm import RenderFarm
+from agents.seed_sweep import SeedSweep
+from agents.mutator import MutationSearch
 from agents.display_manager import DisplayManager
+from agents.image_metrics import image_metrics, degenerate
+from agents.gallery_index import GalleryIndex, collapse
 from agents.status_publisher import StatusPublisher
 from upload import GalleryUploader
-from config.settings import OUTPUT_DIR, SKETCHES_PER_PERIOD, VERCEL_BLOB_TOKEN
+from config.settings import (
+    OUTPUT_DIR, SKETCHES_PER_PERIOD, VERCEL_BLOB_TOKEN, FARM_ENABLED, SEED_VARIANTS, MUTATION_FILL, PREFILTER_ENABLED,
+    DEDUPE_ENABLED,
+)
 
 async def run_period():
     """Execute one generation period"""
@@ -32,41 +40,99 @@ async def run_period():
     print(f"🎨 Starting Period {period_num} - {timestamp.strftime('%Y-%m-%d %H:%M')}")
     print(f"{ '='*60}\n")
     
+    # Render farm: more available workers means more candidates this period
+    farm = None
+    sketch_count = SKETCHES_PER_PERIOD
+    if FARM_ENABLED:
+        try:
+            farm = await RenderFarm().start()
+            sketch_count = farm.candidate_count()
+            print(f"Render farm: {len(farm.remote_workers())} remote workers available\n")
+        except (ValueError, OSError) as e:
+            print(f"✗ Render farm unavailable, rendering locally: {e}\n")
+
     # 1. Generate sketches
-    await status.update('Generator', 'Generating sketches', f'0/{SKETCHES_PER_PERIOD}')
-    print(f"Generating {SKETCHES_PER_PERIOD} sketches...")
+    await status.update('Generator', 'Generating sketches', f'0/{sketch_count}')
+    print(f"Generating {sketch_count} sketches...")
     generator = GeneratorAgent()
-    sketches = await generator.generate_batch(SKETCHES_PER_PERIOD)
+    sketches = await generator.generate_batch(sketch_count)
     print(f"✓ Generated {len(sketches)} sketches\n")
+
+    # Short of sketches (e.g. API quota): top up with mutations of recent winners
+    if MUTATION_FILL and len(sketches) < sketch_count:
+        mutants = MutationSearch().fill(sketch_count - len(sketches))
+        sketches.extend(mutants)
+        print(f"✓ Added {len(mutants)} mutated winners\n")
     
     # 2. Execute and render
     await status.update('Executor', 'Rendering sketches', f'0/{len(sketches)}')
-    print("Rendering sketches...")
-    executor = SafeExecutor()
+    print(f"Rendering sketches ({SEED_VARIANTS} seeds each)..." if SEED_VARIANTS > 1 else "Rendering sketches...")
+    scheduler = farm.scheduler() if farm else RenderScheduler()
+    if SEED_VARIANTS > 1:
+        scheduler = SeedSweep(scheduler)
     rendered = []
-    
-    for idx, sketch in enumerate(sketches):
-        await status.update('Executor', 'Rendering sketches', f'{idx+1}/{len(sketches)}')
-        output_path = output_dir / f"{sketch['id']}.png"
-        success, msg = executor.execute(sketch['code'], output_path)
-        
-        if success:
-            print(f"  ✓ {sketch['id']}")
+
+    async def report_progress(done, total):
+        await status.update('Executor', 'Rendering sketches', f'{done}/{total}')
+
+    try:
+        results = await scheduler.render(
+            sketches, output_dir,
+            on_progress=report_progress,
+            label=f"{timestamp.date()} period_{period_num}"
+        )
+    finally:
+        if farm:
+            farm.stop()
+
+    for result in results:
+        sketch = result['sketch']
+        if result['success']:
+            throttled = ', throttled' if result['throttled'] else ''
+            variant = f", variant score {result['variant_score']:.2f}" if 'variant_score' in result else ''
+            print(f"  ✓ {sketch['id']} ({result['seconds']:.1f}s, predicted {result['predicted']:.1f}s{throttled}{variant})")
             rendered.append({
                 **sketch,
-                'image': output_path
+                'image': result['image'],
+                'recording': result['recording'],
+                'metrics': result.get('metrics')
             })
             
             # Save source code
             (output_dir / f"{sketch['id']}.py").write_text(sketch['code'])
         else:
-            print(f"  ✗ {sketch['id']}: {msg}")
+            print(f"  ✗ {sketch['id']}: {result['msg']}")
     
-    print(f"\n✓ Successfully rendered {len(rendered)}/{len(sketches)} sketches\n")
+    print(f"\n✓ Successfully rendered {len(rendered)}/{len(results)} candidates from {len(sketches)} sketches\n")
+
+    # Drop blank, flat, almost black and noise-only renders before they cost curator tokens
+    if PREFILTER_ENABLED and rendered:
+        usable = []
+        for candidate in rendered:
+            reason = degenerate(candidate['metrics'] or image_metrics(candidate['image']))
+            if reason:
+                print(f"  ⊘ {candidate['id']}: dropped, {reason}")
+            else:
+                usable.append(candidate)
+        if len(usable) < len(rendered):
+            print(f"✓ {len(usable)}/{len(rendered)} candidates passed the pre-filter\n")
+        rendered = usable
+
+    # Collapse near-identical candidates and repeats of recent gallery winners
+    if DEDUPE_ENABLED and rendered:
+        rendered, duplicates = collapse(rendered, GalleryIndex())
+        for candidate, reason in duplicates:
+            print(f"  ≈ {candidate['id']}: dropped, {reason}")
+        if duplicates:
+            print(f"✓ {len(rendered)} distinct candidates\n")
+
+    mutant_count = sum('mutations' in sketch for sketch in sketches)
+    if mutant_count:
+        print(f"Mutation fill: {sum('mutations' in c for c in rendered)}/{mutant_count} mutants reach the curator\n")
     
     if not rendered:
         await status.update('Idle', 'No sketches rendered', 'Waiting for next cycle')
-        print("❌ No sketches rendered successfully. Exiting.")
+        print("❌ No usable sketches rendered. Exiting.")
         return
     
     # 3. Curate best
@@ -74,6 +140,10 @@ async def run_period():
     print("Evaluating with Claude Sonnet...")
     curator = CuratorAgent()
     best = await curator.select_best(rendered)
+    stats = curator.last_stats
+    print(f"  Sent {stats['images']} images: {stats['payload_bytes'] / 1024:.0f}KB "
+          f"(PNG {stats['original_bytes'] / 1024:.0f}KB), encoded in {stats['encode_seconds']:.2f}s, "
+          f"curator responded in {stats['request_seconds']:.1f}s")
     print(f"\n✨ Selected: {best['id']}")
     print(f"   Theme: {best['theme']}")
     print(f"   Score: {best.get('score', 'N/A')}/10\n")
@@ -100,10 +170,12 @@ async def run_period():
     msg = await uploader.post(
         image=best['image'],
         code=best['code'],
+        recording=best.get('recording'),
         metadata={
             'date': str(timestamp.date()),
             'period': period_num,
             'theme': best['theme'],
+            'seed': best.get('seed'),
             'score': best.get('score'),
             'reasoning': best.get('reasoning')
         }
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Render farm worker: run on any Pi to render sketches for the orchestrator.
+
+The orchestrator must listen beyond loopback (FARM_HOST=0.0.0.0) with a
+FARM_TOKEN, and workers need the same token.
+
+Usage: python farm_worker.py [--server http://gallery-pi:8765] [--processes 4]
+"""
+import argparse
+from multiprocessing import Process
+from pathlib import Path
+import sys
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.render_farm import run_worker
+from config.settings import FARM_URL, RENDER_WORKERS
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--server', default=FARM_URL)
+    parser.add_argument('--processes', type=int, default=RENDER_WORKERS)
+    args = parser.parse_args()
+
+    print(f"Starting {args.processes} render workers for {args.server}")
+    workers = [Process(target=run_worker, args=(args.server,)) for _ in range(args.processes)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Animate the latest gallery winner on the TFT ("living artwork" mode).
+
+Runs in place of the static art-display service and writes directly to the
+framebuffer. Falls back to the static image when a sketch is too slow to
+animate.
+"""
+from pathlib import Path
+import json
+import sys
+import time
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PIL import Image
+from agents.display_manager import DisplayManager
+from agents.live_display import Framebuffer, LiveArtwork
+from config.settings import ARTWORK_SIZE, GALLERY_DIR, LIVE_RELOAD_INTERVAL
+
+def latest_winner() -> Path:
+    """Metadata file of the most recent gallery selection"""
+    winners = sorted(GALLERY_DIR.glob('*/period_*.json'), key=lambda p: (p.parent.name, p.stem))
+    return winners[-1] if winners else None
+
+def main():
+    framebuffer = Framebuffer()
+    display = DisplayManager()
+
+    while True:
+        meta_path = latest_winner()
+        if meta_path is None:
+            sys.exit("✗ No gallery artwork found")
+        metadata = json.loads(meta_path.read_text())
+        code = meta_path.with_suffix('.py').read_text()
+
+        # Info panel is drawn once; frames only touch the artwork area
+        panel = display.compose(None, metadata['theme'], f"Period {metadata['period']}", {
+            'score': metadata.get('score'),
+            'reasoning': metadata.get('reasoning')
+        })
+        framebuffer.blit_image(panel)
+
+        try:
+            live = LiveArtwork(code, framebuffer, seed=metadata.get('seed'))
+            stats = live.run(duration=LIVE_RELOAD_INTERVAL)
+            print(f"✓ {meta_path.parent.name} {meta_path.stem}: {stats['fps']:.1f} fps, "
+                  f"render p50 {stats['render_ms_p50']:.0f}ms")
+        except Exception as e:
+            print(f"✗ Can't animate {meta_path.stem}, showing static image: {e}")
+            framebuffer.blit_image(Image.open(meta_path.with_suffix('.png')).resize(ARTWORK_SIZE))
+            time.sleep(LIVE_RELOAD_INTERVAL)
+
+if __name__ == "__main__":
+    main()
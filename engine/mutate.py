@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Render mutated variants of recent gallery winners and rank them locally (no LLM calls).
+
+Usage: python mutate.py [--winners 4] [--variants 6] [--top 5] [--seed N] [--list]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from pathlib import Path
+import sys
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.mutator import MutationSearch, gallery_winners, tunable_constants
+from config.settings import OUTPUT_DIR
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--winners', type=int, default=4, help='most recent gallery sketches to mutate')
+    parser.add_argument('--variants', type=int, default=6, help='mutations rendered per winner')
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--list', action='store_true', help='only show each winner\'s tunable constants')
+    args = parser.parse_args()
+
+    winners = gallery_winners(args.winners)
+    if args.list:
+        for winner in winners:
+            print(f"{winner['id']}: {winner['theme']}")
+            for knob in tunable_constants(winner['code']):
+                print(f"  L{knob['line']:<4} {knob['name']:<36} {knob['value']!r:>8}  [{knob['low']:.4g}, {knob['high']:.4g}]")
+        return
+
+    output_dir = OUTPUT_DIR / 'mutations' / datetime.now().strftime('%Y-%m-%d_%H%M')
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ranked = await MutationSearch(seed=args.seed).search(winners, args.variants, output_dir)
+
+    print(f"\n✓ {len(ranked)} variants rendered to {output_dir}")
+    for result in ranked[:args.top]:
+        sketch = result['sketch']
+        (output_dir / f"{sketch['id']}.py").write_text(sketch['code'])
+        changes = ', '.join(f"{name} {old}→{new}" for name, pairs in sketch['mutations'].items() for old, new in pairs)
+        print(f"  {result['variant_score']:.2f}  {sketch['id']}  ({changes})")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Render a gallery sketch at poster resolution.
+
+Usage: python render_print.py <sketch.py> [output.png] [--width 7680] [--seed N]
+
+The seed defaults to the one in the sketch's gallery metadata (<sketch>.json).
+"""
+import argparse
+from pathlib import Path
+import json
+import sys
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.print_renderer import TiledRenderer
+from config.settings import PRINT_WIDTH, PRINT_TILE_SIZE
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sketch', type=Path)
+    parser.add_argument('output', type=Path, nargs='?')
+    parser.add_argument('--width', type=int, default=PRINT_WIDTH, help='long edge in pixels')
+    parser.add_argument('--tile', type=int, default=PRINT_TILE_SIZE, help='tile edge in pixels')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    seed = args.seed
+    metadata = args.sketch.with_suffix('.json')
+    if seed is None and metadata.exists():
+        seed = json.loads(metadata.read_text()).get('seed')
+
+    output = args.output or args.sketch.with_name(f"{args.sketch.stem}_print.png")
+    w, h = TiledRenderer(tile_size=args.tile).render(args.sketch.read_text(), output, args.width, seed)
+    print(f"✓ Saved {w}x{h} render to {output}")
+
+if __name__ == "__main__":
+    main()
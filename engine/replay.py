@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Re-output a recorded render at another size or as vector art, without re-running the sketch.
+
+Renders are only recorded with RECORD_RENDERS = True in config/settings.py.
+
+Usage: python replay.py <period_N.rec.gz> <output.png|.svg|.pdf> [--scale 1.0]
+"""
+import argparse
+from pathlib import Path
+import sys
+
+# Add engine directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.recording import Recording
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('recording', type=Path)
+    parser.add_argument('output', type=Path)
+    parser.add_argument('--scale', type=float, default=1.0)
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording)
+    writers = {'.png': recording.to_png, '.svg': recording.to_svg, '.pdf': recording.to_pdf}
+    if args.output.suffix not in writers:
+        sys.exit(f"✗ Unsupported output format: {args.output.suffix}")
+    writers[args.output.suffix](args.output, args.scale)
+    print(f"✓ Replayed {len(recording.ops)} ops to {args.output}")
+
+if __name__ == "__main__":
+    main()
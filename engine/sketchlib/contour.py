@@ -0,0 +1,150 @@
+"""Contour lines for sketches: scalar fields on a grid and vectorized marching squares.
+
+Exposed to generated code as `contour` (see SafeExecutor.allowed_imports).
+Cells are classified and edge crossings interpolated for every level with
+whole-array operations; segments are then joined into polylines, returned
+flat like geometry.voronoi so a level set is one batched draw:
+
+    values = contour.evaluate(lambda x, y: np.sin(x * 0.02) * np.cos(y * 0.03), width, height, step=2)
+    points, offsets, level = contour.lines(values, np.linspace(-0.8, 0.8, 9), step=2)
+    contour.draw(ctx, points, offsets); ctx.stroke()
+"""
+import numpy as np
+from sketchlib.flow import draw  # noqa: F401  (same polyline layout)
+
+# Edges of a cell: 0 top (tl-tr), 1 right (tr-br), 2 bottom (bl-br), 3 left (tl-bl).
+# Case bits: tl=8, tr=4, br=2, bl=1 (set when the corner is above the level).
+SEGMENTS = {
+    1: [(3, 2)], 2: [(2, 1)], 3: [(3, 1)], 4: [(0, 1)], 6: [(0, 2)], 7: [(3, 0)],
+    8: [(3, 0)], 9: [(0, 2)], 11: [(0, 1)], 12: [(3, 1)], 13: [(2, 1)], 14: [(3, 2)],
+    # Saddles, resolved by the cell-centre average: (centre below: cut off the high
+    # corners, centre above: cut off the low corners)
+    5: ([(0, 1), (3, 2)], [(3, 0), (2, 1)]),
+    10: ([(3, 0), (2, 1)], [(0, 1), (3, 2)]),
+}
+
+
+def evaluate(fn, width: float, height: float, step: float = 1, origin: tuple = (0, 0)) -> np.ndarray:
+    """Sample fn(x, y) on a grid every `step` pixels: array[row, col].
+
+    fn is called once with coordinate arrays when it is NumPy-friendly,
+    otherwise per point.
+    """
+    xs = origin[0] + np.arange(0, width + step / 2, step, dtype=np.float64)
+    ys = origin[1] + np.arange(0, height + step / 2, step, dtype=np.float64)
+    x, y = np.meshgrid(xs, ys)
+    try:
+        values = np.asarray(fn(x, y), dtype=np.float64)
+        if values.shape == x.shape:
+            return values
+    except (TypeError, ValueError):
+        pass  # math.* or comparisons on arrays
+    return np.vectorize(fn, otypes=[np.float64])(x, y)
+
+
+def _segments(values: np.ndarray, level: float) -> tuple[np.ndarray, np.ndarray]:
+    """Edge ids (a, b) of every segment crossing `level`"""
+    rows, cols = values.shape
+    above = values > level
+    tl, tr, br, bl = above[:-1, :-1], above[:-1, 1:], above[1:, 1:], above[1:, :-1]
+    case = tl * 8 + tr * 4 + br * 2 + bl * 1
+
+    # Edge ids: horizontal edge (r, c) -> r * (cols - 1) + c, vertical edge (r, c) -> offset + r * cols + c
+    offset = rows * (cols - 1)
+    r, c = np.nonzero((case > 0) & (case < 15))
+    kind = case[r, c]
+    edge_ids = np.stack([r * (cols - 1) + c, offset + r * cols + c + 1,
+                         (r + 1) * (cols - 1) + c, offset + r * cols + c], axis=1)
+
+    centre = (values[r, c] + values[r, c + 1] + values[r + 1, c] + values[r + 1, c + 1]) / 4 > level
+    starts, ends = [], []
+    for code, table in SEGMENTS.items():
+        chosen = kind == code
+        if not chosen.any():
+            continue
+        if code in (5, 10):
+            for flag, pairs in ((False, table[0]), (True, table[1])):
+                picked = chosen & (centre == flag)
+                for a, b in pairs:
+                    starts.append(edge_ids[picked, a])
+                    ends.append(edge_ids[picked, b])
+        else:
+            for a, b in table:
+                starts.append(edge_ids[chosen, a])
+                ends.append(edge_ids[chosen, b])
+    if not starts:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(starts), np.concatenate(ends)
+
+
+def _crossings(values: np.ndarray, level: float, edges: np.ndarray) -> np.ndarray:
+    """Interpolated (x, y) in grid units where `level` crosses each edge id"""
+    rows, cols = values.shape
+    offset = rows * (cols - 1)
+    vertical = edges >= offset
+    local = np.where(vertical, edges - offset, edges)
+    r = np.where(vertical, local // cols, local // (cols - 1))
+    c = np.where(vertical, local % cols, local % (cols - 1))
+    r2, c2 = r + vertical, c + ~vertical
+    v0, v1 = values[r, c], values[r2, c2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.nan_to_num((level - v0) / (v1 - v0), nan=0.5)
+    return np.stack([c + t * ~vertical, r + t * vertical], axis=1)
+
+
+def _join(a: np.ndarray, b: np.ndarray) -> list[list[int]]:
+    """Chain segments that share edge crossings into edge-id sequences (open chains first, then loops)"""
+    m = len(a)
+    ends = np.concatenate([a, b])  # endpoint k of segment k % m
+    order = np.argsort(ends, kind='stable')
+    partner = np.full(2 * m, -1, dtype=np.intp)
+    same = ends[order[1:]] == ends[order[:-1]]
+    first, second = order[:-1][same], order[1:][same]
+    partner[first], partner[second] = second, first
+    partner, ends = partner.tolist(), ends.tolist()
+
+    visited = [False] * m
+    chains = []
+    # Open chains start at an unpartnered endpoint; what's left afterwards are closed loops
+    starts = [k for k in range(2 * m) if partner[k] < 0] + list(range(m))
+    for k in starts:
+        segment = k % m
+        if visited[segment]:
+            continue
+        chain = [ends[k]]
+        while True:
+            visited[segment] = True
+            other = k + m if k < m else k - m
+            chain.append(ends[other])
+            k = partner[other]
+            if k < 0:
+                break
+            segment = k % m
+            if visited[segment]:
+                break
+        chains.append(chain)
+    return chains
+
+
+def lines(values: np.ndarray, levels, step: float = 1, origin: tuple = (0, 0)) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Iso-lines of a grid at each level: (points, offsets, level_index).
+
+    Polyline i is points[offsets[i]:offsets[i + 1]] at levels[level_index[i]];
+    closed loops repeat their first point at the end. `step`/`origin` map grid
+    cells back to canvas coordinates (use the values given to evaluate).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    chunks, counts, level_index = [], [], []
+    for index, level in enumerate(np.atleast_1d(levels)):
+        a, b = _segments(values, float(level))
+        if not len(a):
+            continue
+        chains = _join(a, b)
+        chunks.append(_crossings(values, float(level), np.array([e for chain in chains for e in chain])))
+        counts.extend(len(chain) for chain in chains)
+        level_index.extend([index] * len(chains))
+    if not chunks:
+        return np.empty((0, 2)), np.zeros(1, dtype=np.intp), np.empty(0, dtype=np.intp)
+    points = np.concatenate(chunks) * step + np.asarray(origin, dtype=np.float64)
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+    return points, offsets, np.array(level_index, dtype=np.intp)
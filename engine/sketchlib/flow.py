@@ -0,0 +1,112 @@
+"""Flow-field particle tracing for sketches: every particle advances at once as NumPy arrays.
+
+Exposed to generated code as `flow` (see SafeExecutor.allowed_imports).
+Fields are angle grids (e.g. from noise.grid) or (vx, vy) pairs (e.g. from
+noise.curl_grid), sampled bilinearly. Trails come back as flat polylines in
+the same layout as geometry.voronoi, ready for one batched draw:
+
+    angles = noise.grid(width, height, scale=0.004, seed=seed, step=4) * math.pi * 2
+    points, offsets = flow.trace(angles, 3000, steps=150, step_size=2, field_step=4, seed=seed)
+    flow.draw(ctx, points, offsets)   # then ctx.stroke() with the trail style
+"""
+import numpy as np
+from sketchlib import shapes
+
+
+def _field(field) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(field, (tuple, list)) and len(field) == 2:
+        return np.asarray(field[0], dtype=np.float64), np.asarray(field[1], dtype=np.float64)
+    angles = np.asarray(field, dtype=np.float64)
+    return np.cos(angles), np.sin(angles)
+
+
+def _sample(grid: np.ndarray, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+    """Bilinear sample at fractional grid coordinates, clamped to the grid"""
+    rows, cols = grid.shape
+    gx = np.clip(gx, 0, cols - 1)
+    gy = np.clip(gy, 0, rows - 1)
+    x0 = np.minimum(gx.astype(np.intp), max(cols - 2, 0))
+    y0 = np.minimum(gy.astype(np.intp), max(rows - 2, 0))
+    x1, y1 = np.minimum(x0 + 1, cols - 1), np.minimum(y0 + 1, rows - 1)
+    fx, fy = gx - x0, gy - y0
+    top = grid[y0, x0] * (1 - fx) + grid[y0, x1] * fx
+    bottom = grid[y1, x0] * (1 - fx) + grid[y1, x1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+def trace(field, starts, steps: int = 100, step_size: float = 1.0, field_step: float = 1, bounds: tuple = None,
+          edges: str = 'stop', normalize: bool = True, min_speed: float = 1e-3, every: int = 1,
+          budget: int = 2_000_000, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Advance particles through a flow field; returns (points, offsets) polylines.
+
+    field: angle grid (radians) or (vx, vy) grids, one sample every `field_step` pixels
+    starts: (n, 2) start positions, or a count to scatter uniformly (using seed)
+    bounds: (x0, y0, x1, y1), by default the field's extent
+    edges: 'stop' ends a trail at the boundary, 'wrap' re-enters on the
+        opposite side (starting a new polyline)
+    normalize: constant speed of step_size; otherwise speed scales with |v|
+    every: keep every n-th position (fewer vertices, same motion)
+    budget: cap on total vertices; particles stop early rather than exceed it
+    Trails also end where the field's speed drops below min_speed.
+    Polyline i is points[offsets[i]:offsets[i + 1]].
+    """
+    vx, vy = _field(field)
+    rows, cols = vx.shape
+    x0, y0, x1, y1 = bounds if bounds is not None else (0, 0, cols * field_step, rows * field_step)
+    if np.ndim(starts) == 0:
+        rng = np.random.default_rng(seed)
+        starts = np.column_stack([rng.uniform(x0, x1, int(starts)), rng.uniform(y0, y1, int(starts))])
+    position = np.array(starts, dtype=np.float64).reshape(-1, 2)
+    n = len(position)
+    kept = min(steps // every + 1, max(2, budget // max(n, 1)))
+
+    track = np.empty((kept, n, 2))
+    alive = np.zeros((kept, n), dtype=bool)
+    breaks = np.zeros((kept, n), dtype=bool)
+    live = (position[:, 0] >= x0) & (position[:, 0] <= x1) & (position[:, 1] >= y0) & (position[:, 1] <= y1)
+    wrapped = np.zeros(n, dtype=bool)
+    track[0], alive[0] = position, live
+    inverse = 1 / field_step
+    for step in range(1, (kept - 1) * every + 1):
+        gx, gy = position[:, 0] * inverse, position[:, 1] * inverse
+        dx, dy = _sample(vx, gx, gy), _sample(vy, gx, gy)
+        speed = np.hypot(dx, dy)
+        live &= speed >= min_speed
+        scale = step_size / np.maximum(speed, 1e-12) if normalize else step_size
+        position[:, 0] += dx * scale
+        position[:, 1] += dy * scale
+        if edges == 'wrap':
+            # x1/y1 themselves wrap to x0/y0, so they count as outside too
+            outside = (position[:, 0] < x0) | (position[:, 0] >= x1) | (position[:, 1] < y0) | (position[:, 1] >= y1)
+            wrapped |= outside & live
+            position[:, 0] = (position[:, 0] - x0) % (x1 - x0) + x0
+            position[:, 1] = (position[:, 1] - y0) % (y1 - y0) + y0
+        else:
+            live &= ~((position[:, 0] < x0) | (position[:, 0] > x1) | (position[:, 1] < y0) | (position[:, 1] > y1))
+        if step % every == 0:
+            row = step // every
+            track[row], alive[row] = position, live
+            breaks[row], wrapped[:] = wrapped & live, False
+        if not live.any():
+            kept = step // every + 1
+            break
+
+    # A particle's trail is the prefix of rows where it was alive
+    alive = np.logical_and.accumulate(alive[:kept], axis=0).T
+    points = track[:kept].transpose(1, 0, 2)[alive]
+    starts_here = (np.arange(kept)[None, :] == 0) | breaks[:kept].T
+    first = np.flatnonzero(starts_here[alive])
+    offsets = np.append(first, len(points))
+    # Drop single-point polylines (particles that died or wrapped immediately)
+    lengths = np.diff(offsets)
+    if (lengths < 2).any():
+        keep = np.repeat(lengths >= 2, lengths)
+        points = points[keep]
+        lengths = lengths[lengths >= 2]
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+    return points, offsets.astype(np.intp)
+
+
+def draw(ctx, points: np.ndarray, offsets: np.ndarray):
+    """Append all polylines to the current path (no stroke), with the per-vertex work in one tight loop"""
+    shapes.append(ctx, np.asarray(points, dtype=np.float64).tolist(), np.asarray(offsets).tolist())
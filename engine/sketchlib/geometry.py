@@ -0,0 +1,257 @@
+"""Delaunay triangulation, Voronoi cells and Lloyd relaxation for sketches.
+
+Exposed to generated code as `geometry` (see SafeExecutor.allowed_imports).
+Triangulation is incremental Bowyer–Watson: sites are inserted in grid
+snake order and located by walking from the previous triangle, so the
+expected cost is about O(n log n) rather than the O(n²) per-cell clipping
+sketches usually write by hand. Results are flat NumPy arrays:
+
+    triangles = geometry.delaunay(points)                  # (T, 3) indices into points
+    vertices, offsets = geometry.voronoi(points, bounds)   # cell i is vertices[offsets[i]:offsets[i + 1]]
+"""
+import math
+import numpy as np
+
+# Super-triangle size relative to the sites' extent; far enough that clipped
+# Voronoi cells never see its vertices, near enough to keep float64 precision
+SUPER_SCALE = 64.0
+
+
+def _as_points(points) -> np.ndarray:
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if not np.isfinite(points).all():
+        raise ValueError("points must be finite")
+    return points
+
+
+def _insertion_order(points: np.ndarray) -> np.ndarray:
+    """Snake through a grid of ~2 sites per cell so consecutive sites are neighbours"""
+    n = len(points)
+    low, high = points.min(axis=0), points.max(axis=0)
+    rows = max(1, int(math.sqrt(n / 2)))
+    span = np.maximum(high - low, 1e-12)
+    row = np.minimum(((points[:, 1] - low[1]) / span[1] * rows).astype(np.intp), rows - 1)
+    x = np.where(row % 2 == 0, points[:, 0], -points[:, 0])
+    return np.lexsort((x, row))
+
+
+def _super_triangle(points: np.ndarray, bounds: tuple = None) -> np.ndarray:
+    low, high = points.min(axis=0), points.max(axis=0)
+    if bounds is not None:
+        low, high = np.minimum(low, bounds[:2]), np.maximum(high, bounds[2:])
+    cx, cy = (low + high) / 2
+    extent = max(high[0] - low[0], high[1] - low[1], 1.0) * SUPER_SCALE
+    return np.array([[cx - extent, cy - extent], [cx + extent, cy - extent], [cx, cy + extent]])
+
+
+def _triangulate(points: np.ndarray, corners: np.ndarray) -> list:
+    """Bowyer–Watson over points plus the super triangle's corners (indices n, n+1, n+2).
+
+    Returns a list of CCW vertex triples. Duplicate sites are skipped.
+    """
+    n = len(points)
+    xs = points[:, 0].tolist() + corners[:, 0].tolist()
+    ys = points[:, 1].tolist() + corners[:, 1].tolist()
+
+    # Per triangle: vertices (CCW), neighbours (opposite each vertex), circumcircle
+    verts, nbrs, circles = [], [], []
+
+    def circle(a, b, c):
+        ax, ay, bx, by, qx, qy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+        d = 2 * (ax * (by - qy) + bx * (qy - ay) + qx * (ay - by))
+        if d == 0:
+            return (ax, ay, -1.0)  # degenerate: never contains anything
+        a2, b2, c2 = ax * ax + ay * ay, bx * bx + by * by, qx * qx + qy * qy
+        ux = (a2 * (by - qy) + b2 * (qy - ay) + c2 * (ay - by)) / d
+        uy = (a2 * (qx - bx) + b2 * (ax - qx) + c2 * (bx - ax)) / d
+        return (ux, uy, (ax - ux) ** 2 + (ay - uy) ** 2)
+
+    verts.append([n, n + 1, n + 2])
+    nbrs.append([-1, -1, -1])
+    circles.append(circle(n, n + 1, n + 2))
+
+    last = 0
+    for p in _insertion_order(points).tolist():
+        px, py = xs[p], ys[p]
+
+        # Visibility walk to the triangle containing p
+        t = last
+        for _ in range(4 * len(verts) + 16):
+            a, b, c = verts[t]
+            if (xs[c] - xs[b]) * (py - ys[b]) - (ys[c] - ys[b]) * (px - xs[b]) < 0:
+                t = nbrs[t][0]
+            elif (xs[a] - xs[c]) * (py - ys[c]) - (ys[a] - ys[c]) * (px - xs[c]) < 0:
+                t = nbrs[t][1]
+            elif (xs[b] - xs[a]) * (py - ys[a]) - (ys[b] - ys[a]) * (px - xs[a]) < 0:
+                t = nbrs[t][2]
+            else:
+                break
+        ux, uy, r2 = circles[t]
+        if (px - ux) ** 2 + (py - uy) ** 2 >= r2:
+            continue  # duplicate of an existing site
+
+        # Cavity: triangles whose circumcircle contains p, grown from t
+        bad, stack = {t}, [t]
+        boundary = []
+        while stack:
+            s = stack.pop()
+            for i in range(3):
+                o = nbrs[s][i]
+                if o in bad:
+                    continue
+                if o >= 0:
+                    ux, uy, r2 = circles[o]
+                    if (px - ux) ** 2 + (py - uy) ** 2 < r2:
+                        bad.add(o)
+                        stack.append(o)
+                        continue
+                # Record o's back-pointer now: reused slots may alias old ids later
+                boundary.append((verts[s][(i + 1) % 3], verts[s][(i + 2) % 3], o, nbrs[o].index(s) if o >= 0 else -1))
+
+        # Fan the cavity boundary around p, reusing the cavity's slots first
+        slots = list(bad)
+        starts, ends = {}, {}
+        for k, (b, c, o, back) in enumerate(boundary):
+            if k < len(slots):
+                new = slots[k]
+                verts[new], nbrs[new], circles[new] = [p, b, c], [o, -1, -1], circle(p, b, c)
+            else:
+                new = len(verts)
+                verts.append([p, b, c])
+                nbrs.append([o, -1, -1])
+                circles.append(circle(p, b, c))
+            if o >= 0:
+                nbrs[o][back] = new
+            starts[b], ends[c] = new, new
+        for b, new in starts.items():
+            c = verts[new][2]
+            nbrs[new][1] = starts[c]
+            nbrs[new][2] = ends[b]
+        last = starts[boundary[0][0]]
+    return verts
+
+
+def delaunay(points) -> np.ndarray:
+    """Delaunay triangles as a (T, 3) int array of indices into points, counter-clockwise"""
+    points = _as_points(points)
+    if len(points) < 3:
+        return np.empty((0, 3), dtype=np.intp)
+    triangles = np.array(_triangulate(points, _super_triangle(points)), dtype=np.intp)
+    return triangles[(triangles < len(points)).all(axis=1)]
+
+
+def edges(triangles: np.ndarray) -> np.ndarray:
+    """Unique undirected edges of a triangulation as an (E, 2) int array"""
+    triangles = np.asarray(triangles, dtype=np.intp)
+    pairs = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    return np.unique(np.sort(pairs, axis=1), axis=0)
+
+
+def circumcenters(points, triangles: np.ndarray) -> np.ndarray:
+    """(T, 2) circumcentres of the triangles"""
+    a, b, c = (np.asarray(points, dtype=np.float64)[triangles[:, i]] for i in range(3))
+    d = 2 * (a[:, 0] * (b[:, 1] - c[:, 1]) + b[:, 0] * (c[:, 1] - a[:, 1]) + c[:, 0] * (a[:, 1] - b[:, 1]))
+    d = np.where(d == 0, 1e-300, d)
+    a2, b2, c2 = (a * a).sum(axis=1), (b * b).sum(axis=1), (c * c).sum(axis=1)
+    ux = (a2 * (b[:, 1] - c[:, 1]) + b2 * (c[:, 1] - a[:, 1]) + c2 * (a[:, 1] - b[:, 1])) / d
+    uy = (a2 * (c[:, 0] - b[:, 0]) + b2 * (a[:, 0] - c[:, 0]) + c2 * (b[:, 0] - a[:, 0])) / d
+    return np.stack([ux, uy], axis=1)
+
+
+def _clip(polygon: list, x0: float, y0: float, x1: float, y1: float) -> list:
+    """Sutherland–Hodgman clip of a convex polygon to a rectangle"""
+    for axis, limit, keep_below in ((0, x0, False), (0, x1, True), (1, y0, False), (1, y1, True)):
+        if not polygon:
+            break
+        clipped = []
+        prev = polygon[-1]
+        prev_in = prev[axis] <= limit if keep_below else prev[axis] >= limit
+        for point in polygon:
+            inside = point[axis] <= limit if keep_below else point[axis] >= limit
+            if inside != prev_in:
+                t = (limit - prev[axis]) / (point[axis] - prev[axis])
+                crossing = [prev[0] + t * (point[0] - prev[0]), prev[1] + t * (point[1] - prev[1])]
+                crossing[axis] = limit
+                clipped.append(crossing)
+            if inside:
+                clipped.append(point)
+            prev, prev_in = point, inside
+        polygon = clipped
+    return polygon
+
+
+def voronoi(points, bounds: tuple = None) -> tuple[np.ndarray, np.ndarray]:
+    """Voronoi cells clipped to bounds = (x0, y0, x1, y1), by default the sites' bounding box.
+
+    Returns (vertices, offsets): cell i is the CCW polygon
+    vertices[offsets[i]:offsets[i + 1]] (empty for duplicate sites).
+    """
+    points = _as_points(points)
+    n = len(points)
+    if bounds is None:
+        bounds = (*points.min(axis=0), *points.max(axis=0)) if n else (0, 0, 0, 0)
+    x0, y0, x1, y1 = bounds
+    if n == 0:
+        return np.empty((0, 2)), np.zeros(1, dtype=np.intp)
+    if n < 3:
+        # Pad with far ghost sites so one or two sites still get proper cells
+        span = max(x1 - x0, y1 - y0, 1.0) * SUPER_SCALE
+        ghosts = np.array([[x0 - span, y0 - span], [x1 + span, y0 - span], [x0, y1 + span]])
+        vertices, offsets = voronoi(np.concatenate([points, ghosts]), bounds)
+        return vertices[:offsets[n]], offsets[:n + 1]
+
+    # Keep the super vertices: their triangles close the hull sites' cells far outside bounds
+    corners = _super_triangle(points, bounds)
+    triangles = np.array(_triangulate(points, corners), dtype=np.intp)
+    centres = circumcenters(np.concatenate([points, corners]), triangles)
+
+    # Gather each site's triangles and order their circumcentres by angle around it
+    site = triangles.ravel()
+    tri = np.repeat(np.arange(len(triangles)), 3)
+    real = site < n
+    site, tri = site[real], tri[real]
+    angle = np.arctan2(centres[tri, 1] - points[site, 1], centres[tri, 0] - points[site, 0])
+    order = np.lexsort((angle, site))
+    site, ring = site[order], centres[tri[order]].tolist()
+    counts = np.bincount(site, minlength=n)
+    starts = np.concatenate([[0], np.cumsum(counts)]).tolist()
+
+    cells, offsets = [], [0]
+    for i in range(n):
+        cell = _clip(ring[starts[i]:starts[i + 1]], x0, y0, x1, y1)
+        cells.extend(cell)
+        offsets.append(len(cells))
+    return np.array(cells, dtype=np.float64).reshape(-1, 2), np.array(offsets, dtype=np.intp)
+
+
+def split(vertices: np.ndarray, offsets: np.ndarray) -> list[np.ndarray]:
+    """Per-cell (k, 2) arrays from voronoi's flat output"""
+    return np.split(vertices, offsets[1:-1])
+
+
+def centroids(vertices: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """(n, 2) area centroids of the cells (NaN for empty cells)"""
+    n = len(offsets) - 1
+    if len(vertices) == 0:
+        return np.full((n, 2), np.nan)
+    cell = np.repeat(np.arange(n), np.diff(offsets))
+    nxt = np.arange(len(vertices)) + 1
+    ends = offsets[1:][cell]
+    nxt = np.where(nxt == ends, offsets[:-1][cell], nxt)
+    x, y = vertices[:, 0], vertices[:, 1]
+    cross = x * y[nxt] - x[nxt] * y
+    area = np.bincount(cell, cross, minlength=n) / 2
+    cx = np.bincount(cell, (x + x[nxt]) * cross, minlength=n)
+    cy = np.bincount(cell, (y + y[nxt]) * cross, minlength=n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.stack([cx, cy], axis=1) / (6 * area)[:, None]
+
+
+def relax(points, bounds: tuple, iterations: int = 1) -> np.ndarray:
+    """Lloyd relaxation: move each site to its cell's centroid, evening out the spacing"""
+    points = _as_points(points).copy()
+    for _ in range(iterations):
+        target = centroids(*voronoi(points, bounds))
+        ok = np.isfinite(target).all(axis=1)
+        points[ok] = target[ok]
+    return points
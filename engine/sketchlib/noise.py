@@ -0,0 +1,141 @@
+"""NumPy noise for sketches: Perlin, simplex, fBm and curl, evaluated over whole grids.
+
+Exposed to generated code as `noise` (see SafeExecutor.allowed_imports).
+Grid functions are memoized by their arguments, so asking for the same
+field twice (or from several layers of one sketch) costs nothing; cached
+arrays are read-only.
+"""
+from functools import lru_cache
+import math
+import numpy as np
+
+GRADIENTS = np.array([[1, 1], [-1, 1], [1, -1], [-1, -1], [1, 0], [-1, 0], [0, 1], [0, -1]], dtype=np.float64)
+F2 = 0.5 * (math.sqrt(3) - 1)
+G2 = (3 - math.sqrt(3)) / 6
+
+
+@lru_cache(maxsize=64)
+def _permutation(seed: int) -> np.ndarray:
+    p = np.random.default_rng(seed).permutation(256)
+    return np.concatenate([p, p]).astype(np.intp)
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def _dot(hashes, dx, dy):
+    g = GRADIENTS[hashes & 7]
+    return g[..., 0] * dx + g[..., 1] * dy
+
+
+def _result(value):
+    return value.item() if value.ndim == 0 else value
+
+
+def perlin(x, y, seed: int = 0):
+    """Gradient noise in about -1..1; x and y may be scalars or arrays"""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    p = _permutation(seed)
+    x0, y0 = np.floor(x), np.floor(y)
+    xf, yf = x - x0, y - y0
+    xi, yi = x0.astype(np.intp) & 255, y0.astype(np.intp) & 255
+    u, v = _fade(xf), _fade(yf)
+
+    a, b = p[xi], p[xi + 1]
+    n00, n10 = _dot(p[a + yi], xf, yf), _dot(p[b + yi], xf - 1, yf)
+    n01, n11 = _dot(p[a + yi + 1], xf, yf - 1), _dot(p[b + yi + 1], xf - 1, yf - 1)
+    top, bottom = n00 + u * (n10 - n00), n01 + u * (n11 - n01)
+    return _result(top + v * (bottom - top))
+
+
+def simplex(x, y, seed: int = 0):
+    """2D simplex noise in about -1..1; cheaper than Perlin per octave with fewer grid artifacts"""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    p = _permutation(seed)
+    s = (x + y) * F2
+    i, j = np.floor(x + s), np.floor(y + s)
+    t = (i + j) * G2
+    x0, y0 = x - (i - t), y - (j - t)
+    i1 = (x0 > y0).astype(np.intp)
+    j1 = 1 - i1
+    corners = [
+        (x0, y0, 0, 0),
+        (x0 - i1 + G2, y0 - j1 + G2, i1, j1),
+        (x0 - 1 + 2 * G2, y0 - 1 + 2 * G2, 1, 1),
+    ]
+    ii, jj = i.astype(np.intp) & 255, j.astype(np.intp) & 255
+    total = np.zeros(np.broadcast(x, y).shape)
+    for dx, dy, oi, oj in corners:
+        falloff = np.maximum(0.5 - dx * dx - dy * dy, 0)
+        total += falloff ** 4 * _dot(p[ii + oi + p[jj + oj]], dx, dy)
+    return _result(70 * total)
+
+
+BASES = {'perlin': perlin, 'simplex': simplex}
+
+
+def fbm(x, y, octaves: int = 4, lacunarity: float = 2.0, gain: float = 0.5, seed: int = 0, kind: str = 'perlin'):
+    """Fractal Brownian motion: octaves of noise at rising frequency, normalized to about -1..1"""
+    base = BASES[kind]
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    total, amplitude, frequency, norm = 0.0, 1.0, 1.0, 0.0
+    for octave in range(octaves):
+        total = total + amplitude * np.asarray(base(x * frequency, y * frequency, seed + octave))
+        norm += amplitude
+        amplitude *= gain
+        frequency *= lacunarity
+    return _result(np.asarray(total / norm))
+
+
+def curl(x, y, octaves: int = 3, seed: int = 0, eps: float = 1e-3, kind: str = 'perlin'):
+    """Divergence-free (vx, vy) from the rotated gradient of an fBm potential"""
+    dpdx = (np.asarray(fbm(x + eps, y, octaves, seed=seed, kind=kind)) - fbm(x - eps, y, octaves, seed=seed, kind=kind)) / (2 * eps)
+    dpdy = (np.asarray(fbm(x, y + eps, octaves, seed=seed, kind=kind)) - fbm(x, y - eps, octaves, seed=seed, kind=kind)) / (2 * eps)
+    return _result(np.asarray(dpdy)), _result(np.asarray(-dpdx))
+
+
+def _coordinates(width: int, height: int, scale: float, step: float):
+    xs = np.arange(0, width, step, dtype=np.float64) * scale
+    ys = np.arange(0, height, step, dtype=np.float64) * scale
+    return np.meshgrid(xs, ys)
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=32)
+def grid(width: int, height: int, scale: float = 0.01, octaves: int = 4, seed: int = 0, kind: str = 'perlin',
+         step: float = 1, lacunarity: float = 2.0, gain: float = 0.5) -> np.ndarray:
+    """fBm sampled every `step` pixels over a canvas: array[row, col] in about -1..1"""
+    x, y = _coordinates(width, height, scale, step)
+    return _frozen(np.asarray(fbm(x, y, octaves, lacunarity, gain, seed, kind)))
+
+
+@lru_cache(maxsize=32)
+def curl_grid(width: int, height: int, scale: float = 0.01, octaves: int = 3, seed: int = 0,
+              step: float = 1, kind: str = 'perlin') -> tuple[np.ndarray, np.ndarray]:
+    """Curl-noise flow vectors (vx, vy) sampled every `step` pixels; unit-ish magnitude"""
+    x, y = _coordinates(width, height, scale, step)
+    vx, vy = curl(x, y, octaves, seed, kind=kind)
+    return _frozen(np.asarray(vx)), _frozen(np.asarray(vy))
+
+
+def lookup(values: np.ndarray, step: float = 1):
+    """Fast per-point sampler for a grid: at(x, y) -> nearest value, clamped to the edges.
+
+    For loops that move points around (particles, flow lines), where
+    calling noise per point would be slow.
+    """
+    rows = np.asarray(values).tolist()
+    last_row, last_col = len(rows) - 1, len(rows[0]) - 1
+    inverse = 1 / step
+
+    def at(x, y):
+        i, j = int(y * inverse), int(x * inverse)
+        row = rows[0 if i < 0 else last_row if i > last_row else i]
+        return row[0 if j < 0 else last_col if j > last_col else j]
+
+    return at
@@ -0,0 +1,192 @@
+"""Vectorized colour maths for sketches: sRGB/linear/OKLab/HSV, gradient lookup tables, quantization.
+
+Exposed to generated code as `palette` (see SafeExecutor.allowed_imports).
+Everything takes and returns float arrays with channels last, in 0..1, so
+results go straight into shapes.*(colours=...), stamps and pixels.write:
+
+    lut = palette.gradient(['#1b1f3a', '#e94f37', '#f6f7eb'])      # (256, 3), interpolated in OKLab
+    colours = palette.lookup(lut, t)                                 # t: any array of 0..1 values
+    rgb = palette.hsv_to_rgb(hues, 0.7, 0.9)                         # colorsys semantics, whole arrays
+    img[..., :3] = palette.quantize(img[..., :3], lut[::32])         # nearest palette colour (OKLab)
+
+Gradient tables are memoized by their stops; cached arrays are read-only.
+"""
+from functools import lru_cache
+import numpy as np
+
+# Björn Ottosson's OKLab: linear sRGB -> LMS -> cube root -> Lab, and back
+_LMS = np.array([[0.4122214708, 0.5363325363, 0.0514459929],
+                 [0.2119034982, 0.6806995451, 0.1073969566],
+                 [0.0883024619, 0.2817188376, 0.6299787005]])
+_LAB = np.array([[0.2104542553, 0.7936177850, -0.0040720468],
+                 [1.9779984951, -2.4285922050, 0.4505937099],
+                 [0.0259040371, 0.7827717662, -0.8086757660]])
+_LMS_INV = np.array([[1, 0.3963377774, 0.2158037573],
+                     [1, -0.1055613458, -0.0638541728],
+                     [1, -0.0894841775, -1.2914855480]])
+_RGB_INV = np.array([[4.0767416621, -3.3077115913, 0.2309699292],
+                     [-1.2684380046, 2.6097574011, -0.3413193965],
+                     [-0.0041960863, -0.7034186147, 1.7076147010]])
+
+QUANTIZE_CHUNK = 65536  # colours compared against the palette per pass
+
+
+def rgb(colours) -> np.ndarray:
+    """Colours as an (..., 3|4) float array: hex strings ('#rgb', '#rrggbb', '#rrggbbaa'), tuples or arrays"""
+    if isinstance(colours, str):
+        return _hex(colours)
+    if len(colours) and isinstance(colours[0], str):
+        return np.array([_hex(c) for c in colours])
+    return np.asarray(colours, dtype=np.float64)
+
+
+def _hex(code: str) -> np.ndarray:
+    code = code.lstrip('#')
+    if len(code) in (3, 4):
+        code = ''.join(c * 2 for c in code)
+    return np.array([int(code[i:i + 2], 16) for i in range(0, len(code), 2)], dtype=np.float64) / 255
+
+
+def srgb_to_linear(colours) -> np.ndarray:
+    c = np.asarray(colours, dtype=np.float64)
+    return np.where(c <= 0.04045, c / 12.92, ((np.maximum(c, 0.04045) + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(colours) -> np.ndarray:
+    c = np.asarray(colours, dtype=np.float64)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * np.maximum(c, 0.0031308) ** (1 / 2.4) - 0.055)
+
+
+def to_oklab(colours) -> np.ndarray:
+    """sRGB (..., 3) -> OKLab (L in 0..1, a/b about -0.4..0.4)"""
+    lms = srgb_to_linear(colours) @ _LMS.T
+    return np.cbrt(lms) @ _LAB.T
+
+
+def from_oklab(lab, clip: bool = True) -> np.ndarray:
+    """OKLab (..., 3) -> sRGB, clipped to 0..1 unless clip=False"""
+    lms = (np.asarray(lab, dtype=np.float64) @ _LMS_INV.T) ** 3
+    srgb = linear_to_srgb(lms @ _RGB_INV.T)
+    return np.clip(srgb, 0, 1) if clip else srgb
+
+
+def to_oklch(colours) -> np.ndarray:
+    """sRGB -> OKLCh: lightness, chroma and hue in turns (0..1)"""
+    lab = to_oklab(colours)
+    hue = np.arctan2(lab[..., 2], lab[..., 1]) / (2 * np.pi) % 1
+    return np.stack([lab[..., 0], np.hypot(lab[..., 1], lab[..., 2]), hue], axis=-1)
+
+
+def from_oklch(lch, clip: bool = True) -> np.ndarray:
+    lch = np.asarray(lch, dtype=np.float64)
+    angle = lch[..., 2] * 2 * np.pi
+    lab = np.stack([lch[..., 0], lch[..., 1] * np.cos(angle), lch[..., 1] * np.sin(angle)], axis=-1)
+    return from_oklab(lab, clip)
+
+
+def hsv_to_rgb(h, s=1.0, v=1.0) -> np.ndarray:
+    """colorsys.hsv_to_rgb over arrays (h in turns, 0..1): (..., 3)"""
+    h, s, v = np.broadcast_arrays(np.asarray(h, dtype=np.float64), np.asarray(s, dtype=np.float64),
+                                  np.asarray(v, dtype=np.float64))
+    # Channel n (r=5, g=3, b=1) falls off linearly over the two sextants around its opposite hue
+    k = np.array([5.0, 3.0, 1.0]) + (h - np.floor(h))[..., None] * 6
+    k -= 6 * (k >= 6)  # np.mod is several times slower
+    return v[..., None] * (1 - s[..., None] * np.clip(np.minimum(k, 4 - k), 0, 1))
+
+
+def rgb_to_hsv(colours) -> np.ndarray:
+    """colorsys.rgb_to_hsv over (..., 3) arrays: (..., 3) h, s, v with h in turns"""
+    c = np.asarray(colours, dtype=np.float64)
+    r, g, b = c[..., 0], c[..., 1], c[..., 2]
+    high, low = c[..., :3].max(axis=-1), c[..., :3].min(axis=-1)
+    delta = high - low
+    safe = np.where(delta > 0, delta, 1)
+    rc, gc, bc = (high - r) / safe, (high - g) / safe, (high - b) / safe
+    h = np.where(r == high, bc - gc, np.where(g == high, 2 + rc - bc, 4 + gc - rc))
+    h = np.where(delta > 0, (h / 6) % 1, 0)
+    s = np.where(high > 0, delta / np.where(high > 0, high, 1), 0)
+    return np.stack([h, s, high], axis=-1)
+
+
+def mix(a, b, t, space: str = 'oklab') -> np.ndarray:
+    """Blend colours a -> b by t (arrays broadcast) in 'oklab', 'linear' or 'srgb'"""
+    a, b = rgb(a), rgb(b)
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    if space == 'oklab':
+        return from_oklab(to_oklab(a[..., :3]) * (1 - t) + to_oklab(b[..., :3]) * t)
+    if space == 'linear':
+        return linear_to_srgb(srgb_to_linear(a[..., :3]) * (1 - t) + srgb_to_linear(b[..., :3]) * t)
+    return a * (1 - t) + b * t
+
+
+def _is_pair(stop) -> bool:
+    """(position, colour) rather than a bare colour"""
+    return not isinstance(stop, str) and len(stop) == 2 and not isinstance(stop[1], (int, float))
+
+
+@lru_cache(maxsize=64)
+def _gradient(stops: tuple, n: int, space: str) -> np.ndarray:
+    positions = np.array([p for p, _ in stops], dtype=np.float64)
+    colours = np.array([c for _, c in stops], dtype=np.float64)
+    if space == 'oklab':
+        colours = np.concatenate([to_oklab(colours[:, :3]), colours[:, 3:]], axis=1)
+    elif space == 'linear':
+        colours = np.concatenate([srgb_to_linear(colours[:, :3]), colours[:, 3:]], axis=1)
+    t = np.linspace(0, 1, n)
+    table = np.stack([np.interp(t, positions, colours[:, i]) for i in range(colours.shape[1])], axis=1)
+    if space == 'oklab':
+        table[:, :3] = from_oklab(table[:, :3])
+    elif space == 'linear':
+        table[:, :3] = linear_to_srgb(table[:, :3])
+    table.flags.writeable = False
+    return table
+
+
+def gradient(stops, n: int = 256, space: str = 'oklab') -> np.ndarray:
+    """Lookup table of n colours through the stops: (n, 3|4), read-only.
+
+    stops are colours spaced evenly, or (position, colour) pairs with
+    positions in 0..1; colours may be hex strings or RGB(A) tuples (all the
+    same length). Interpolated in 'oklab' (perceptually even), 'linear' or 'srgb'.
+    """
+    stops = list(stops)
+    if _is_pair(stops[0]):
+        pairs = [(float(p), tuple(rgb(c).tolist())) for p, c in stops]
+    else:
+        pairs = [(i / max(len(stops) - 1, 1), tuple(rgb(c).tolist())) for i, c in enumerate(stops)]
+    return _gradient(tuple(sorted(pairs)), int(n), space)
+
+
+def lookup(table, t, alpha=None) -> np.ndarray:
+    """Colours for values t (any shape, clipped to 0..1) from a gradient table: (..., channels).
+
+    alpha (a number or array like t) appends or replaces the alpha channel.
+    """
+    table = np.asarray(table)
+    index = np.rint(np.clip(np.asarray(t, dtype=np.float64), 0, 1) * (len(table) - 1)).astype(np.intp)
+    colours = table[index]
+    if alpha is None:
+        return colours
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), index.shape)[..., None]
+    return np.concatenate([colours[..., :3], alpha], axis=-1)
+
+
+def quantize(colours, palette_colours, return_index: bool = False):
+    """Snap each colour to the nearest palette colour by OKLab distance.
+
+    colours is (..., 3|4) (alpha is kept), palette_colours a list of hex
+    strings or an (k, 3) array. Returns the snapped colours, and the palette
+    indices too with return_index=True.
+    """
+    colours = rgb(colours)
+    targets = np.atleast_2d(rgb(palette_colours))[:, :3]
+    target_lab = to_oklab(targets)
+    flat = to_oklab(colours[..., :3]).reshape(-1, 3)
+    index = np.empty(len(flat), dtype=np.intp)
+    for start in range(0, len(flat), QUANTIZE_CHUNK):
+        chunk = flat[start:start + QUANTIZE_CHUNK]
+        d = ((chunk[:, None, :] - target_lab[None, :, :]) ** 2).sum(axis=2)
+        index[start:start + QUANTIZE_CHUNK] = d.argmin(axis=1)
+    index = index.reshape(colours.shape[:-1])
+    snapped = np.concatenate([targets[index], colours[..., 3:]], axis=-1)
+    return (snapped, index) if return_index else snapped
@@ -0,0 +1,174 @@
+"""Whole-image pixel access for sketches: a zero-copy NumPy view of a cairo surface.
+
+Exposed to generated code as `pixels` (see SafeExecutor.allowed_imports).
+Cairo stores ARGB32 as native-endian premultiplied 32-bit words, so the raw
+view's channels are B, G, R, A on little-endian machines; `read`/`write`
+and the effect helpers hide that and work in straight (unpremultiplied)
+float RGBA in 0..1. Every function flushes cairo before touching memory and
+marks the surface dirty afterwards, so drawing can continue normally.
+
+    pixels.blend(surface, pixels.linear_gradient(width, height, [(0, (1, 0.5, 0)), (1, (0, 0, 0.3))]), 'overlay', 0.6)
+    pixels.grain(surface, 0.05, seed=seed)
+"""
+from contextlib import contextmanager
+import sys
+import cairo
+import numpy as np
+
+# Positions of R, G, B, A within each pixel's four bytes
+RGBA_INDEX = [2, 1, 0, 3] if sys.byteorder == 'little' else [1, 2, 3, 0]
+
+BAYER_8 = np.array([
+    [0, 32, 8, 40, 2, 34, 10, 42], [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44, 4, 36, 14, 46, 6, 38], [60, 28, 52, 20, 62, 30, 54, 22],
+    [3, 35, 11, 43, 1, 33, 9, 41], [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47, 7, 39, 13, 45, 5, 37], [63, 31, 55, 23, 61, 29, 53, 21],
+], dtype=np.float32) / 64 + 1 / 128
+
+
+def view(surface) -> np.ndarray:
+    """(height, width, 4) uint8 view sharing memory with the surface: premultiplied, native channel order.
+
+    Flushes pending drawing first. After writing through the view, call
+    surface.mark_dirty() (or use `edit`) before drawing on the surface again.
+    """
+    if not isinstance(surface, cairo.ImageSurface) or surface.get_format() not in (cairo.FORMAT_ARGB32, cairo.FORMAT_RGB24):
+        raise TypeError("pixels needs an ARGB32 or RGB24 cairo.ImageSurface")
+    surface.flush()
+    height, stride = surface.get_height(), surface.get_stride()
+    return np.ndarray((height, surface.get_width(), 4), dtype=np.uint8, buffer=surface.get_data(), strides=(stride, 4, 1))
+
+
+@contextmanager
+def edit(surface):
+    """`with pixels.edit(surface) as px:` raw view with flush/mark_dirty handled"""
+    px = view(surface)
+    try:
+        yield px
+    finally:
+        surface.mark_dirty()
+
+
+def _unpremultiply(px: np.ndarray, opaque: bool) -> np.ndarray:
+    rgba = px[..., RGBA_INDEX].astype(np.float32) / 255
+    if opaque:
+        rgba[..., 3] = 1.0
+        return rgba
+    alpha = rgba[..., 3:]
+    np.divide(rgba[..., :3], alpha, out=rgba[..., :3], where=alpha > 0)
+    return np.clip(rgba, 0.0, 1.0, out=rgba)
+
+
+def _store(px: np.ndarray, rgba: np.ndarray, opaque: bool):
+    """Write straight float RGBA into the view, premultiplied and rounded"""
+    rgba = np.clip(rgba, 0.0, 1.0)
+    if opaque:
+        rgba[..., 3] = 1.0
+    rgba[..., :3] *= rgba[..., 3:]
+    px[..., RGBA_INDEX] = (rgba * 255 + 0.5).astype(np.uint8)
+
+
+def _with_alpha(layer, shape) -> np.ndarray:
+    layer = np.asarray(layer, dtype=np.float32)
+    if layer.shape[-1] == 3:
+        layer = np.concatenate([layer, np.ones(layer.shape[:-1] + (1,), dtype=np.float32)], axis=-1)
+    return np.broadcast_to(layer, shape[:2] + (4,))
+
+
+def read(surface) -> np.ndarray:
+    """Copy of the image as (height, width, 4) float32 straight RGBA in 0..1"""
+    return _unpremultiply(view(surface), surface.get_format() == cairo.FORMAT_RGB24)
+
+
+def write(surface, rgba: np.ndarray):
+    """Replace the image with (height, width, 3 or 4) straight float colours in 0..1"""
+    with edit(surface) as px:
+        _store(px, _with_alpha(rgba, px.shape), surface.get_format() == cairo.FORMAT_RGB24)
+
+
+# Separable blend modes on straight colours: backdrop b, source s
+BLEND_MODES = {
+    'normal': lambda b, s: s,
+    'multiply': lambda b, s: b * s,
+    'screen': lambda b, s: b + s - b * s,
+    'overlay': lambda b, s: np.where(b <= 0.5, 2 * b * s, 1 - 2 * (1 - b) * (1 - s)),
+    'soft_light': lambda b, s: np.where(s <= 0.5, b - (1 - 2 * s) * b * (1 - b),
+                                        b + (2 * s - 1) * (np.sqrt(b) - b)),
+    'darken': np.minimum,
+    'lighten': np.maximum,
+    'difference': lambda b, s: np.abs(b - s),
+    'add': lambda b, s: np.minimum(b + s, 1.0),
+}
+
+
+def blend(surface, layer, mode: str = 'normal', opacity: float = 1.0, mask: np.ndarray = None):
+    """Composite a (height, width, 3 or 4) straight-colour layer onto the surface in one pass.
+
+    `mask` (height, width) in 0..1 scales the layer's alpha per pixel.
+    """
+    opaque = surface.get_format() == cairo.FORMAT_RGB24
+    with edit(surface) as px:
+        backdrop = _unpremultiply(px, opaque)
+        source = _with_alpha(layer, px.shape)
+        alpha_s = source[..., 3:] * opacity
+        if mask is not None:
+            alpha_s = alpha_s * np.asarray(mask, dtype=np.float32)[..., None]
+        alpha_b = backdrop[..., 3:]
+        mixed = BLEND_MODES[mode](backdrop[..., :3], source[..., :3])
+        # W3C compositing: separable blend inside source-over
+        colour = (1 - alpha_b) * source[..., :3] * alpha_s + (1 - alpha_s) * backdrop[..., :3] * alpha_b \
+            + alpha_s * alpha_b * mixed
+        alpha = alpha_s + alpha_b - alpha_s * alpha_b
+        result = np.zeros(px.shape, dtype=np.float32)
+        np.divide(colour, alpha, out=result[..., :3], where=alpha > 0)
+        result[..., 3:] = alpha
+        _store(px, result, opaque)
+
+
+def _ramp(t: np.ndarray, stops) -> np.ndarray:
+    """Colours along t in 0..1 from [(offset, (r, g, b[, a])), ...]"""
+    stops = sorted(stops, key=lambda s: s[0])
+    offsets = np.array([s[0] for s in stops], dtype=np.float32)
+    colours = np.array([tuple(s[1]) + (1.0,) * (4 - len(s[1])) for s in stops], dtype=np.float32)
+    t = np.clip(t, offsets[0], offsets[-1])
+    return np.stack([np.interp(t, offsets, colours[:, c]) for c in range(4)], axis=-1).astype(np.float32)
+
+
+def linear_gradient(width: int, height: int, stops, angle: float = 0.0) -> np.ndarray:
+    """(height, width, 4) straight RGBA ramp across the canvas; angle in radians, 0 = left to right"""
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    dx, dy = np.cos(angle), np.sin(angle)
+    t = (xs - width / 2) * dx + (ys - height / 2) * dy
+    half = (abs(dx) * width + abs(dy) * height) / 2
+    return _ramp(t / (2 * half) + 0.5, stops)
+
+
+def radial_gradient(width: int, height: int, stops, center: tuple = None, radius: float = None) -> np.ndarray:
+    """(height, width, 4) straight RGBA ramp outward from center (default: canvas centre, to the corners)"""
+    cx, cy = center if center is not None else (width / 2, height / 2)
+    radius = radius or float(np.hypot(max(cx, width - cx), max(cy, height - cy)))
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    return _ramp(np.hypot(xs - cx, ys - cy) / radius, stops)
+
+
+def grain(surface, amount: float = 0.05, seed: int = 0, mono: bool = True):
+    """Film grain: add Gaussian noise with standard deviation `amount` to the colour channels"""
+    opaque = surface.get_format() == cairo.FORMAT_RGB24
+    with edit(surface) as px:
+        rgba = _unpremultiply(px, opaque)
+        rng = np.random.default_rng(seed)
+        shape = px.shape[:2] + ((1,) if mono else (3,))
+        rgba[..., :3] += rng.normal(0.0, amount, shape).astype(np.float32)
+        _store(px, rgba, opaque)
+
+
+def dither(surface, levels: int = 4):
+    """Ordered (8x8 Bayer) dither of each colour channel down to `levels` values"""
+    opaque = surface.get_format() == cairo.FORMAT_RGB24
+    with edit(surface) as px:
+        rgba = _unpremultiply(px, opaque)
+        height, width = px.shape[:2]
+        threshold = np.tile(BAYER_8, (height // 8 + 1, width // 8 + 1))[:height, :width, None]
+        steps = levels - 1
+        rgba[..., :3] = np.floor(rgba[..., :3] * steps + threshold) / steps
+        _store(px, rgba, opaque)
@@ -0,0 +1,135 @@
+"""Gray–Scott reaction-diffusion on NumPy arrays, drawn onto a cairo context in one paint.
+
+Exposed to generated code as `reaction` (see SafeExecutor.allowed_imports).
+The grid is updated with whole-array 5-point stencils, thousands of
+iterations per second at half canvas resolution, instead of the tens a
+per-cell Python loop manages.
+
+    field = reaction.gray_scott(width, height, *reaction.PRESETS['coral'], iterations=4000, seed=seed)
+    reaction.draw(ctx, field, width, height, dark=(0, 0, 0), light=(1, 1, 1), threshold=0.5)
+"""
+import cairo
+import numpy as np
+from sketchlib.pixels import RGBA_INDEX
+
+# (feed, kill) pairs with well-known looks
+PRESETS = {
+    'coral': (0.0545, 0.062),
+    'mitosis': (0.0367, 0.0649),
+    'fingerprint': (0.037, 0.06),
+    'maze': (0.029, 0.057),
+    'worms': (0.046, 0.063),
+    'solitons': (0.03, 0.062),
+    'holes': (0.039, 0.058),
+    'waves': (0.014, 0.045),
+}
+
+
+def _step(u: np.ndarray, v: np.ndarray, feed: float, kill: float, du: float, dv: float, dt: float, iterations: int):
+    """Advance padded (rows + 2, cols + 2) grids in place, wrapping at the edges"""
+    lap_u = np.empty_like(u[1:-1, 1:-1])
+    lap_v = np.empty_like(lap_u)
+    uvv = np.empty_like(lap_u)
+    inner_u, inner_v = u[1:-1, 1:-1], v[1:-1, 1:-1]
+    for i in range(iterations):
+        if i % 32 == 0:
+            # Where v dies out it decays towards float32 denormals, which are very slow
+            inner_v[inner_v < 1e-15] = 0
+        for grid in (u, v):
+            grid[0, :], grid[-1, :] = grid[-2, :], grid[1, :]
+            grid[:, 0], grid[:, -1] = grid[:, -2], grid[:, 1]
+        for grid, inner, lap in ((u, inner_u, lap_u), (v, inner_v, lap_v)):
+            np.add(grid[:-2, 1:-1], grid[2:, 1:-1], out=lap)
+            lap += grid[1:-1, :-2]
+            lap += grid[1:-1, 2:]
+            lap -= 4 * inner
+        np.multiply(inner_v, inner_v, out=uvv)
+        uvv *= inner_u
+        # u' = Du∇²u - uv² + F(1 - u);  v' = Dv∇²v + uv² - (F + k)v
+        lap_u *= du
+        lap_u -= uvv
+        lap_u += feed * (1 - inner_u)
+        lap_v *= dv
+        lap_v += uvv
+        lap_v -= (feed + kill) * inner_v
+        inner_u += dt * lap_u
+        inner_v += dt * lap_v
+
+
+def _initial(rows: int, cols: int, seed: int, spots: int, mask) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    u = np.ones((rows + 2, cols + 2), dtype=np.float32)
+    v = np.zeros_like(u)
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        ys = (np.arange(rows) * mask.shape[0] // rows)[:, None]
+        xs = (np.arange(cols) * mask.shape[1] // cols)[None, :]
+        seeded = mask[ys, xs]
+    else:
+        seeded = np.zeros((rows, cols), dtype=bool)
+        size = max(2, min(rows, cols) // 20)
+        for y, x in zip(rng.integers(0, max(1, rows - size), spots), rng.integers(0, max(1, cols - size), spots)):
+            seeded[y:y + size, x:x + size] = True
+    u[1:-1, 1:-1][seeded] = 0.5
+    v[1:-1, 1:-1][seeded] = 0.25
+    v[1:-1, 1:-1] += rng.uniform(0, 0.02, (rows, cols)).astype(np.float32)
+    return u, v
+
+
+def gray_scott(width: int, height: int, feed: float = 0.055, kill: float = 0.062, iterations: int = 4000,
+               resolution: float = 0.5, coarse: float = 0.5, seed: int = 0, spots: int = 12, mask=None,
+               du: float = 0.2, dv: float = 0.1, dt: float = 1.0) -> np.ndarray:
+    """Run Gray–Scott and return the v concentration as a (rows, cols) array scaled to 0..1.
+
+    resolution: grid cells per canvas pixel (0.5 = half size, 4x cheaper)
+    coarse: share of iterations run first on a half-size grid (diffusion scaled
+        to match) before refining; patterns form for a quarter of the cost
+    mask: optional boolean array (any size) marking where v is seeded;
+        otherwise `spots` random squares
+    """
+    rows, cols = max(8, round(height * resolution)), max(8, round(width * resolution))
+    early = int(iterations * coarse) if rows >= 32 and cols >= 32 else 0
+    if early:
+        # Half the cells per axis: the same physical diffusion is a quarter per cell
+        u, v = _initial(rows // 2, cols // 2, seed, spots, mask)
+        _step(u, v, feed, kill, du / 4, dv / 4, dt, early)
+        ys = np.minimum(np.arange(rows) // 2, rows // 2 - 1)[:, None]
+        xs = np.minimum(np.arange(cols) // 2, cols // 2 - 1)[None, :]
+        fine_u, fine_v = (np.empty((rows + 2, cols + 2), dtype=np.float32) for _ in range(2))
+        fine_u[1:-1, 1:-1] = u[1:-1, 1:-1][ys, xs]
+        fine_v[1:-1, 1:-1] = v[1:-1, 1:-1][ys, xs]
+        u, v = fine_u, fine_v
+    else:
+        u, v = _initial(rows, cols, seed, spots, mask)
+    _step(u, v, feed, kill, du, dv, dt, iterations - early)
+    field = v[1:-1, 1:-1]
+    peak = float(field.max())
+    return np.clip(field / peak, 0, 1) if peak > 1e-6 else np.zeros_like(field)
+
+
+def draw(ctx, field: np.ndarray, width: float, height: float, dark: tuple = (0, 0, 0), light: tuple = (1, 1, 1),
+         threshold: float = None, softness: float = 0.08):
+    """Paint a 0..1 field over (0, 0, width, height), interpolating dark -> light.
+
+    With a threshold the field is mapped through a smoothstep of the given
+    softness around it, for crisp black-and-white forms.
+    """
+    t = np.asarray(field, dtype=np.float32)
+    if threshold is not None:
+        t = np.clip((t - threshold) / (2 * softness) + 0.5, 0, 1)
+        t = t * t * (3 - 2 * t)
+    dark, light = np.asarray(dark[:3], dtype=np.float32), np.asarray(light[:3], dtype=np.float32)
+    rows, cols = t.shape
+    image = np.full((rows, cols, 4), 255, dtype=np.uint8)
+    image[..., RGBA_INDEX[:3]] = ((dark + (light - dark) * t[..., None]) * 255 + 0.5).astype(np.uint8)
+
+    surface = cairo.ImageSurface.create_for_data(image, cairo.FORMAT_ARGB32, cols, rows, cols * 4)
+    pattern = cairo.SurfacePattern(surface)
+    pattern.set_filter(cairo.FILTER_BILINEAR)
+    pattern.set_extend(cairo.EXTEND_PAD)
+    pattern.set_matrix(cairo.Matrix(xx=cols / width, yy=rows / height))
+    ctx.save()
+    ctx.rectangle(0, 0, width, height)
+    ctx.set_source(pattern)
+    ctx.fill()
+    ctx.restore()
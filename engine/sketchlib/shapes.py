@@ -0,0 +1,139 @@
+"""Batched drawing of NumPy polylines, polygons and circles for sketches.
+
+Exposed to generated code as `shapes` (see SafeExecutor.allowed_imports).
+Vertices go to cairo from plain lists through C-level iteration, and items
+sharing a style are drawn with one set_source/stroke/fill, so per-item
+colours cost one state change per distinct colour rather than per item:
+
+    t = np.linspace(0, 2 * np.pi, 20000)
+    shapes.lines(ctx, np.column_stack([cx + 250 * np.sin(3 * t + 0.5), cy + 200 * np.sin(4 * t)]))
+    shapes.circles(ctx, centres, radii, colours=rgba)            # (n, 3|4) per-circle colours
+    shapes.polygons(ctx, vertices, offsets, colours=rgb, levels=32)
+
+Items are drawn grouped by style, in order of each style's first item, so
+overlapping translucent items of different colours can stack differently
+than one-at-a-time drawing.
+"""
+from collections import deque
+from itertools import starmap
+import math
+import numpy as np
+
+TAU = 2 * math.pi
+
+
+def _flat(points) -> list:
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2).tolist()
+
+
+def _bounds(points, offsets) -> list:
+    if offsets is None:
+        return [0, len(points)]
+    return np.asarray(offsets).tolist()
+
+
+def append(ctx, flat: list, bounds: list, members=None, close: bool = False):
+    """Add polylines flat[bounds[i]:bounds[i + 1]] (all, or those in members) to the current path"""
+    move_to, line_to, close_path = ctx.move_to, ctx.line_to, ctx.close_path
+    for i in range(len(bounds) - 1) if members is None else members:
+        start, end = bounds[i], bounds[i + 1]
+        if end - start < 1:
+            continue
+        move_to(*flat[start])
+        deque(starmap(line_to, flat[start + 1:end]), maxlen=0)
+        if close:
+            close_path()
+
+
+def _styles(count: int, colours, widths=None, levels: int = None):
+    """Group item indices by (colour, width): [(rgba or None, width or None, indices)]"""
+    keys = []
+    if colours is not None:
+        colours = np.asarray(colours, dtype=np.float64)
+        if colours.ndim == 1:
+            colours = np.broadcast_to(colours, (count, len(colours)))
+        if levels:
+            colours = np.round(colours * (levels - 1)) / (levels - 1)
+        keys.append(colours)
+    if widths is not None:
+        keys.append(np.broadcast_to(np.asarray(widths, dtype=np.float64), (count,))[:, None])
+    if not keys or count == 0:
+        return [(None, None, None)]
+    table = np.concatenate(keys, axis=1)
+    unique, first, inverse = np.unique(table, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind='stable')
+    splits = np.cumsum(np.bincount(inverse, minlength=len(unique)))[:-1]
+    groups = np.split(order, splits)
+    styles = []
+    for style in np.argsort(first).tolist():
+        row = unique[style].tolist()
+        colour = row[:colours.shape[1]] if colours is not None else None
+        width = row[-1] if widths is not None else None
+        styles.append((colour, width, groups[style].tolist()))
+    return styles
+
+
+def _set_style(ctx, colour, width):
+    if colour is not None:
+        if len(colour) == 4:
+            ctx.set_source_rgba(*colour)
+        else:
+            ctx.set_source_rgb(*colour)
+    if width is not None:
+        ctx.set_line_width(width)
+
+
+def lines(ctx, points, offsets=None, colours=None, widths=None, close: bool = False, levels: int = None):
+    """Stroke polylines: one (n, 2) array, or flat points with offsets as returned by flow/contour.
+
+    colours: one RGB(A) tuple or an (n, 3|4) array per polyline; widths: a number
+    or one per polyline. levels quantizes colours to that many steps per channel,
+    capping the number of strokes. Without colours the current source is used.
+    """
+    flat = _flat(points)
+    bounds = _bounds(flat, offsets)
+    for colour, width, members in _styles(len(bounds) - 1, colours, widths, levels):
+        _set_style(ctx, colour, width)
+        append(ctx, flat, bounds, members, close)
+        ctx.stroke()
+
+
+def polygons(ctx, vertices, offsets=None, colours=None, levels: int = None, stroke: bool = False):
+    """Fill closed polygons (vertices[offsets[i]:offsets[i + 1]]), one fill per colour; stroke=True outlines instead"""
+    flat = _flat(vertices)
+    bounds = _bounds(flat, offsets)
+    for colour, _, members in _styles(len(bounds) - 1, colours, None, levels):
+        _set_style(ctx, colour, None)
+        append(ctx, flat, bounds, members, close=True)
+        if stroke:
+            ctx.stroke()
+        else:
+            ctx.fill()
+
+
+def circles(ctx, centres, radii=None, colours=None, levels: int = None, stroke: bool = False):
+    """Fill circles, one fill per colour; stroke=True outlines instead.
+
+    centres is (n, 2) with radii a number or (n,) array, or (n, 3) x, y, r
+    as returned by spatial.pack.
+    """
+    centres = np.asarray(centres, dtype=np.float64)
+    if radii is None:
+        centres = centres.reshape(-1, 3)
+        centres, radii = centres[:, :2], centres[:, 2]
+    centres = centres.reshape(-1, 2)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(centres),))
+    # move_to the start of each arc so circles don't get joined into one outline
+    starts = np.column_stack([centres[:, 0] + radii, centres[:, 1]]).tolist()
+    arcs = np.column_stack([centres, radii, np.zeros(len(radii)), np.full(len(radii), TAU)]).tolist()
+    move_to, arc = ctx.move_to, ctx.arc
+    for colour, _, members in _styles(len(arcs), colours, None, levels):
+        _set_style(ctx, colour, None)
+        for i in range(len(arcs)) if members is None else members:
+            move_to(*starts[i])
+            arc(*arcs[i])
+        if stroke:
+            ctx.stroke()
+        else:
+            ctx.fill()
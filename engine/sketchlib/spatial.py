@@ -0,0 +1,272 @@
+"""Spatial indexes, Poisson-disk sampling and circle packing for sketches.
+
+Exposed to generated code as `spatial` (see SafeExecutor.allowed_imports).
+Replaces the "compare every shape with every other shape" loops of packing,
+collision and proximity sketches:
+
+    pairs = spatial.pairs(points, 40)                          # (m, 2) index pairs closer than 40, vectorized
+    tree = spatial.KDTree(points); tree.knn(x, y, 3)            # nearest neighbours
+    points = spatial.poisson_disk(width, height, 12, seed=seed)  # evenly spread, never closer than 12
+    circles = spatial.pack(width, height, 800, 2, 60, seed=seed) # (n, 3) x, y, r without overlaps
+"""
+import heapq
+import math
+import random
+import numpy as np
+
+
+def _as_points(points) -> np.ndarray:
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+class GridHash:
+    """Uniform grid of buckets for incremental inserts and fixed-radius queries.
+
+    Queries are cheapest when `cell` is about the query radius.
+    """
+
+    def __init__(self, cell: float):
+        self.cell = float(cell)
+        self.inverse = 1 / self.cell
+        self.buckets = {}
+        self.xs, self.ys = [], []
+
+    def __len__(self):
+        return len(self.xs)
+
+    def insert(self, x: float, y: float) -> int:
+        """Add a point; returns its index"""
+        index = len(self.xs)
+        self.xs.append(x)
+        self.ys.append(y)
+        key = (int(math.floor(x * self.inverse)), int(math.floor(y * self.inverse)))
+        self.buckets.setdefault(key, []).append(index)
+        return index
+
+    def _candidates(self, x: float, y: float, r: float):
+        inverse = self.inverse
+        x0, x1 = int(math.floor((x - r) * inverse)), int(math.floor((x + r) * inverse))
+        y0, y1 = int(math.floor((y - r) * inverse)), int(math.floor((y + r) * inverse))
+        buckets = self.buckets
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query(self, x: float, y: float, r: float) -> list[int]:
+        """Indices of points within distance r of (x, y)"""
+        xs, ys, r2 = self.xs, self.ys, r * r
+        return [i for i in self._candidates(x, y, r) if (xs[i] - x) ** 2 + (ys[i] - y) ** 2 <= r2]
+
+    def any_within(self, x: float, y: float, r: float) -> bool:
+        xs, ys, r2 = self.xs, self.ys, r * r
+        return any((xs[i] - x) ** 2 + (ys[i] - y) ** 2 < r2 for i in self._candidates(x, y, r))
+
+
+class KDTree:
+    """Static 2D k-d tree over an (n, 2) array, with radius and k-nearest queries"""
+
+    LEAF_SIZE = 16
+
+    def __init__(self, points):
+        self.points = _as_points(points)
+        self.order = np.arange(len(self.points))
+        # Per node: index range into order, split axis/value and children (-1 for leaves)
+        self.nodes = []
+        if len(self.points):
+            self._build(0, len(self.points))
+        sorted_points = self.points[self.order]
+        self._xs, self._ys = sorted_points[:, 0].tolist(), sorted_points[:, 1].tolist()
+        self._ids = self.order.tolist()
+
+    def _build(self, start: int, end: int) -> int:
+        node = len(self.nodes)
+        self.nodes.append([start, end, 0, 0.0, -1, -1])
+        if end - start <= self.LEAF_SIZE:
+            return node
+        chunk = self.points[self.order[start:end]]
+        axis = int(np.argmax(chunk.max(axis=0) - chunk.min(axis=0)))
+        middle = (end - start) // 2
+        part = np.argpartition(chunk[:, axis], middle)
+        self.order[start:end] = self.order[start:end][part]
+        split = float(self.points[self.order[start + middle], axis])
+        left = self._build(start, start + middle)
+        right = self._build(start + middle, end)
+        self.nodes[node][2:] = [axis, split, left, right]
+        return node
+
+    def query_radius(self, x: float, y: float, r: float) -> list[int]:
+        """Indices of points within distance r of (x, y)"""
+        if not self.nodes:
+            return []
+        found, stack, r2 = [], [0], r * r
+        nodes, xs, ys, ids = self.nodes, self._xs, self._ys, self._ids
+        while stack:
+            start, end, axis, split, left, right = nodes[stack.pop()]
+            if left < 0:
+                found.extend(ids[i] for i in range(start, end) if (xs[i] - x) ** 2 + (ys[i] - y) ** 2 <= r2)
+                continue
+            delta = (x if axis == 0 else y) - split
+            near, far = (left, right) if delta < 0 else (right, left)
+            stack.append(near)
+            if delta * delta <= r2:
+                stack.append(far)
+        return found
+
+    def knn(self, x: float, y: float, k: int = 1) -> tuple[list[int], list[float]]:
+        """The k nearest points to (x, y): (indices, distances), nearest first"""
+        if not self.nodes:
+            return [], []
+        best = []  # max-heap of (-d², index)
+        nodes, xs, ys, ids = self.nodes, self._xs, self._ys, self._ids
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            start, end, axis, split, left, right = nodes[node]
+            if left < 0:
+                for i in range(start, end):
+                    d2 = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d2, ids[i]))
+                    elif d2 < -best[0][0]:
+                        heapq.heapreplace(best, (-d2, ids[i]))
+                continue
+            delta = (x if axis == 0 else y) - split
+            near, far = (left, right) if delta < 0 else (right, left)
+            stack.append((far, delta * delta))
+            stack.append((near, bound))
+        best.sort(reverse=True)
+        return [i for _, i in best], [math.sqrt(-d2) for d2, _ in best]
+
+
+def pairs(points, r: float) -> np.ndarray:
+    """All index pairs (i < j) closer than r, as an (m, 2) array; vectorized cell sort"""
+    points = _as_points(points)
+    n = len(points)
+    if n < 2 or r <= 0:
+        return np.empty((0, 2), dtype=np.intp)
+    cells = np.floor((points - points.min(axis=0)) / r).astype(np.int64)
+    width = int(cells[:, 0].max()) + 3
+    keys = (cells[:, 1] + 1) * width + cells[:, 0] + 1
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    found = []
+    # Own cell plus the four "forward" neighbours covers each cell pair once
+    for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        target = keys + dy * width + dx
+        lo = np.searchsorted(sorted_keys, target, side='left')
+        hi = np.searchsorted(sorted_keys, target, side='right')
+        counts = hi - lo
+        i = np.repeat(np.arange(n), counts)
+        j = order[np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)]
+        if dx == 0 and dy == 0:
+            keep = i < j
+            i, j = i[keep], j[keep]
+        d = points[i] - points[j]
+        close = (d * d).sum(axis=1) < r * r
+        found.append(np.column_stack([np.minimum(i, j)[close], np.maximum(i, j)[close]]))
+    return np.concatenate(found)
+
+
+def poisson_disk(width: float, height: float, radius: float, k: int = 30, seed: int = None) -> np.ndarray:
+    """Bridson's Poisson-disk sampling: (n, 2) points filling the area, none closer than radius"""
+    rng = random.Random(seed)
+    cell = radius / math.sqrt(2)
+    cols, rows = int(width / cell) + 1, int(height / cell) + 1
+    grid = [-1] * (cols * rows)
+    points, active = [], []
+
+    def fits(x, y):
+        gx, gy = int(x / cell), int(y / cell)
+        for cy in range(max(gy - 2, 0), min(gy + 3, rows)):
+            for cx in range(max(gx - 2, 0), min(gx + 3, cols)):
+                other = grid[cy * cols + cx]
+                if other >= 0:
+                    px, py = points[other]
+                    if (px - x) ** 2 + (py - y) ** 2 < radius * radius:
+                        return False
+        return True
+
+    def add(x, y):
+        grid[int(y / cell) * cols + int(x / cell)] = len(points)
+        active.append(len(points))
+        points.append((x, y))
+
+    add(rng.uniform(0, width), rng.uniform(0, height))
+    while active:
+        slot = rng.randrange(len(active))
+        px, py = points[active[slot]]
+        for _ in range(k):
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = radius * math.sqrt(rng.uniform(1, 4))  # uniform over the annulus r..2r
+            x, y = px + distance * math.cos(angle), py + distance * math.sin(angle)
+            if 0 <= x < width and 0 <= y < height and fits(x, y):
+                add(x, y)
+                break
+        else:
+            active[slot] = active[-1]
+            active.pop()
+    return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+
+class CirclePacker:
+    """Incremental circle packing: collision checks only against circles in nearby cells"""
+
+    def __init__(self, width: float, height: float, max_radius: float, padding: float = 0.0,
+                 inside: bool = True):
+        self.width, self.height = width, height
+        self.max_radius = max_radius
+        self.padding = padding
+        self.inside = inside  # keep circles fully on the canvas
+        self.grid = GridHash(2 * max_radius + padding)
+        self.circles = []
+
+    def fit(self, x: float, y: float, min_radius: float, max_radius: float = None) -> float | None:
+        """Largest radius (up to max_radius) a circle at (x, y) can take, or None below min_radius"""
+        largest = min(max_radius or self.max_radius, self.max_radius)
+        if self.inside:
+            largest = min(largest, x, y, self.width - x, self.height - y)
+        if largest < min_radius:
+            return None
+        circles, padding = self.circles, self.padding
+        for i in self.grid._candidates(x, y, largest + self.max_radius + padding):
+            cx, cy, cr = circles[i]
+            room = math.hypot(cx - x, cy - y) - cr - padding
+            if room < min_radius:
+                return None
+            if room < largest:
+                largest = room
+        return largest
+
+    def add(self, x: float, y: float, r: float) -> bool:
+        """Place a circle if it overlaps nothing; returns whether it was placed"""
+        if r > self.max_radius or self.fit(x, y, r, r) is None:
+            return False
+        self.circles.append((x, y, r))
+        self.grid.insert(x, y)
+        return True
+
+    def collides(self, x: float, y: float, r: float) -> bool:
+        return self.fit(x, y, r, r) is None
+
+    def array(self) -> np.ndarray:
+        return np.array(self.circles, dtype=np.float64).reshape(-1, 3)
+
+
+def pack(width: float, height: float, count: int, min_radius: float, max_radius: float, attempts: int = None,
+         padding: float = 1.0, seed: int = None) -> np.ndarray:
+    """Random-start circle packing: each try grows the largest circle that fits; (n, 3) x, y, r"""
+    rng = random.Random(seed)
+    packer = CirclePacker(width, height, max_radius, padding)
+    for _ in range(attempts or count * 20):
+        if len(packer.circles) >= count:
+            break
+        x, y = rng.uniform(0, width), rng.uniform(0, height)
+        r = packer.fit(x, y, min_radius)
+        if r is not None:
+            packer.circles.append((x, y, r))
+            packer.grid.insert(x, y)
+    return packer.array()
@@ -0,0 +1,169 @@
+"""Instanced stamping for sketches: rasterize a motif once, composite it many times.
+
+Exposed to generated code as `stamps` (see SafeExecutor.allowed_imports).
+A Motif wraps a drawing function; stamping it looks up a cached image for
+its (rotation bucket, scale bucket, colour) in device pixels, rendering it
+on first use, and paints that image with the exact remaining transform:
+
+    cube = stamps.Motif(draw_cube, radius=12, symmetry=6)   # draw_cube(ctx) draws around (0, 0)
+    stamps.stamp_many(ctx, cube, centres, rotations=angles, colours=rgb)
+    stamps.stamp(ctx, cube, x, y, scale=2, exact=True)      # plain vector drawing
+
+Cached images are drawn with the caller's line width, cap and join, and
+with its source unless a colour is given; both are part of the cache key.
+Stamps fall back to vector drawing when exact=True, when the target isn't
+an image surface, when the source is a gradient or surface pattern, when
+the transform isn't a plain rotation + uniform scale, or when the image
+would exceed MAX_SIZE pixels. Renders recorded for replay (RECORD_RENDERS)
+target a RecordingSurface, which must replay at any scale, so they always
+take the vector path. The cache holds at most CACHE_BYTES of images.
+"""
+from collections import OrderedDict
+import math
+import cairo
+import numpy as np
+
+ROTATIONS = 64  # rotation buckets per turn
+SCALE_STEPS = 4  # scale buckets per doubling
+MAX_SIZE = 256  # largest cached image edge in pixels
+CACHE_BYTES = 32 * 1024 * 1024
+PADDING = 2  # pixels of antialiasing margin around the motif
+
+_cache = OrderedDict()  # (motif, bucket, level, colour, style) -> (surface, half size)
+_cached_bytes = 0
+
+
+class Motif:
+    """A drawing function used as a stamp.
+
+    draw(ctx) draws the motif around (0, 0) within `radius` user units, with
+    the stamp colour (if any) already set as the source. symmetry=n says the
+    motif looks the same rotated by a 1/n turn, so fewer rotations are cached.
+    """
+
+    def __init__(self, draw, radius: float, symmetry: int = 1):
+        self.draw = draw
+        self.radius = float(radius)
+        self.symmetry = max(int(symmetry), 1)
+
+
+def clear():
+    """Drop every cached image"""
+    global _cached_bytes
+    _cache.clear()
+    _cached_bytes = 0
+
+
+def _set_colour(ctx, colour):
+    if colour is None:
+        return
+    if len(colour) == 4:
+        ctx.set_source_rgba(*colour)
+    else:
+        ctx.set_source_rgb(*colour)
+
+
+def _vector(ctx, motif: Motif, x: float, y: float, scale: float, rotation: float, colour):
+    ctx.save()
+    ctx.translate(x, y)
+    ctx.rotate(rotation)
+    ctx.scale(scale, scale)
+    _set_colour(ctx, colour)
+    motif.draw(ctx)
+    ctx.restore()
+
+
+def _image(motif: Motif, bucket: int, level: int, colour, style: tuple):
+    """Cached rendering of a motif at a rotation bucket and scale level, in device pixels"""
+    global _cached_bytes
+    key = (motif, bucket, level, colour, style)
+    entry = _cache.get(key)
+    if entry is not None:
+        _cache.move_to_end(key)
+        return entry
+    scale = 2 ** (level / SCALE_STEPS)
+    half = math.ceil(motif.radius * scale) + PADDING
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 2 * half, 2 * half)
+    ctx = cairo.Context(surface)
+    ctx.translate(half, half)
+    ctx.rotate(bucket * 2 * math.pi / ROTATIONS)
+    ctx.scale(scale, scale)
+    line_width, cap, join = style
+    ctx.set_line_width(line_width)
+    ctx.set_line_cap(cap)
+    ctx.set_line_join(join)
+    _set_colour(ctx, colour)
+    motif.draw(ctx)
+    surface.flush()
+
+    entry = _cache[key] = (surface, half)
+    _cached_bytes += surface.get_stride() * 2 * half
+    while _cached_bytes > CACHE_BYTES and len(_cache) > 1:
+        _, (old, _) = _cache.popitem(last=False)
+        _cached_bytes -= old.get_stride() * old.get_height()
+    return entry
+
+
+def _colours(colours, count: int) -> list:
+    if colours is None:
+        return [None] * count
+    colours = np.asarray(colours, dtype=np.float64)
+    if colours.ndim == 1:
+        return [tuple(np.round(colours, 4).tolist())] * count
+    return [tuple(row) for row in np.round(colours, 4).tolist()]
+
+
+def stamp_many(ctx, motif: Motif, positions, scales=1.0, rotations=0.0, colours=None, exact: bool = False):
+    """Stamp a motif at each (x, y) of positions, in order.
+
+    scales and rotations are numbers or one per stamp (radians); colours is
+    one RGB(A) tuple or an (n, 3|4) array, None to keep the motif's own.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    n = len(positions)
+    scales = np.broadcast_to(np.asarray(scales, dtype=np.float64), (n,))
+    rotations = np.broadcast_to(np.asarray(rotations, dtype=np.float64), (n,))
+    colour_keys = _colours(colours, n)
+
+    xx, yx, xy, yy, x0, y0 = ctx.get_matrix()
+    device_scale = math.sqrt(abs(xx * yy - xy * yx))
+    similarity = xx * yy - xy * yx > 0 and math.isclose(xx, yy, abs_tol=1e-9) and math.isclose(xy, -yx, abs_tol=1e-9)
+    raster = not exact and similarity and isinstance(ctx.get_target(), cairo.ImageSurface)
+    if colours is None:
+        # The motif inherits the caller's source; cacheable only when it's a plain colour
+        source = ctx.get_source()
+        raster = raster and isinstance(source, cairo.SolidPattern)
+        if raster:
+            colour_keys = [tuple(round(c, 4) for c in source.get_rgba())] * n
+    style = (round(ctx.get_line_width(), 4), ctx.get_line_cap(), ctx.get_line_join())
+    sizes = 2 * (motif.radius * scales * device_scale + PADDING)
+    if not raster or n == 0 or sizes.max() > MAX_SIZE:
+        for (x, y), scale, rotation, colour in zip(positions.tolist(), scales.tolist(), rotations.tolist(), colour_keys):
+            _vector(ctx, motif, x, y, scale, rotation, colour)
+        return
+
+    # Stamp transforms in device space, then split into a cached bucket and the residual
+    angle = np.mod(rotations + math.atan2(yx, xx), 2 * math.pi / motif.symmetry)
+    bucket = np.round(angle / (2 * math.pi / ROTATIONS)).astype(np.intp)
+    turn = angle - bucket * (2 * math.pi / ROTATIONS)
+    size = scales * device_scale
+    level = np.ceil(np.log2(np.maximum(size, 1e-6)) * SCALE_STEPS).astype(np.intp)  # render at or above size
+    zoom = size / 2 ** (level / SCALE_STEPS)
+    device = positions @ np.array([[xx, yx], [xy, yy]]) + [x0, y0]
+
+    ctx.save()
+    for (px, py), b, lv, t, z, colour in zip(device.tolist(), bucket.tolist(), level.tolist(), turn.tolist(),
+                                             zoom.tolist(), colour_keys):
+        surface, half = _image(motif, b, lv, colour, style)
+        c, s = z * math.cos(t), z * math.sin(t)
+        ctx.set_matrix(cairo.Matrix(c, s, -s, c, px, py))
+        ctx.set_source_surface(surface, -half, -half)
+        ctx.rectangle(-half, -half, 2 * half, 2 * half)
+        ctx.fill()
+    ctx.restore()
+
+
+def stamp(ctx, motif: Motif, x: float, y: float, scale: float = 1.0, rotation: float = 0.0, colour=None,
+          exact: bool = False):
+    """Stamp one motif centred at (x, y); see stamp_many"""
+    stamp_many(ctx, motif, [(x, y)], scale, rotation, None if colour is None else [colour], exact)
@@ -0,0 +1,211 @@
+"""Penrose and Truchet tilings for sketches, generated as flat NumPy polygon arrays.
+
+Exposed to generated code as `tiling` (see SafeExecutor.allowed_imports).
+Penrose tilings are built by deflating Robinson half-tiles one level at a
+time with whole-array operations, dropping everything outside the canvas
+after every level; each level is memoized, so a deeper tiling of the same
+canvas and seed starts from the shallower one. Results use the flat layout
+of geometry.voronoi and are drawn with one fill per colour:
+
+    vertices, offsets, kinds = tiling.penrose(width, height, depth=6, kind='P3', seed=seed)
+    tiling.fill(ctx, vertices, offsets, kinds, [(0.9, 0.5, 0.2), (0.1, 0.3, 0.5)])
+    tiling.outline(ctx, vertices, offsets); ctx.stroke()
+
+    points, offsets, kinds = tiling.truchet(width, height, 30, style='arcs', seed=seed)
+    tiling.draw(ctx, points, offsets); ctx.stroke()
+
+Cached arrays are read-only.
+"""
+from functools import lru_cache
+import math
+import random
+import numpy as np
+from sketchlib import shapes
+from sketchlib.flow import draw  # noqa: F401  (open polylines, e.g. Truchet arcs)
+
+PHI = (1 + math.sqrt(5)) / 2
+
+# Robinson half-tiles are (kind, A, B, C) with A the apex between the two equal
+# sides. Each rule lists the new points as (from, to, fraction of the way) and
+# the children as (kind, their A, B, C); mirrored halves inherit mirrored rules.
+SUBSTITUTIONS = {
+    'P3': {  # halves meet across BC: 0 thin rhomb, 1 thick rhomb
+        0: ({'P': ('A', 'B', 1 / PHI)}, [(0, 'CPB'), (1, 'PCA')]),
+        1: ({'Q': ('B', 'A', 1 / PHI), 'R': ('B', 'C', 1 / PHI)}, [(1, 'RCA'), (1, 'QRB'), (0, 'RQA')]),
+    },
+    'P2': {  # halves meet across AB: 0 kite, 1 dart
+        0: ({'Q': ('A', 'B', 1 / PHI), 'R': ('A', 'C', 1 / PHI ** 2)}, [(0, 'CQB'), (0, 'CQR'), (1, 'RAQ')]),
+        1: ({'S': ('B', 'C', 1 / PHI)}, [(0, 'BAS'), (1, 'SCA')]),
+    },
+}
+# Corner slots of the edge two mirrored halves share, and of the corner they don't
+SHARED = {'P3': (1, 2, 0), 'P2': (0, 1, 2)}
+
+# Truchet motifs on a unit cell: (orientation, shape, point, xy); arcs depend on the cell size
+TRUCHET = {
+    'arcs': None,
+    'diagonal': np.array([[[[0, 0], [1, 1]]], [[[1, 0], [0, 1]]]], dtype=np.float64),
+    'triangles': np.array([[[[1, 0], [1, 1], [0, 1]]], [[[0, 0], [1, 1], [0, 1]]],
+                           [[[0, 0], [1, 0], [0, 1]]], [[[0, 0], [1, 0], [1, 1]]]], dtype=np.float64),
+}
+
+
+def _arcs(cell: float) -> np.ndarray:
+    """Smith tiles: two quarter circles per cell, flattened as finely as cairo would (0.1px)"""
+    radius = cell / 2
+    segments = max(2, math.ceil(math.pi / 4 / math.acos(max(1 - 0.1 / radius, 0))))
+    sweep = np.linspace(0, math.pi / 2, segments + 1)
+
+    def quarter(cx, cy, start):
+        return np.stack([cx + 0.5 * np.cos(start + sweep), cy + 0.5 * np.sin(start + sweep)], axis=1)
+    return np.array([[quarter(0, 0, 0), quarter(1, 1, math.pi)],
+                     [quarter(1, 0, math.pi / 2), quarter(0, 1, 3 * math.pi / 2)]])
+
+
+def _frozen(*arrays):
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+def _sun(width: float, height: float, seed: int | None, radius: float | None):
+    """Ten kind-0 halves around a centre, large enough to cover the canvas"""
+    cx, cy, rotation = width / 2, height / 2, 0.0
+    if seed is not None:
+        rng = random.Random(seed)
+        cx += rng.uniform(-0.25, 0.25) * width
+        cy += rng.uniform(-0.25, 0.25) * height
+        rotation = rng.uniform(0, 2 * math.pi)
+    if radius is None:
+        # The decagon's inner radius has to reach the farthest canvas corner
+        radius = math.hypot(max(cx, width - cx), max(cy, height - cy)) / math.cos(math.pi / 10)
+    i = np.arange(10)
+    b = complex(cx, cy) + radius * np.exp(1j * ((2 * i - 1) * math.pi / 10 + rotation))
+    c = complex(cx, cy) + radius * np.exp(1j * ((2 * i + 1) * math.pi / 10 + rotation))
+    b[::2], c[::2] = c[::2], b[::2].copy()  # alternate mirror images
+    corners = np.stack([np.full(10, complex(cx, cy)), b, c], axis=1)
+    return np.zeros(10, dtype=np.intp), corners
+
+
+def _subdivide(kind: str, kinds: np.ndarray, corners: np.ndarray):
+    """One deflation step of every half-tile at once"""
+    child_kinds, child_corners = [], []
+    for parent, (new, children) in SUBSTITUTIONS[kind].items():
+        chosen = corners[kinds == parent]
+        named = {'A': chosen[:, 0], 'B': chosen[:, 1], 'C': chosen[:, 2]}
+        for name, (start, end, t) in new.items():
+            named[name] = named[start] + (named[end] - named[start]) * t
+        for child, names in children:
+            child_kinds.append(np.full(len(chosen), child, dtype=np.intp))
+            child_corners.append(np.stack([named[n] for n in names], axis=1))
+    return np.concatenate(child_kinds), np.concatenate(child_corners)
+
+
+@lru_cache(maxsize=64)
+def _halves(kind: str, depth: int, width: float, height: float, seed: int | None, radius: float | None):
+    """Half-tiles after `depth` deflations, without any whose bounding box misses the canvas"""
+    if depth == 0:
+        kinds, corners = _sun(width, height, seed, radius)
+    else:
+        kinds, corners = _subdivide(kind, *_halves(kind, depth - 1, width, height, seed, radius))
+    # Children stay inside their parent, so a culled half never had anything to show
+    visible = ((corners.real.max(axis=1) >= 0) & (corners.real.min(axis=1) <= width)
+               & (corners.imag.max(axis=1) >= 0) & (corners.imag.min(axis=1) <= height))
+    return _frozen(kinds[visible], corners[visible])
+
+
+@lru_cache(maxsize=16)
+def penrose(width: float, height: float, depth: int = 6, kind: str = 'P3', seed: int = None,
+            radius: float = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Penrose tiling covering the canvas: (vertices, offsets, kinds).
+
+    kind 'P3' gives rhombs (kinds 0 thin, 1 thick), 'P2' kites (0) and darts (1).
+    Tile i is the polygon vertices[offsets[i]:offsets[i + 1]]; tiles cut by the
+    canvas edge whose other half lies wholly outside stay triangles. Tile edges
+    are about radius / PHI ** depth; radius defaults to just covering the canvas
+    from the tiling's centre. seed=None centres the five-fold star, a seed
+    rotates and shifts it.
+    """
+    if kind not in SUBSTITUTIONS:
+        raise ValueError(f"Unknown Penrose tiling {kind!r} (use 'P2' or 'P3')")
+    kinds, corners = _halves(kind, depth, width, height, seed, radius)
+    u, v, w = SHARED[kind]
+
+    # Mirrored halves share an edge: find them by sorting the rounded edge endpoints
+    ends = np.stack([corners[:, u], corners[:, v]], axis=1)
+    keys = np.round(np.stack([ends.real, ends.imag], axis=2) * 1e4).astype(np.int64)  # (n, 2, xy)
+    swap = (keys[:, 0, 0] > keys[:, 1, 0]) | ((keys[:, 0, 0] == keys[:, 1, 0]) & (keys[:, 0, 1] > keys[:, 1, 1]))
+    keys[swap] = keys[swap, ::-1]
+    keys = np.column_stack([kinds, keys.reshape(-1, 4)])
+    order = np.lexsort(keys.T[::-1])
+    same = (keys[order[1:]] == keys[order[:-1]]).all(axis=1)
+    first, second = order[:-1][same], order[1:][same]
+    single = np.ones(len(kinds), dtype=bool)
+    single[first] = single[second] = False
+
+    whole = np.stack([corners[first, u], corners[first, w], corners[first, v], corners[second, w]], axis=1)
+    halves = corners[single]
+    vertices = np.concatenate([whole.ravel(), halves.ravel()])
+    counts = np.concatenate([np.full(len(whole), 4), np.full(len(halves), 3)])
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+    return _frozen(np.stack([vertices.real, vertices.imag], axis=1), offsets,
+                   np.concatenate([kinds[first], kinds[single]]))
+
+
+def truchet(width: float, height: float, cell: float, style: str = 'arcs',
+            seed: int = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Random Truchet tiles on a grid of `cell`-sized squares: (points, offsets, kinds).
+
+    'arcs' gives two quarter-circle polylines per cell (Smith tiles) and
+    'diagonal' one line, both drawn with draw() and stroked; 'triangles'
+    gives one half-square polygon per cell for fill(). kinds is the tile
+    orientation of each shape (0-1, or 0-3 for triangles). Layouts are
+    cached per seed; seed=None gives a fresh layout on every call.
+    """
+    if seed is None:
+        return _truchet.__wrapped__(width, height, cell, style, None)
+    return _truchet(width, height, cell, style, seed)
+
+
+@lru_cache(maxsize=16)
+def _truchet(width: float, height: float, cell: float, style: str, seed: int | None):
+    if style not in TRUCHET:
+        raise ValueError(f"Unknown Truchet style {style!r} (use {', '.join(TRUCHET)})")
+    motifs = _arcs(cell) if style == 'arcs' else TRUCHET[style]
+    cols, rows = math.ceil(width / cell), math.ceil(height / cell)
+    orientation = np.random.default_rng(seed).integers(0, len(motifs), rows * cols)
+    gy, gx = np.divmod(np.arange(rows * cols), cols)
+    origin = np.stack([gx, gy], axis=1).astype(np.float64)[:, None, None, :]
+    placed = (motifs[orientation] + origin) * cell  # (cells, shapes per cell, points, 2)
+    count, length = placed.shape[0] * placed.shape[1], placed.shape[2]
+    offsets = np.arange(0, (count + 1) * length, length, dtype=np.intp)
+    return _frozen(placed.reshape(-1, 2), offsets, np.repeat(orientation, placed.shape[1]))
+
+
+def outline(ctx, vertices: np.ndarray, offsets: np.ndarray):
+    """Append all polygons as closed paths (no stroke)"""
+    bounds = np.asarray(offsets).tolist()
+    shapes.append(ctx, np.asarray(vertices, dtype=np.float64).tolist(), bounds, close=True)
+
+
+def fill(ctx, vertices: np.ndarray, offsets: np.ndarray, kinds: np.ndarray = None, colours=None):
+    """Fill polygons with one fill() per colour.
+
+    Polygon i gets colours[kinds[i] % len(colours)] (RGB or RGBA tuples);
+    without kinds or colours everything is filled once with the current source.
+    """
+    flat = np.asarray(vertices, dtype=np.float64).tolist()
+    bounds = np.asarray(offsets).tolist()
+    if kinds is None or not colours:
+        shapes.append(ctx, flat, bounds, close=True)
+        ctx.fill()
+        return
+    groups = np.asarray(kinds) % len(colours)
+    for group in np.unique(groups).tolist():
+        colour = colours[group]
+        if len(colour) == 4:
+            ctx.set_source_rgba(*colour)
+        else:
+            ctx.set_source_rgb(*colour)
+        shapes.append(ctx, flat, bounds, np.flatnonzero(groups == group).tolist(), close=True)
+        ctx.fill()
@@ -2,6 +2,7 @@ import shutil
 import subprocess
 from pathlib import Path
 from config.settings import GALLERY_DIR
+from agents.recording import RECORDING_SUFFIX
 from datetime import datetime
 
 class GalleryUploader:
@@ -10,7 +11,7 @@ class GalleryUploader:
     def __init__(self):
         self.gallery_dir = GALLERY_DIR
 
-    async def post(self, image: Path, code: str, metadata: dict) -> str:
+    async def post(self, image: Path, code: str, metadata: dict, recording: Path = None) -> str:
         """Copy artwork to public gallery and push to git"""
 
         date_str = metadata['date']
@@ -33,6 +34,8 @@ class GalleryUploader:
         # Copy files to archive
         shutil.copy(image, img_archive)
         code_archive.write_text(code)
+        if recording:
+            shutil.copy(recording, archive_dir / f"period_{period}_{time_str}{RECORDING_SUFFIX}")
 
         # Create/Update "latest" version for the web frontend (this is what Vercel shows)
         latest_img = dest_dir / f"period_{period}.png"
@@ -41,6 +44,8 @@ class GalleryUploader:
 
         shutil.copy(image, latest_img)
         latest_code.write_text(code)
+        if recording:
+            shutil.copy(recording, dest_dir / f"period_{period}{RECORDING_SUFFIX}")
 
         # Create metadata with timestamp
         import json